@@ -0,0 +1,79 @@
+"""Benchmark: INSERT generation from row dicts vs columnar RowSource input.
+
+Usage:
+    python benchmarks/bench_columnar.py [--rows N] [--columns C]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from yql import Dialect, RowSource, generate_sql  # noqa: E402
+from yql.ast import InsertQuery, OperationType, YQLQuery  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional
+    np = None
+
+
+def make_columns(rows: int, columns: int) -> dict[str, list]:
+    data = {}
+    for c in range(columns):
+        kind = c % 4
+        if kind == 0:
+            data[f"c{c}"] = list(range(rows))
+        elif kind == 1:
+            data[f"c{c}"] = [i * 0.25 for i in range(rows)]
+        elif kind == 2:
+            data[f"c{c}"] = [f"value-{i}" if i % 10 else None for i in range(rows)]
+        else:
+            data[f"c{c}"] = [i % 2 == 0 for i in range(rows)]
+    return data
+
+
+def make_insert(values) -> YQLQuery:
+    insert = InsertQuery(table="facts", values=values)
+    return YQLQuery(operation=OperationType.INSERT, insert_query=insert)
+
+
+def timed(query: YQLQuery, repeat: int = 3) -> tuple[float, str]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sql = generate_sql(query, Dialect.POSTGRESQL)
+        best = min(best, time.perf_counter() - start)
+    return best, sql
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--columns", type=int, default=20)
+    args = parser.parse_args()
+
+    columns = make_columns(args.rows, args.columns)
+    rows = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    inputs = [("row dicts", rows), ("columnar (lists)", RowSource.from_columns(columns))]
+    if np is not None:
+        arrays = {
+            name: np.array(values) if None not in values else values
+            for name, values in columns.items()
+        }
+        inputs.append(("columnar (NumPy)", RowSource.from_columns(arrays)))
+
+    print(f"{args.rows} rows x {args.columns} columns = {args.rows * args.columns} cells")
+    baseline = expected = None
+    for name, values in inputs:
+        seconds, sql = timed(make_insert(values))
+        if baseline is None:
+            baseline, expected = seconds, sql
+        assert sql == expected, name
+        print(f"{name:18} {seconds:7.3f} s  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: CompiledQuery.render() vs parse() + generate_sql().
+
+Usage:
+    python benchmarks/bench_compiled.py [--number N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import yql  # noqa: E402
+from yql import Dialect, generate_sql, parse  # noqa: E402
+
+YQL = """
+query:
+  with_clauses:
+    recent_orders:
+      select:
+        - customer_id: o.customer_id
+        - total: "SUM(o.amount)"
+      from: { o: orders }
+      where:
+        - "o.created_at >= #{since}"
+      group_by: [o.customer_id]
+  select:
+    - id: c.id
+    - name: c.name
+    - total: r.total
+  from: { c: customers }
+  joins:
+    - type: LEFT
+      alias: r
+      table: recent_orders
+      on: "c.id = r.customer_id"
+  where:
+    - "c.status = #{status:'active'}"
+    - "c.region = #{region}"
+  order_by:
+    - field: r.total
+      direction: DESC
+  limit: 50
+"""
+
+PARAMS = {"since": "2024-01-01", "region": "EU"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    compiled = yql.compile(YQL, Dialect.POSTGRESQL)
+    parsed = parse(YQL)
+    cases = {
+        "parse + generate_sql": lambda: generate_sql(parse(YQL), Dialect.POSTGRESQL),
+        "generate_sql (parsed)": lambda: generate_sql(parsed, Dialect.POSTGRESQL),
+        "CompiledQuery.render": lambda: compiled.render(PARAMS),
+        "CompiledQuery.bind": lambda: compiled.bind(PARAMS, "pyformat"),
+    }
+
+    baseline = None
+    for name, func in cases.items():
+        number = args.number if "Compiled" in name else max(1, args.number // 20)
+        seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+        baseline = baseline or seconds
+        print(f"{name:24} {seconds * 1e6:10.2f} us/op  {baseline / seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
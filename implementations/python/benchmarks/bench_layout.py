@@ -0,0 +1,63 @@
+"""Benchmark: size and generation time of pretty vs compact SQL.
+
+Usage:
+    python benchmarks/bench_layout.py [--number N] [--depth D]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bench_nested_cte import make_query  # noqa: E402
+
+from yql import Dialect, generate_sql, parse_file  # noqa: E402
+from yql.ast import OperationType, YQLQuery  # noqa: E402
+from yql.parser import ParseError  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "tests" / "fixtures"
+
+
+def load_queries(depth: int) -> list[YQLQuery]:
+    queries = []
+    for path in sorted(FIXTURES_DIR.glob("*/before.yql")):
+        try:
+            query = parse_file(path)
+            generate_sql(query, Dialect.POSTGRESQL)
+        except (ParseError, ValueError):
+            continue
+        queries.append(query)
+    queries.append(YQLQuery(operation=OperationType.SELECT, select_query=make_query(depth)))
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=10, help="Depth of the nested-CTE query")
+    args = parser.parse_args()
+
+    queries = load_queries(args.depth)
+    results = {}
+    for layout in ("pretty", "compact"):
+        size = sum(len(generate_sql(q, Dialect.POSTGRESQL, layout=layout)) for q in queries)
+
+        def run(layout=layout):
+            for query in queries:
+                generate_sql(query, Dialect.POSTGRESQL, layout=layout)
+
+        seconds = min(timeit.repeat(run, number=args.number, repeat=3)) / args.number
+        results[layout] = (size, seconds)
+        print(f"{layout:8} {size:8} bytes  {seconds * 1e6:9.1f} us per {len(queries)} queries")
+
+    (pretty_size, pretty_time), (compact_size, compact_time) = results["pretty"], results["compact"]
+    print(
+        f"compact: {1 - compact_size / pretty_size:.1%} fewer bytes, "
+        f"{pretty_time / compact_time:.2f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main()
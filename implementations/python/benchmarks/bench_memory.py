@@ -0,0 +1,127 @@
+"""Benchmark: memory per parsed query in a large in-memory catalog.
+
+Parses a synthetic catalog of queries that share table names, column names
+and conditions (as real catalogs do) and reports the memory retained per
+query, with and without ``raw``.
+
+Usage:
+    python benchmarks/bench_memory.py [--queries N] [--src PATH] [--baseline]
+
+``--src`` selects the ``src`` directory to import ``yql`` from, e.g. a
+checkout of an older revision, to compare before/after. ``--baseline`` also
+measures the current tree with the nodes rebuilt as ordinary (``__dict__``)
+dataclasses and string interning turned off, i.e. the layout before AST
+nodes were slotted, so the savings can be reproduced without a checkout.
+"""
+
+import argparse
+import dataclasses
+import gc
+import inspect
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+TABLES = [f"table_{i}" for i in range(50)]
+COLUMNS = ["id", "name", "status", "created_at", "updated_at", "amount", "customer_id", "region"]
+CONDITIONS = [
+    "t.status = 'active'",
+    "t.deleted_at IS NULL",
+    "t.created_at >= #{since}",
+    "t.region = #{region}",
+    "t.amount > 0",
+]
+
+
+def make_catalog(count: int) -> list[str]:
+    """Return ``count`` YQL documents."""
+    rng = random.Random(42)
+    documents = []
+    for i in range(count):
+        table = rng.choice(TABLES)
+        other = rng.choice(TABLES)
+        columns = rng.sample(COLUMNS, 4)
+        select = "\n".join(f"    - {c}: t.{c}" for c in columns)
+        where = "\n".join(f'    - "{c}"' for c in rng.sample(CONDITIONS, 2))
+        documents.append(
+            f"""query:
+  select:
+{select}
+  from: {{ t: {table} }}
+  joins:
+    - type: LEFT
+      alias: o
+      table: {other}
+      on: "o.id = t.customer_id"
+  where:
+{where}
+  order_by:
+    - field: t.{columns[0]}
+      direction: DESC
+  limit: {10 + i % 90}
+"""
+        )
+    return documents
+
+
+def measure(parse, documents: list[str], **kwargs) -> float:
+    """Return retained bytes per parsed query."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    catalog = [parse(document, **kwargs) for document in documents]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(catalog) == len(documents)
+    return (after - before) / len(documents)
+
+
+def use_baseline_nodes() -> None:
+    """Make the parser build unslotted nodes and stop interning strings."""
+    from yql import ast, parser
+
+    for name, cls in vars(ast).items():
+        if not isinstance(cls, type) or not dataclasses.is_dataclass(cls):
+            continue
+        if not hasattr(cls, "__slots__"):
+            continue
+        specs = []
+        for f in dataclasses.fields(cls):
+            options = {"init": f.init, "repr": f.repr, "compare": f.compare}
+            if f.default is not dataclasses.MISSING:
+                options["default"] = f.default
+            elif f.default_factory is not dataclasses.MISSING:
+                options["default_factory"] = f.default_factory
+            specs.append((f.name, f.type, dataclasses.field(**options)))
+        if hasattr(parser, name):
+            setattr(parser, name, dataclasses.make_dataclass(name, specs))
+    parser._intern = lambda value: value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=10000)
+    parser.add_argument("--src", type=Path, default=Path(__file__).resolve().parent.parent / "src")
+    parser.add_argument(
+        "--baseline", action="store_true", help="also measure unslotted nodes without interning"
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(args.src))
+    from yql import parse
+
+    documents = make_catalog(args.queries)
+    print(f"{args.queries} queries from {args.src}")
+    print(f"  with raw:    {measure(parse, documents):8.0f} bytes/query")
+    if "keep_raw" in inspect.signature(parse).parameters:
+        print(f"  without raw: {measure(parse, documents, keep_raw=False):8.0f} bytes/query")
+    if args.baseline:
+        use_baseline_nodes()
+        print("baseline (unslotted nodes, no interning)")
+        print(f"  with raw:    {measure(parse, documents):8.0f} bytes/query")
+
+
+if __name__ == "__main__":
+    main()
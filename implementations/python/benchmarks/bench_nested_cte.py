@@ -0,0 +1,77 @@
+"""Benchmark: SQL generation for deeply nested with_clauses.
+
+Each level wraps the previous query in a CTE, so the generated SQL indents
+the innermost query ``depth`` times. ``writer`` is the current generator,
+which writes every nested body in place; ``re-indent`` generates each CTE
+body as a separate string and indents it line by line at every level (the
+previous strategy), which is quadratic in the depth.
+
+Usage:
+    python benchmarks/bench_nested_cte.py [--depths 5,10,20,40,80] [--number N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from yql.ast import Column, FromClause, SelectQuery, WithClause  # noqa: E402
+from yql.generator.postgresql import PostgreSQLGenerator  # noqa: E402
+
+
+class ReindentGenerator(PostgreSQLGenerator):
+    """Generates CTE bodies as strings and re-indents them at every level."""
+
+    def _write_with_clauses(self, w, with_clauses):
+        cte_parts = []
+        for cte in with_clauses:
+            cte_sql = self._generate_select(cte.query)
+            indented = "\n".join(f"{self._indent}{line}" for line in cte_sql.split("\n"))
+            cte_parts.append(f"{cte.name} AS (\n{indented}\n)")
+        w.write("WITH " + ",\n".join(cte_parts))
+
+
+def make_query(depth: int) -> SelectQuery:
+    """Build a SELECT whose CTEs are nested ``depth`` levels deep."""
+    query = SelectQuery(
+        select=[Column("id", "t.id"), Column("amount", "t.amount")],
+        from_clause=FromClause("t", "orders"),
+        where=["t.status = 'open'", "t.amount > #{min_amount}"],
+    )
+    for level in range(depth):
+        query = SelectQuery(
+            select=[Column("id", f"l{level}.id"), Column("amount", f"l{level}.amount * 2")],
+            from_clause=FromClause(f"l{level}", f"level_{level}"),
+            where=[f"l{level}.amount > {level}"],
+            with_clauses=[WithClause(f"level_{level}", query)],
+        )
+    return query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", default="5,10,20,40,80")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    writer, reindent = PostgreSQLGenerator(), ReindentGenerator()
+    print(f"{'depth':>5} {'SQL bytes':>10} {'writer us':>11} {'re-indent us':>13} {'speedup':>8}")
+    for depth in (int(d) for d in args.depths.split(",")):
+        query = make_query(depth)
+        sql = writer._generate_select(query)
+        assert sql == reindent._generate_select(query)
+
+        times = []
+        for generator in (writer, reindent):
+            func = (lambda g: lambda: g._generate_select(query))(generator)
+            times.append(min(timeit.repeat(func, number=args.number, repeat=3)) / args.number)
+        print(
+            f"{depth:5} {len(sql):10} {times[0] * 1e6:11.1f} {times[1] * 1e6:13.1f} "
+            f"{times[1] / times[0]:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
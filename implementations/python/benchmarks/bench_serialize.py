@@ -0,0 +1,51 @@
+"""Benchmark: loading a query catalog from YAML vs the binary AST format.
+
+Usage:
+    python benchmarks/bench_serialize.py [--queries N]
+"""
+
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bench_memory import make_catalog  # noqa: E402
+
+from yql import parse  # noqa: E402
+from yql.serialize import dumps, loads  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=10000)
+    args = parser.parse_args()
+
+    documents = make_catalog(args.queries)
+    catalog, yaml_seconds = timed(lambda: [parse(document) for document in documents])
+
+    binary = dumps(catalog)
+    pickled = pickle.dumps(catalog, protocol=pickle.HIGHEST_PROTOCOL)
+    from_binary, binary_seconds = timed(lambda: loads(binary))
+    _, pickle_seconds = timed(lambda: pickle.loads(pickled))
+    assert from_binary == catalog
+
+    yaml_bytes = sum(len(document.encode("utf-8")) for document in documents)
+    print(f"{args.queries} queries")
+    print(f"  YAML parse:   {yaml_seconds * 1000:8.1f} ms  {yaml_bytes:>10} bytes")
+    print(f"  binary load:  {binary_seconds * 1000:8.1f} ms  {len(binary):>10} bytes  "
+          f"{yaml_seconds / binary_seconds:6.1f}x")
+    print(f"  pickle load:  {pickle_seconds * 1000:8.1f} ms  {len(pickled):>10} bytes  "
+          f"{yaml_seconds / pickle_seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
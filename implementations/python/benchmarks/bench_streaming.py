@@ -0,0 +1,55 @@
+"""Benchmark: peak memory of generate_sql() vs generate_sql_to() for a large INSERT.
+
+Usage:
+    python benchmarks/bench_streaming.py [--rows N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from yql import Dialect, generate_sql, generate_sql_to  # noqa: E402
+from yql.ast import InsertQuery, OperationType, YQLQuery  # noqa: E402
+
+
+def make_insert(rows: int) -> YQLQuery:
+    values = [
+        {"id": i, "customer": f"customer-{i:08d}", "amount": i * 1.5, "note": "imported row"}
+        for i in range(rows)
+    ]
+    insert = InsertQuery(table="orders", values=values)
+    return YQLQuery(operation=OperationType.INSERT, insert_query=insert)
+
+
+def write_string(query: YQLQuery, f) -> None:
+    f.write(generate_sql(query, Dialect.POSTGRESQL))
+
+
+def write_stream(query: YQLQuery, f) -> None:
+    generate_sql_to(f, query, Dialect.POSTGRESQL)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    query = make_insert(args.rows)
+    for name, func in (("generate_sql + write", write_string), ("generate_sql_to", write_stream)):
+        with open(os.devnull, "w", encoding="utf-8") as f:
+            tracemalloc.start()
+            start = time.perf_counter()
+            func(query, f)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"{name:22} peak {peak / 1e6:8.1f} MB  {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,63 @@
 
 __version__ = "0.1.0"
 
-from .generator import Dialect, generate_sql
-from .parser import parse, parse_file
+from .ast_cache import ASTCache
+from .cache import QueryCache, generate_sql_cached, get_query_cache
+from .compiled import CompiledQuery, compile
+from .generator import (
+    BindParameter,
+    BindStyle,
+    BoundSQL,
+    BulkLoad,
+    Dialect,
+    generate_bulk_load,
+    generate_insert_batches,
+    generate_sql,
+    generate_sql_to,
+    generate_upsert_batches,
+    iter_sql,
+)
+from .parser import (
+    ImportCache,
+    get_import_cache,
+    iter_parse,
+    iter_parse_file,
+    parse,
+    parse_file,
+    parse_obj,
+    yaml_backend,
+)
+from .rows import RowSource
 from .security import SecurityConfig, SecurityError
 
 __all__ = [
     "parse",
     "parse_file",
+    "parse_obj",
+    "iter_parse",
+    "iter_parse_file",
+    "yaml_backend",
     "generate_sql",
+    "generate_sql_to",
+    "iter_sql",
+    "generate_insert_batches",
+    "generate_upsert_batches",
+    "generate_bulk_load",
+    "BulkLoad",
+    "RowSource",
+    "generate_sql_cached",
+    "compile",
+    "CompiledQuery",
+    "get_query_cache",
+    "QueryCache",
+    "ASTCache",
+    "ImportCache",
+    "get_import_cache",
     "Dialect",
+    "BindStyle",
+    "BindParameter",
+    "BoundSQL",
     "SecurityConfig",
     "SecurityError",
     "__version__",
 ]
-
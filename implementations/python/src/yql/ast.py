@@ -1,8 +1,20 @@
-"""AST (Abstract Syntax Tree) definitions for YQL."""
+"""AST (Abstract Syntax Tree) definitions for YQL.
 
-from dataclasses import dataclass, field
+Node classes use ``__slots__`` to keep cached ASTs small; the parser interns
+identifiers and condition strings so repeated names share one object.
+
+``fingerprint()`` returns a structural hash of a node, e.g. to key results
+derived from a query that is no longer modified. Nodes are mutable and not
+hashable, so the fingerprint is not cached on them.
+"""
+
+import hashlib
+from dataclasses import dataclass, field, fields, is_dataclass
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .rows import RowSource
 
 
 class JoinType(Enum):
@@ -29,21 +41,21 @@ class OperationType(Enum):
     UPSERT = "upsert"
 
 
-@dataclass
+@dataclass(slots=True)
 class Column:
     """SELECT clause column."""
     alias: str
     expression: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FromClause:
     """FROM clause."""
     alias: str
     table: str
 
 
-@dataclass
+@dataclass(slots=True)
 class JoinClause:
     """JOIN clause."""
     type: JoinType
@@ -53,28 +65,28 @@ class JoinClause:
     additional_conditions: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderByClause:
     """ORDER BY clause."""
     field: str
     direction: SortDirection = SortDirection.ASC
 
 
-@dataclass
+@dataclass(slots=True)
 class WithClause:
     """WITH clause (CTE)."""
     name: str
     query: "SelectQuery"
 
 
-@dataclass
+@dataclass(slots=True)
 class Pagination:
     """Pagination settings."""
     page: str  # parameter expression like "#{page:1}"
     per_page: str  # parameter expression like "#{per_page:20}"
 
 
-@dataclass
+@dataclass(slots=True)
 class SelectQuery:
     """SELECT query AST."""
     select: list[Column] = field(default_factory=list)
@@ -90,17 +102,31 @@ class SelectQuery:
     pagination: Pagination | None = None
 
 
-@dataclass
+# INSERT strategies: a VALUES list, the dialect's bulk-load path, or
+# PostgreSQL unnest() over one array per column
+INSERT_STRATEGIES = ("values", "bulk", "unnest")
+
+# UPSERT strategies: a VALUES list, or PostgreSQL unnest() over one array per column
+UPSERT_STRATEGIES = ("values", "unnest")
+
+
+@dataclass(slots=True)
 class InsertQuery:
     """INSERT query AST."""
     table: str
     columns: list[str] = field(default_factory=list)
-    values: list[dict[str, Any]] = field(default_factory=list)  # List of row dicts
+    # Row dicts or a RowSource
+    values: "list[dict[str, Any]] | RowSource" = field(default_factory=list)
     from_query: SelectQuery | None = None  # INSERT ... SELECT
     returning: list[str] = field(default_factory=list)
+    # "values" (INSERT ... VALUES), "bulk" (dialect-native bulk load) or "unnest"
+    strategy: str = "values"
+    data_file: str | None = None  # Payload file of a MySQL/SQL Server bulk load
+    # YQL or PostgreSQL type per column ("unnest")
+    column_types: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class UpdateQuery:
     """UPDATE query AST."""
     table: str
@@ -111,7 +137,7 @@ class UpdateQuery:
     returning: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DeleteQuery:
     """DELETE query AST."""
     table: str
@@ -121,7 +147,7 @@ class DeleteQuery:
     returning: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class OnConflictClause:
     """PostgreSQL ON CONFLICT clause."""
     target: list[str] | None = None  # Column names
@@ -131,13 +157,13 @@ class OnConflictClause:
     where: str | None = None  # Conditional update
 
 
-@dataclass
+@dataclass(slots=True)
 class OnDuplicateKeyClause:
     """MySQL ON DUPLICATE KEY UPDATE clause."""
     update: dict[str, Any] = field(default_factory=dict)  # Update values
 
 
-@dataclass
+@dataclass(slots=True)
 class WhenMatchedClause:
     """SQL Server/Oracle WHEN MATCHED clause."""
     update: dict[str, Any] = field(default_factory=dict)  # Update values
@@ -145,19 +171,20 @@ class WhenMatchedClause:
     delete: bool = False  # DELETE action
 
 
-@dataclass
+@dataclass(slots=True)
 class WhenNotMatchedClause:
     """SQL Server/Oracle WHEN NOT MATCHED clause."""
     insert: dict[str, Any] = field(default_factory=dict)  # Insert values
 
 
-@dataclass
+@dataclass(slots=True)
 class UpsertQuery:
     """UPSERT query AST."""
     table: str
     alias: str | None = None
     columns: list[str] = field(default_factory=list)
-    values: list[dict[str, Any]] = field(default_factory=list)  # List of row dicts
+    # Row dicts or a RowSource
+    values: "list[dict[str, Any]] | RowSource" = field(default_factory=list)
     from_query: SelectQuery | None = None  # INSERT ... SELECT
     
     # PostgreSQL: on_conflict
@@ -173,9 +200,18 @@ class UpsertQuery:
     when_not_matched: WhenNotMatchedClause | None = None
     
     returning: list[str] = field(default_factory=list)
+    
+    # Staged bulk upsert (generate_bulk_load): row count above which rows
+    # are bulk-loaded into a staging table, and the MySQL/SQL Server payload file
+    staging_threshold: int | None = None
+    data_file: str | None = None
+    
+    # PostgreSQL: "unnest" passes one array per column (see InsertQuery)
+    strategy: str = "values"
+    column_types: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class YQLQuery:
     """Top-level YQL query container."""
     operation: OperationType = OperationType.SELECT
@@ -190,3 +226,47 @@ class YQLQuery:
     def query(self) -> SelectQuery | None:
         """Backward compatibility: return select_query."""
         return self.select_query
+
+
+def fingerprint(node: Any) -> str:
+    """Return a stable structural hash of an AST node.
+    
+    Two nodes have the same fingerprint if they have the same structure and
+    values. ``YQLQuery.raw`` is not included. AST nodes are mutable (and so
+    not hashable), so the result is computed on every call; use it as a key
+    only for a node that is no longer modified.
+    
+    Args:
+        node: AST node
+        
+    Returns:
+        Hex digest
+    """
+    return hashlib.blake2b(repr(_node_structure(node)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _node_structure(node: Any) -> tuple:
+    return (
+        type(node).__name__,
+        tuple(
+            _structure(getattr(node, f.name))
+            for f in fields(node)
+            if f.compare and f.name != "raw"
+        ),
+    )
+
+
+def _structure(value: Any) -> Any:
+    """Convert a value to a nested tuple whose repr identifies its structure."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return _node_structure(value)
+    elif isinstance(value, Enum):
+        return (type(value).__name__, value.value)
+    elif isinstance(value, (list, tuple)):
+        return ("list", tuple(_structure(item) for item in value))
+    elif isinstance(value, dict):
+        return ("dict", tuple((_structure(k), _structure(v)) for k, v in value.items()))
+    elif value is None or isinstance(value, (str, int, float, bool)):
+        return (type(value).__name__, value)
+    else:
+        return (type(value).__name__, repr(value))
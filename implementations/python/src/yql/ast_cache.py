@@ -0,0 +1,211 @@
+"""Persistent on-disk cache of parsed YQL ASTs.
+
+Each entry stores the ``YQLQuery`` produced by ``parse_file`` together with
+the SHA-256 of every file reached through ``imports``. An entry is valid only
+while the file itself and its whole import closure are unchanged, which is
+checked by hashing file contents; no YAML is parsed on a hit.
+
+Entries use the binary AST format of ``yql.serialize``.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from .ast import YQLQuery
+from .parser import _parse_content
+from .serialize import dumps, loads
+
+# Bump when the AST layout or the entry format changes.
+CACHE_VERSION = 4
+
+_ENTRY_SUFFIX = ".ast"
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache directory.
+
+    ``$YQL_CACHE_DIR`` takes precedence, then ``$XDG_CACHE_HOME/yql/ast``,
+    then ``~/.cache/yql/ast``.
+    """
+    env_dir = os.environ.get("YQL_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    xdg_dir = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_dir) if xdg_dir else Path.home() / ".cache"
+    return base / "yql" / "ast"
+
+
+def _hash_file(path: Path) -> str | None:
+    """Return the SHA-256 of a file's contents, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class ASTCache:
+    """On-disk AST cache for ``parse_file``.
+
+    Example:
+        cache = ASTCache()
+        query = parse_file("query.yql", cache=cache)
+    """
+
+    def __init__(self, directory: Path | str | None = None, max_entries: int = 10000):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: ``default_cache_dir()``)
+            max_entries: Maximum number of entries kept on disk. The least
+                recently used entries are removed when the limit is exceeded.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def parse_file(
+        self, path: str | Path, loaded_files: list[Path] | None = None, format: str | None = None
+    ) -> YQLQuery:
+        """Parse a YQL file, using the cache when possible.
+
+        Args:
+            path: Path to YQL file
+            loaded_files: If given, every file in the import closure is
+                appended to it (on hits as well as misses)
+            format: "yaml", "json", or None to detect (see ``parse``); part
+                of the cache key
+
+        Returns:
+            YQLQuery AST
+
+        Raises:
+            ParseError: If parsing fails
+            FileNotFoundError: If file not found
+        """
+        path = Path(path)
+        content = path.read_bytes()
+        entry_path = self._entry_path(path, content, format)
+
+        entry = self._load_entry(entry_path)
+        if entry is not None:
+            self.hits += 1
+            if loaded_files is not None:
+                loaded_files.extend(Path(dep_path) for dep_path, _ in entry["imports"])
+            return entry["query"]
+
+        self.misses += 1
+        imports: list[Path] = []
+        query = _parse_content(
+            content.decode("utf-8"), path.parent, loaded_files=imports, format=format
+        )
+        self._store_entry(entry_path, query, imports)
+        if loaded_files is not None:
+            loaded_files.extend(imports)
+        return query
+
+    def clear(self) -> int:
+        """Remove every cache entry.
+
+        Returns:
+            Number of removed entries
+        """
+        removed = 0
+        for entry in self._entries():
+            try:
+                entry.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def _entry_path(self, path: Path, content: bytes, format: str | None = None) -> Path:
+        """Return the entry path for a file's resolved location, format and contents."""
+        digest = hashlib.sha256()
+        digest.update(str(path.resolve()).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update((format or "").encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(content).digest())
+        return self.directory / f"{digest.hexdigest()}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return [p for p in self.directory.iterdir() if p.suffix == _ENTRY_SUFFIX]
+
+    def _load_entry(self, entry_path: Path) -> dict | None:
+        """Load an entry if it exists and its import closure is unchanged."""
+        try:
+            entry = loads(entry_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible entry - treat as a miss and overwrite it
+            return None
+
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            return None
+
+        for dep_path, dep_hash in entry["imports"]:
+            if _hash_file(Path(dep_path)) != dep_hash:
+                return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return entry
+
+    def _store_entry(self, entry_path: Path, query: YQLQuery, loaded_files: list[Path]) -> None:
+        """Write an entry atomically and enforce the size limit."""
+        imports = []
+        seen = set()
+        for dep in loaded_files:
+            dep_path = str(dep.resolve())
+            if dep_path in seen:
+                continue
+            seen.add(dep_path)
+            dep_hash = _hash_file(dep)
+            if dep_hash is None:
+                # An import vanished while parsing; don't cache the result
+                return
+            imports.append((dep_path, dep_hash))
+
+        entry = {"version": CACHE_VERSION, "imports": imports, "query": query}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(entry))
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond ``max_entries``."""
+        entries = self._entries()
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        def mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        for entry in sorted(entries, key=mtime)[:excess]:
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,211 @@
+"""Batch compilation of YQL directories."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from .ast_cache import ASTCache
+from .generator import Dialect, generate_sql
+from .parser import ParseError, _load_yaml, _parse_content
+
+
+@dataclass
+class CompileResult:
+    """Result of compiling one YQL file."""
+    source: Path  # Relative to the source directory
+    sql: dict[Dialect, str] = field(default_factory=dict)
+    outputs: list[Path] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)  # "parse" or dialect -> message
+    imports: list[Path] = field(default_factory=list)  # Import closure of the file
+    skipped: bool = False  # Import definition files have nothing to compile
+    elapsed: float = 0.0
+
+
+@dataclass
+class BatchReport:
+    """Summary of a batch compilation."""
+    results: list[CompileResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def failures(self) -> list[CompileResult]:
+        return [r for r in self.results if r.errors]
+
+    @property
+    def compiled(self) -> list[CompileResult]:
+        return [r for r in self.results if r.sql or r.outputs]
+
+    @property
+    def skipped(self) -> list[CompileResult]:
+        return [r for r in self.results if r.skipped]
+
+
+def discover_yql_files(src_dir: Path) -> list[Path]:
+    """Return every ``.yql`` file below ``src_dir`` in a stable order."""
+    return sorted(p for p in src_dir.rglob("*.yql") if p.is_file())
+
+
+def output_path(out_dir: Path, source: Path, dialect: Dialect) -> Path:
+    """Return the output path for a source file (relative path) and dialect.
+
+    Example: ``orders/daily.yql`` -> ``OUT/orders/daily.postgresql.sql``
+    """
+    return out_dir / source.with_suffix(f".{dialect.value}.sql")
+
+
+def parse_dialects(value: str) -> list[Dialect]:
+    """Parse a comma-separated dialect list ("all" selects every dialect)."""
+    if value.strip().lower() == "all":
+        return list(Dialect)
+    dialects = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            dialect = Dialect(name)
+        except ValueError:
+            valid = ", ".join(d.value for d in Dialect)
+            raise ValueError(f"Unknown dialect '{name}'. Valid dialects are: {valid}") from None
+        if dialect not in dialects:
+            dialects.append(dialect)
+    if not dialects:
+        raise ValueError("At least one dialect is required")
+    return dialects
+
+
+def compile_file(
+    path: Path,
+    dialects: list[Dialect],
+    cache: ASTCache | None = None,
+) -> CompileResult:
+    """Compile one YQL file for several dialects.
+
+    The file is parsed once and generated for each dialect. A dialect that
+    fails does not prevent the others from being generated.
+
+    Args:
+        path: Path to YQL file
+        dialects: Target dialects
+        cache: Optional on-disk AST cache
+
+    Returns:
+        CompileResult (``skipped`` is set for import definition files, which
+        have ``select_definition`` but no query)
+    """
+    start = time.perf_counter()
+    result = CompileResult(source=path)
+    try:
+        if cache is not None:
+            query = cache.parse_file(path, loaded_files=result.imports)
+        else:
+            content = path.read_text(encoding="utf-8")
+            query = _parse_content(content, path.parent, loaded_files=result.imports)
+    except Exception as e:
+        if isinstance(e, ParseError) and _is_definition_file(path):
+            result.skipped = True
+        else:
+            result.errors["parse"] = f"{type(e).__name__}: {e}"
+    else:
+        for dialect in dialects:
+            try:
+                result.sql[dialect] = generate_sql(query, dialect)
+            except Exception as e:
+                result.errors[dialect.value] = f"{type(e).__name__}: {e}"
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _is_definition_file(path: Path) -> bool:
+    """Return True if the file only provides definitions for imports."""
+    try:
+        data = _load_yaml(path.read_text(encoding="utf-8"))
+    except (OSError, yaml.YAMLError):
+        return False
+    return (
+        isinstance(data, dict)
+        and "select_definition" in data
+        and "query" not in data
+        and "select" not in data
+    )
+
+
+def _compile_task(task: tuple[str, str, list[str], str | None]) -> CompileResult:
+    """Worker entry point (arguments are plain values so they pickle cheaply)."""
+    src_dir, relative, dialect_values, cache_dir = task
+    dialects = [Dialect(value) for value in dialect_values]
+    cache = ASTCache(cache_dir) if cache_dir is not None else None
+
+    result = compile_file(Path(src_dir) / relative, dialects, cache=cache)
+    result.source = Path(relative)
+    return result
+
+
+def compile_directory(
+    src_dir: Path | str,
+    out_dir: Path | str,
+    dialects: list[Dialect],
+    jobs: int | None = None,
+    cache_dir: Path | str | None = None,
+) -> BatchReport:
+    """Compile every ``.yql`` file below ``src_dir`` for each dialect.
+
+    Files are compiled on a process pool. Workers return the generated SQL
+    and the parent writes all outputs in sorted source order, so the output
+    tree does not depend on the number of workers.
+
+    Args:
+        src_dir: Source directory
+        out_dir: Output directory (created if missing)
+        dialects: Target dialects
+        jobs: Number of worker processes (default: CPU count; 1 runs in-process)
+        cache_dir: Optional on-disk AST cache directory shared by the workers
+
+    Returns:
+        BatchReport with one result per source file
+    """
+    src_dir = Path(src_dir)
+    out_dir = Path(out_dir)
+    if not src_dir.is_dir():
+        raise FileNotFoundError(f"Source directory not found: {src_dir}")
+
+    start = time.perf_counter()
+    sources = discover_yql_files(src_dir)
+    dialect_values = [d.value for d in dialects]
+    cache_value = str(cache_dir) if cache_dir is not None else None
+    tasks = [
+        (str(src_dir), str(path.relative_to(src_dir)), dialect_values, cache_value)
+        for path in sources
+    ]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(tasks)))
+
+    report = BatchReport()
+    if jobs == 1:
+        results = map(_compile_task, tasks)
+        report.results = [_write_outputs(out_dir, result) for result in results]
+    else:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(_compile_task, tasks, chunksize=chunksize)
+            report.results = [_write_outputs(out_dir, result) for result in results]
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _write_outputs(out_dir: Path, result: CompileResult) -> CompileResult:
+    """Write the SQL of one result and release it from memory."""
+    for dialect, sql in result.sql.items():
+        path = output_path(out_dir, result.source, dialect)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(sql, encoding="utf-8")
+        result.outputs.append(path)
+    result.sql = {}
+    return result
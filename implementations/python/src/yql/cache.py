@@ -0,0 +1,209 @@
+"""Compiled-query cache for YQL.
+
+Caches the SQL generated for a YQL document so that repeated
+``parse()`` + ``generate_sql()`` calls for the same text skip YAML loading,
+AST construction, generation and security validation entirely.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .ast import YQLQuery
+from .generator import Dialect, generate_sql
+from .parser import parse
+from .rows import RowSource
+
+if TYPE_CHECKING:
+    from .security import SecurityConfig
+
+
+@dataclass
+class CacheStats:
+    """Cache counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+
+class QueryCache:
+    """Bounded LRU cache of generated SQL.
+
+    Entries are keyed by a SHA-256 digest of the YQL document text, the
+    target dialect, the base path used for imports, the contents of the
+    security configuration and the output layout.
+
+    Note:
+        Imported files are not part of the key. Call ``invalidate()`` after
+        changing a file that cached documents import. Documents that read
+        their rows from a CSV file (``values_from``) are never cached, since
+        the file can change under an unchanged document.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached entries (must be positive)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(
+        yql_content: str,
+        dialect: Dialect,
+        security_config: "SecurityConfig | None" = None,
+        base_path: Path | None = None,
+        layout: str = "pretty",
+    ) -> tuple:
+        """Build the cache key for a document."""
+        digest = hashlib.sha256(yql_content.encode("utf-8")).digest()
+        security_key = security_config.fingerprint() if security_config is not None else None
+        base_key = str(base_path) if base_path is not None else None
+        return (digest, dialect, security_key, base_key, layout)
+
+    def get_or_generate(
+        self,
+        yql_content: str,
+        dialect: Dialect = Dialect.POSTGRESQL,
+        security_config: "SecurityConfig | None" = None,
+        base_path: Path | None = None,
+        layout: str = "pretty",
+    ) -> str:
+        """Return cached SQL for a document, generating it on a miss.
+
+        Args:
+            yql_content: YQL content as string (YAML format)
+            dialect: Target database dialect
+            security_config: Optional security configuration
+            base_path: Base path for resolving relative imports (optional)
+            layout: "pretty" or "compact"
+
+        Returns:
+            Generated SQL string
+
+        Raises:
+            ParseError: If parsing fails (errors are never cached)
+            SecurityError: If forbidden tables are used
+        """
+        key = self.make_key(yql_content, dialect, security_config, base_path, layout)
+        with self._lock:
+            sql = self._entries.get(key)
+            if sql is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return sql
+            self._misses += 1
+
+        # Generate outside the lock; concurrent misses for the same key
+        # produce identical SQL, so the last writer wins harmlessly.
+        query = parse(yql_content, base_path)
+        sql = generate_sql(query, dialect, security_config=security_config, layout=layout)
+        if _reads_csv(query):
+            return sql
+
+        with self._lock:
+            self._entries[key] = sql
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return sql
+
+    def invalidate(self, yql_content: str | None = None) -> int:
+        """Remove cached entries.
+
+        Args:
+            yql_content: If given, only entries for this document are removed
+                (for every dialect and security configuration). Otherwise the
+                whole cache is cleared.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            if yql_content is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            digest = hashlib.sha256(yql_content.encode("utf-8")).digest()
+            keys = [key for key in self._entries if key[0] == digest]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def reset_stats(self) -> None:
+        """Reset hit, miss and eviction counters."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _reads_csv(query: YQLQuery) -> bool:
+    """Return True if the rows of an INSERT/UPSERT come from a CSV file."""
+    dml = query.insert_query or query.upsert_query
+    if dml is None or not isinstance(dml.values, RowSource):
+        return False
+    return dml.values.csv_options is not None
+
+
+_default_cache = QueryCache()
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query cache."""
+    return _default_cache
+
+
+def generate_sql_cached(
+    yql_content: str,
+    dialect: Dialect = Dialect.POSTGRESQL,
+    security_config: "SecurityConfig | None" = None,
+    base_path: Path | None = None,
+    layout: str = "pretty",
+) -> str:
+    """Parse YQL and generate SQL, using the process-wide query cache.
+
+    Equivalent to ``generate_sql(parse(yql_content, base_path), dialect,
+    security_config)``, but a repeated call with the same arguments costs a
+    hash lookup.
+
+    Args:
+        yql_content: YQL content as string (YAML format)
+        dialect: Target database dialect
+        security_config: Optional security configuration
+        base_path: Base path for resolving relative imports (optional)
+        layout: "pretty" or "compact"
+
+    Returns:
+        Generated SQL string
+    """
+    return _default_cache.get_or_generate(yql_content, dialect, security_config, base_path, layout)
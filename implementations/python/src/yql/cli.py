@@ -2,10 +2,14 @@
 
 import argparse
 import sys
+import time
 from pathlib import Path
 
-from . import __version__, parse_file, generate_sql, Dialect
-from .parser import ParseError
+from . import Dialect, __version__, generate_sql, generate_sql_to, parse_file
+from .ast_cache import ASTCache
+from .batch import compile_directory, parse_dialects
+from .parser import ParseError, yaml_backend
+from .watch import RebuildStats, Watcher
 
 
 def format_error(error: Exception) -> str:
@@ -55,7 +59,7 @@ def main():
     parser.add_argument(
         "--version",
         action="version",
-        version=f"%(prog)s {__version__}",
+        version=f"%(prog)s {__version__} (yaml: {yaml_backend()})",
     )
     
     subparsers = parser.add_subparsers(dest="command", help="Commands")
@@ -63,6 +67,7 @@ def main():
     # Parse command
     parse_parser = subparsers.add_parser("parse", help="Parse YQL file and show AST")
     parse_parser.add_argument("file", type=Path, help="YQL file to parse")
+    _add_cache_arguments(parse_parser)
     
     # Generate command
     gen_parser = subparsers.add_parser("generate", help="Generate SQL from YQL file")
@@ -79,6 +84,64 @@ def main():
         type=Path,
         help="Output file (default: stdout)",
     )
+    gen_parser.add_argument(
+        "--layout",
+        type=str,
+        choices=["pretty", "compact"],
+        default="pretty",
+        help="SQL layout: indented lines or a single line (default: pretty)",
+    )
+    _add_cache_arguments(gen_parser)
+    
+    # Compile-dir command
+    compile_parser = subparsers.add_parser(
+        "compile-dir",
+        help="Compile every YQL file in a directory on a process pool",
+    )
+    compile_parser.add_argument("src", type=Path, help="Source directory (searched recursively)")
+    compile_parser.add_argument("out", type=Path, help="Output directory")
+    compile_parser.add_argument(
+        "-d", "--dialect",
+        type=str,
+        default="postgresql",
+        help="Comma-separated target dialects, or 'all' (default: postgresql)",
+    )
+    compile_parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    _add_cache_arguments(compile_parser)
+    
+    # Watch command
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Recompile changed YQL files and their importers",
+    )
+    watch_parser.add_argument("src", type=Path, help="Source directory (searched recursively)")
+    watch_parser.add_argument("out", type=Path, help="Output directory")
+    watch_parser.add_argument(
+        "-d", "--dialect",
+        type=str,
+        default="postgresql",
+        help="Comma-separated target dialects, or 'all' (default: postgresql)",
+    )
+    watch_parser.add_argument(
+        "-i", "--interval",
+        type=float,
+        default=1.0,
+        help="Polling interval in seconds (default: 1.0)",
+    )
+    
+    # Cache command
+    cache_parser = subparsers.add_parser("cache", help="Manage the on-disk AST cache")
+    cache_parser.add_argument("action", choices=["clear"], help="Cache action")
+    cache_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Cache directory (default: $YQL_CACHE_DIR or ~/.cache/yql/ast)",
+    )
     
     args = parser.parse_args()
     
@@ -91,6 +154,12 @@ def main():
             cmd_parse(args)
         elif args.command == "generate":
             cmd_generate(args)
+        elif args.command == "compile-dir":
+            cmd_compile_dir(args)
+        elif args.command == "watch":
+            cmd_watch(args)
+        elif args.command == "cache":
+            cmd_cache(args)
     except Exception as e:
         # エラーメッセージを整形して表示
         error_msg = format_error(e)
@@ -98,24 +167,116 @@ def main():
         sys.exit(1)
 
 
+def _add_cache_arguments(subparser: argparse.ArgumentParser) -> None:
+    """Add opt-in AST cache options to a subcommand."""
+    subparser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Use the on-disk AST cache",
+    )
+    subparser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="AST cache directory (implies --cache)",
+    )
+
+
+def _get_cache(args) -> ASTCache | None:
+    """Return the AST cache selected on the command line, if any."""
+    if args.cache_dir is not None:
+        return ASTCache(args.cache_dir)
+    if args.cache:
+        return ASTCache()
+    return None
+
+
 def cmd_parse(args):
     """Parse command handler."""
-    yql = parse_file(args.file)
+    yql = parse_file(args.file, cache=_get_cache(args))
     print(f"Operation: {yql.operation}")
     print(f"Query: {yql.query}")
 
 
 def cmd_generate(args):
     """Generate command handler."""
-    yql = parse_file(args.file)
+    yql = parse_file(args.file, cache=_get_cache(args))
     dialect = Dialect(args.dialect)
-    sql = generate_sql(yql, dialect)
     
     if args.output:
-        args.output.write_text(sql, encoding="utf-8")
+        # Stream to a temporary file so large statements are never built in
+        # memory and a failed run leaves the previous output in place
+        partial = args.output.with_name(args.output.name + ".partial")
+        try:
+            with open(partial, "w", encoding="utf-8") as f:
+                generate_sql_to(f, yql, dialect, layout=args.layout)
+            partial.replace(args.output)
+        finally:
+            partial.unlink(missing_ok=True)
         print(f"SQL written to {args.output}")
     else:
-        print(sql)
+        print(generate_sql(yql, dialect, layout=args.layout))
+
+
+def cmd_compile_dir(args):
+    """Compile-dir command handler."""
+    dialects = parse_dialects(args.dialect)
+    cache = _get_cache(args)
+    report = compile_directory(
+        args.src,
+        args.out,
+        dialects,
+        jobs=args.jobs,
+        cache_dir=cache.directory if cache is not None else None,
+    )
+    
+    outputs = sum(len(r.outputs) for r in report.compiled)
+    print(
+        f"Compiled {len(report.compiled)} files ({outputs} outputs) in {report.elapsed:.2f}s"
+        f" - {len(report.failures)} failed, {len(report.skipped)} skipped"
+    )
+    
+    slowest = sorted(report.compiled, key=lambda r: r.elapsed, reverse=True)[:5]
+    if slowest:
+        print("Slowest files:")
+        for result in slowest:
+            print(f"  {result.elapsed * 1000:8.1f} ms  {result.source}")
+    
+    if report.failures:
+        print("Failures:", file=sys.stderr)
+        for result in report.failures:
+            for target, message in result.errors.items():
+                print(f"  {result.source} [{target}]: {message}", file=sys.stderr)
+        sys.exit(1)
+
+
+def cmd_watch(args):
+    """Watch command handler."""
+    watcher = Watcher(args.src, args.out, parse_dialects(args.dialect))
+    print(f"Watching {args.src} (Ctrl+C to stop)")
+    try:
+        watcher.run(interval=args.interval, on_rebuild=_print_rebuild)
+    except KeyboardInterrupt:
+        pass
+
+
+def _print_rebuild(stats: RebuildStats) -> None:
+    """Print the result of one watch pass."""
+    timestamp = time.strftime("%H:%M:%S")
+    print(
+        f"[{timestamp}] Rebuilt {len(stats.rebuilt)} files, skipped {stats.skipped}"
+        f" ({len(stats.changed)} changed, {len(stats.removed)} removed) in {stats.elapsed:.2f}s"
+    )
+    for result in stats.failures:
+        for target, message in result.errors.items():
+            print(f"  {result.source} [{target}]: {message}", file=sys.stderr)
+
+
+def cmd_cache(args):
+    """Cache command handler."""
+    cache = ASTCache(args.cache_dir)
+    if args.action == "clear":
+        removed = cache.clear()
+        print(f"Removed {removed} cache entries from {cache.directory}")
 
 
 if __name__ == "__main__":
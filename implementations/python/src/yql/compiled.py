@@ -0,0 +1,218 @@
+"""Precompiled queries.
+
+``compile()`` parses and generates a query once. The resulting
+``CompiledQuery`` keeps the SQL split into static segments and ``#{name}``
+slots, so ``render()`` only substitutes values and ``bind()`` only builds the
+argument list; neither walks the AST again.
+
+Example:
+    query = compile(Path("customers.yql"), Dialect.POSTGRESQL)
+    sql = query.render({"status": "active"})
+    sql, args = query.bind({"status": "active"}, "pyformat")
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from .ast import YQLQuery
+from .generator import _GENERATORS, Dialect, generate_sql
+from .generator.binding import POSITIONAL_STYLES, BindStyle, _coerce_default, bind_sql
+from .parser import parse, parse_file
+
+if TYPE_CHECKING:
+    from .security import SecurityConfig
+
+_SLOT_PATTERN = re.compile(r"#\{([A-Za-z_][\w.]*)(?::([^{}]*))?\}")
+
+
+@dataclass(frozen=True)
+class Slot:
+    """A ``#{name}`` position in the compiled SQL."""
+    name: str
+    default: Any = None
+    has_default: bool = False
+
+
+class CompiledQuery:
+    """Generated SQL prepared for repeated rendering.
+
+    Instances are immutable after construction (apart from a per-style cache
+    used by ``bind``) and can be pickled, e.g. to build them in a parent
+    process and hand them to worker processes.
+    """
+
+    def __init__(self, sql: str, dialect: Dialect, marked_sql: str, literals: list[Any]):
+        """Initialize from generated SQL.
+
+        Args:
+            sql: SQL with inline literals and ``#{name}`` placeholders
+            dialect: Dialect the SQL was generated for
+            marked_sql: The same statement generated in bind mode, with
+                literal markers
+            literals: Literal values referenced by the markers
+        """
+        self.sql = sql
+        self.dialect = dialect
+        self.segments: list[str] = []
+        self.slots: list[Slot] = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(sql):
+            self.segments.append(sql[position:match.start()])
+            if match.group(2) is not None:
+                self.slots.append(Slot(match.group(1), _coerce_default(match.group(2)), True))
+            else:
+                self.slots.append(Slot(match.group(1)))
+            position = match.end()
+        self.segments.append(sql[position:])
+        self._marked_sql = marked_sql
+        self._literals = literals
+        self._bound: dict[BindStyle, tuple[str, list]] = {}
+
+    @property
+    def parameters(self) -> list[str]:
+        """Names of the parameters in order of first use."""
+        return list(dict.fromkeys(slot.name for slot in self.slots))
+
+    def render(self, params: dict[str, Any] | None = None) -> str:
+        """Render SQL with parameter values inlined as SQL literals.
+
+        Strings are quoted and escaped as the dialect requires (quotes
+        doubled; MySQL also escapes backslashes); lists and tuples become a
+        parenthesized, comma-separated list (for ``IN``).
+
+        Args:
+            params: Parameter values by name (slots with defaults may be omitted)
+
+        Returns:
+            SQL string
+
+        Raises:
+            ValueError: If a parameter has neither a value nor a default
+        """
+        if params is None:
+            params = {}
+        quote = _GENERATORS[self.dialect]._quote_string
+        segments = self.segments
+        parts = [segments[0]]
+        for index, slot in enumerate(self.slots, 1):
+            if slot.name in params:
+                value = params[slot.name]
+            elif slot.has_default:
+                value = slot.default
+            else:
+                raise ValueError(f"Missing value for parameter '{slot.name}'")
+            parts.append(_format_literal(value, quote))
+            parts.append(segments[index])
+        return "".join(parts)
+
+    def bind(
+        self,
+        params: dict[str, Any] | None = None,
+        bind_style: BindStyle | str = BindStyle.QMARK,
+    ) -> tuple[str, list[Any] | dict[str, Any]]:
+        """Return SQL with driver placeholders and the driver arguments.
+
+        Args:
+            params: Parameter values by name
+            bind_style: "qmark", "numeric", "named", "pyformat" or "dollar"
+
+        Returns:
+            (sql, args) where args is a list or a dict depending on the style
+
+        Raises:
+            ValueError: If a parameter has neither a value nor a default
+        """
+        style = BindStyle(bind_style)
+        bound = self._bound.get(style)
+        if bound is None:
+            bound = self._prepare(style)
+        sql, params_spec = bound
+        if params is None:
+            params = {}
+
+        values = []
+        for name, is_literal, has_default, default in params_spec:
+            if not is_literal and name in params:
+                values.append(params[name])
+            elif has_default:
+                values.append(default)
+            else:
+                raise ValueError(f"Missing value for parameter '{name}'")
+
+        if style in POSITIONAL_STYLES:
+            return sql, values
+        return sql, {spec[0]: value for spec, value in zip(params_spec, values)}
+
+    def _prepare(self, style: BindStyle) -> tuple[str, list]:
+        """Build the statement for ``style`` and cache it."""
+        bound = bind_sql(self._marked_sql, style, self._literals)
+        spec = [(p.name, p.is_literal, p.has_default, p.default) for p in bound.params]
+        self._bound[style] = (bound.sql, spec)
+        return self._bound[style]
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_bound"] = {}
+        return state
+
+    def __repr__(self) -> str:
+        return f"CompiledQuery(dialect={self.dialect.value}, parameters={self.parameters})"
+
+
+def compile(
+    source: "str | Path | YQLQuery",
+    dialect: Dialect = Dialect.POSTGRESQL,
+    security_config: "SecurityConfig | None" = None,
+    base_path: Path | None = None,
+    layout: str = "pretty",
+) -> CompiledQuery:
+    """Parse and generate a query once for repeated rendering.
+
+    Args:
+        source: YQL text, a path to a YQL file, or a parsed YQLQuery
+        dialect: Target database dialect
+        security_config: Optional security configuration, checked once here
+        base_path: Base path for imports when ``source`` is YQL text
+        layout: "pretty" or "compact"
+
+    Returns:
+        CompiledQuery
+
+    Raises:
+        ParseError: If parsing fails
+        SecurityError: If forbidden tables are used (when security_config is provided)
+    """
+    if isinstance(source, YQLQuery):
+        query = source
+    elif isinstance(source, Path):
+        query = parse_file(source)
+    else:
+        query = parse(source, base_path)
+
+    sql = generate_sql(query, dialect, security_config, layout=layout)
+
+    generator = _GENERATORS[dialect](layout)
+    generator._bind_literals = []
+    marked_sql = generator.generate(query)
+    return CompiledQuery(sql, dialect, marked_sql, generator._bind_literals)
+
+
+def _format_literal(value: Any, quote: Callable[[str], str]) -> str:
+    """Format a parameter value as an SQL literal, quoting strings with ``quote``."""
+    if value is None:
+        return "NULL"
+    elif isinstance(value, str):
+        return quote(value)
+    elif isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    elif isinstance(value, (int, float)):
+        return str(value)
+    elif isinstance(value, (datetime, date)):
+        return f"'{value.isoformat()}'"
+    elif isinstance(value, (list, tuple)):
+        return "(" + ", ".join(_format_literal(v, quote) for v in value) + ")"
+    else:
+        return quote(str(value))
@@ -1,17 +1,23 @@
 """SQL Generators for different database dialects."""
 
+from dataclasses import replace
 from enum import Enum
-from typing import TYPE_CHECKING
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, TextIO
 
-from ..ast import YQLQuery
+from ..ast import OperationType, YQLQuery
+from ..rows import RowSource
+from ..security import SecurityConfig
 from .base import BaseGenerator
+from .binding import BindParameter, BindStyle, BoundSQL, bind_sql
+from .bulk import BulkLoad
 from .mysql import MySQLGenerator
 from .oracle import OracleGenerator
 from .postgresql import PostgreSQLGenerator
 from .sqlserver import SQLServerGenerator
 
 if TYPE_CHECKING:
-    from ..security import SecurityConfig
+    from ..ast import InsertQuery
 
 
 class Dialect(Enum):
@@ -22,6 +28,12 @@ class Dialect(Enum):
     ORACLE = "oracle"
 
 
+# Rows per statement of generate_insert_batches() when not limited otherwise
+DEFAULT_INSERT_BATCH_ROWS = 1000
+
+# Rows above which generate_bulk_load() stages an UPSERT (see UpsertQuery.staging_threshold)
+DEFAULT_STAGING_THRESHOLD = 10000
+
 _GENERATORS: dict[Dialect, type[BaseGenerator]] = {
     Dialect.POSTGRESQL: PostgreSQLGenerator,
     Dialect.MYSQL: MySQLGenerator,
@@ -34,38 +46,504 @@ def generate_sql(
     query: YQLQuery,
     dialect: Dialect = Dialect.POSTGRESQL,
     security_config: "SecurityConfig | None" = None,
-) -> str:
+    bind_style: "BindStyle | str | None" = None,
+    layout: str = "pretty",
+) -> "str | BoundSQL":
     """Generate SQL from YQL AST.
     
     Args:
         query: YQL AST
         dialect: Target database dialect
         security_config: Optional security configuration for table access control
+        bind_style: If given ("qmark", "numeric", "named", "pyformat" or
+            "dollar"), ``#{name}`` placeholders and INSERT/UPDATE literals are
+            replaced by driver placeholders and a BoundSQL is returned
+        layout: "pretty" (one clause per line, indented) or "compact"
+            (single line, minimal whitespace)
         
     Returns:
-        Generated SQL string
+        Generated SQL string, or BoundSQL when ``bind_style`` is given
         
     Raises:
-        ValueError: If dialect is not supported
+        ValueError: If dialect, bind style or layout is not supported
         SecurityError: If forbidden tables are used (when security_config is provided)
     """
-    generator_class = _GENERATORS.get(dialect)
-    if generator_class is None:
-        raise ValueError(f"Unsupported dialect: {dialect}")
+    generator_class = _get_generator_class(dialect)
+    
+    style = _get_bind_style(bind_style)
     
-    generator = generator_class()
+    generator = generator_class(layout)
+    if style is not None:
+        generator._bind_literals = []
     sql = generator.generate(query)
     
-    # Validate SQL against security rules (hook before file output)
+    if style is None:
+        # Validate SQL against security rules (hook before file output)
+        if security_config is not None:
+            security_config.validate_sql(sql)
+        return sql
+    
+    bound = bind_sql(sql, style, generator._bind_literals)
     if security_config is not None:
-        security_config.validate_sql(sql)
+        security_config.validate_sql(bound.sql)
+    return bound
+
+
+def iter_sql(
+    query: YQLQuery,
+    dialect: Dialect = Dialect.POSTGRESQL,
+    security_config: "SecurityConfig | None" = None,
+    chunk_size: int = 65536,
+    layout: str = "pretty",
+) -> Iterator[str]:
+    """Generate SQL from YQL AST as an iterator of text chunks.
+    
+    The statement is built up to its repeated parts (e.g. INSERT VALUES
+    rows), which are formatted only as the chunks are consumed, so a very
+    large statement is never held in memory as a whole.
+    
+    Args:
+        query: YQL AST
+        dialect: Target database dialect
+        security_config: Optional security configuration; every chunk is
+            validated before it is yielded
+        chunk_size: Approximate size of the yielded chunks in characters
+        layout: "pretty" or "compact" (see ``generate_sql()``)
+        
+    Returns:
+        Iterator of SQL chunks whose concatenation equals ``generate_sql()``
+        
+    Raises:
+        ValueError: If dialect or layout is not supported
+        SecurityError: While iterating, if forbidden tables are used
+    """
+    generator = _get_generator_class(dialect)(layout)
+    writer = generator._new_writer()
+    generator.write(writer, query)
+    chunks = writer.iter_chunks(chunk_size)
+    if security_config is not None:
+        chunks = security_config.validate_sql_chunks(chunks)
+    return chunks
+
+
+def generate_sql_to(
+    sink: TextIO,
+    query: YQLQuery,
+    dialect: Dialect = Dialect.POSTGRESQL,
+    security_config: "SecurityConfig | None" = None,
+    chunk_size: int = 65536,
+    encoding: str | None = None,
+    layout: str = "pretty",
+) -> int:
+    """Generate SQL from YQL AST and write it to ``sink`` incrementally.
+    
+    Args:
+        sink: Object with a ``write()`` method (file, ``sys.stdout``,
+            ``socket.makefile("wb")``, ...)
+        query: YQL AST
+        dialect: Target database dialect
+        security_config: Optional security configuration; nothing is written
+            before it has been validated
+        chunk_size: Approximate size of each write in characters
+        encoding: If given, chunks are encoded and written as bytes
+            (for binary sinks)
+        layout: "pretty" or "compact" (see ``generate_sql()``)
+        
+    Returns:
+        Number of characters written
+        
+    Raises:
+        ValueError: If dialect or layout is not supported
+        SecurityError: If forbidden tables are used (the SQL before the
+            offending chunk may already have been written)
+    """
+    written = 0
+    for chunk in iter_sql(query, dialect, security_config, chunk_size, layout):
+        sink.write(chunk.encode(encoding) if encoding is not None else chunk)
+        written += len(chunk)
+    return written
+
+
+def generate_insert_batches(
+    query: YQLQuery,
+    dialect: Dialect = Dialect.POSTGRESQL,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    security_config: "SecurityConfig | None" = None,
+    bind_style: "BindStyle | str | None" = None,
+    layout: str = "pretty",
+) -> "Iterator[str] | Iterator[BoundSQL]":
+    """Generate a multi-row INSERT as a sequence of statements within dialect limits.
+    
+    Rows are split so that no statement exceeds the dialect's limits
+    (SQL Server: 1000 rows and 2100 parameters, MySQL: 4 MiB per
+    statement) or the given ``max_rows``/``max_bytes``. Oracle statements use
+    INSERT ALL. Every statement has the same columns and RETURNING clause.
+    ``values`` may be a RowSource, which is read incrementally. A PostgreSQL
+    INSERT with ``strategy: unnest`` is split by ``max_rows`` only; with
+    ``bind_style`` every statement then has the same text.
+    
+    Args:
+        query: YQL AST of an INSERT
+        dialect: Target database dialect
+        max_rows: Rows per statement (default: 1000; capped by the dialect limit)
+        max_bytes: Maximum UTF-8 size of a statement (default: the dialect
+            limit). A single row larger than this gets its own statement.
+        security_config: Optional security configuration; every statement
+            is validated
+        bind_style: If given, literals become driver placeholders and
+            BoundSQL statements are yielded (the dialect's parameter limit
+            then also applies)
+        layout: "pretty" or "compact" (see ``generate_sql()``)
+        
+    Returns:
+        Iterator of SQL strings, or of BoundSQL when ``bind_style`` is given.
+        An INSERT ... SELECT or an INSERT without rows yields one statement.
+        
+    Raises:
+        ValueError: If the query is not an INSERT, or dialect, bind style or
+            layout is not supported
+        SecurityError: While iterating, if forbidden tables are used
+    """
+    if query.operation != OperationType.INSERT or query.insert_query is None:
+        raise ValueError("generate_insert_batches requires an INSERT query")
+    generator = _get_generator_class(dialect)(layout)
+    style = _get_bind_style(bind_style)
+    
+    insert = query.insert_query
+    if insert.from_query or not (isinstance(insert.values, RowSource) or insert.values):
+        return iter([generate_sql(query, dialect, security_config, bind_style, layout)])
+    
+    if insert.strategy == "unnest" and isinstance(generator, PostgreSQLGenerator):
+        # One array per column: the same statement for every chunk
+        columns = generator._insert_columns(insert.columns, insert.values)
+        row_limit = max_rows or DEFAULT_INSERT_BATCH_ROWS
+        return _iter_chunked_batches(
+            query, dialect, columns, row_limit, security_config, bind_style, layout
+        )
+    
+    row_limit = max_rows or DEFAULT_INSERT_BATCH_ROWS
+    if generator.max_insert_rows:
+        row_limit = min(row_limit, generator.max_insert_rows)
+    byte_limit = max_bytes or generator.max_insert_bytes
+    param_limit = generator.max_insert_params if style is not None else None
+    return _iter_insert_batches(
+        generator, insert, style, row_limit, byte_limit, param_limit, security_config
+    )
+
+
+def _iter_insert_batches(
+    generator: BaseGenerator,
+    insert: "InsertQuery",
+    style: BindStyle | None,
+    row_limit: int,
+    byte_limit: int | None,
+    param_limit: int | None,
+    security_config: "SecurityConfig | None",
+) -> "Iterator[str] | Iterator[BoundSQL]":
+    columns = generator._insert_columns(insert.columns, insert.values)
+    
+    # Statement size = fixed + sum(row sizes) + (rows - 1) * separator
+    write = generator._write_insert_batch
+    one = len(generator._render(write, insert, columns, ["()"]).encode())
+    two = len(generator._render(write, insert, columns, ["()", "()"]).encode())
+    separator = two - one - 2
+    fixed = one - 2
     
-    return sql
+    def emit(rows: list[str], literals: list) -> "str | BoundSQL":
+        sql = generator._render(generator._write_insert_batch, insert, columns, rows)
+        if style is None:
+            result = sql
+        else:
+            result = bind_sql(sql, style, literals)
+            sql = result.sql
+        if security_config is not None:
+            security_config.validate_sql(sql)
+        return result
+    
+    # Without binding, rows are formatted up front (columnar sources a
+    # column at a time); bound rows are formatted one by one below
+    bound = style is not None
+    items = insert.values if bound else generator._iter_formatted_rows(insert.values, columns)
+    
+    rows: list[str] = []
+    literals: list = []
+    size = fixed
+    params = 0
+    for item in items:
+        row_params = 0
+        if bound:
+            generator._bind_literals = literals
+            mark = len(literals)
+            formatted = generator._format_row(item, columns)
+            values = generator._row_values(item, columns)
+            row_params = len(literals) - mark + sum(
+                1 for v in values if isinstance(v, str) and v.startswith("#{")
+            )
+        else:
+            formatted = item
+        row_size = len(formatted.encode()) + (separator if rows else 0)
+        
+        if rows and (
+            len(rows) >= row_limit
+            or (byte_limit is not None and size + row_size > byte_limit)
+            or (param_limit is not None and params + row_params > param_limit)
+        ):
+            # Start a new statement; markers are numbered per statement
+            if bound:
+                del literals[mark:]
+            yield emit(rows, literals)
+            rows, literals, size, params = [], [], fixed, 0
+            if bound:
+                generator._bind_literals = literals
+                formatted = generator._format_row(item, columns)
+            row_size = len(formatted.encode())
+        
+        rows.append(formatted)
+        size += row_size
+        params += row_params
+    
+    # An empty row source produces no statement
+    if rows:
+        yield emit(rows, literals)
+
+
+def generate_upsert_batches(
+    query: YQLQuery,
+    dialect: Dialect = Dialect.POSTGRESQL,
+    max_rows: int | None = None,
+    security_config: "SecurityConfig | None" = None,
+    bind_style: "BindStyle | str | None" = None,
+    layout: str = "pretty",
+) -> "Iterator[str] | Iterator[BoundSQL]":
+    """Generate a multi-row UPSERT as a sequence of statements within dialect limits.
+    
+    The ``values`` rows are split into chunks of at most ``max_rows`` rows
+    (default: 1000; capped by the dialect's row limit and, with
+    ``bind_style``, its parameter limit unless PostgreSQL passes the rows
+    as unnest() arrays), and each chunk is generated as its own UPSERT.
+    SQL Server and Oracle merge each chunk from a source built from its
+    rows (``VALUES`` / ``SELECT ... FROM DUAL UNION ALL``).
+    ``values`` may be a RowSource, which is read incrementally.
+    
+    Args:
+        query: YQL AST of an UPSERT
+        dialect: Target database dialect
+        max_rows: Rows per statement
+        security_config: Optional security configuration; every statement
+            is validated
+        bind_style: If given, literals become driver placeholders and
+            BoundSQL statements are yielded
+        layout: "pretty" or "compact" (see ``generate_sql()``)
+        
+    Returns:
+        Iterator of SQL strings, or of BoundSQL when ``bind_style`` is given.
+        An UPSERT from a query or 'using', or without rows, yields one
+        statement.
+        
+    Raises:
+        ValueError: If the query is not an UPSERT, or dialect, bind style or
+            layout is not supported
+        SecurityError: While iterating, if forbidden tables are used
+    """
+    if query.operation != OperationType.UPSERT or query.upsert_query is None:
+        raise ValueError("generate_upsert_batches requires an UPSERT query")
+    generator = _get_generator_class(dialect)(layout)
+    style = _get_bind_style(bind_style)
+    
+    upsert = query.upsert_query
+    has_rows = isinstance(upsert.values, RowSource) or bool(upsert.values)
+    if upsert.from_query or upsert.using or not has_rows:
+        return iter([generate_sql(query, dialect, security_config, bind_style, layout)])
+    
+    columns = generator._insert_columns(upsert.columns, upsert.values)
+    limits = [max_rows or DEFAULT_INSERT_BATCH_ROWS, generator.max_insert_rows]
+    unnest = upsert.strategy == "unnest" and isinstance(generator, PostgreSQLGenerator)
+    if style is not None and generator.max_insert_params and not unnest:
+        limits.append(max(1, generator.max_insert_params // max(1, len(columns))))
+    row_limit = min(limit for limit in limits if limit)
+    return _iter_chunked_batches(
+        query, dialect, columns, row_limit, security_config, bind_style, layout
+    )
+
+
+def _iter_chunked_batches(
+    query: YQLQuery,
+    dialect: Dialect,
+    columns: list[str],
+    row_limit: int,
+    security_config: "SecurityConfig | None",
+    bind_style: "BindStyle | str | None",
+    layout: str,
+) -> "Iterator[str] | Iterator[BoundSQL]":
+    """Generate the INSERT/UPSERT once per chunk of ``row_limit`` rows."""
+    field = "upsert_query" if query.operation == OperationType.UPSERT else "insert_query"
+    statement = getattr(query, field)
+    rows = iter(statement.values)
+    while True:
+        chunk = list(islice(rows, row_limit))
+        if not chunk:
+            return
+        values = RowSource(chunk, columns) if isinstance(statement.values, RowSource) else chunk
+        chunk_query = replace(query, **{field: replace(statement, columns=columns, values=values)})
+        yield generate_sql(chunk_query, dialect, security_config, bind_style, layout)
+
+
+def generate_bulk_load(
+    query: YQLQuery,
+    dialect: Dialect = Dialect.POSTGRESQL,
+    data_file: str | None = None,
+    security_config: "SecurityConfig | None" = None,
+    layout: str = "pretty",
+    staging_threshold: int | None = None,
+) -> BulkLoad:
+    """Generate the dialect-native bulk load of an INSERT's or UPSERT's rows.
+    
+    PostgreSQL uses COPY ... FROM STDIN, MySQL LOAD DATA LOCAL INFILE,
+    SQL Server BULK INSERT into a staging table copied with INSERT ...
+    SELECT (BULK INSERT maps columns by position) and Oracle an array-bound
+    INSERT (see generator/bulk.py). The rows are encoded only as the
+    payload is read. The query's ``strategy`` does not matter here.
+    
+    An UPSERT with more rows than its staging threshold (or a RowSource of
+    unknown length) is staged: the rows are bulk-loaded into a temporary
+    table, merged into the target with one INSERT ... SELECT ... ON
+    CONFLICT / ON DUPLICATE KEY or MERGE, and the table is dropped. Smaller
+    UPSERTs are returned as the usual statement with inline rows.
+    
+    Args:
+        query: YQL AST of an INSERT or UPSERT with ``values`` (a list or a
+            RowSource)
+        dialect: Target database dialect
+        data_file: Path the MySQL/SQL Server statement reads the payload
+            from (default: the query's ``data_file``)
+        security_config: Optional security configuration; every statement
+            is validated
+        layout: "pretty" or "compact" (see ``generate_sql()``)
+        staging_threshold: Row count above which an UPSERT is staged
+            (default: the query's ``staging_threshold``, else 10000)
+        
+    Returns:
+        BulkLoad with the statements and the payload rows
+        
+    Raises:
+        ValueError: If the query is not an INSERT or UPSERT with rows,
+            ``data_file`` is missing for MySQL/SQL Server, or dialect or
+            layout is not supported
+        SecurityError: If forbidden tables are used
+    """
+    generator = _get_generator_class(dialect)(layout)
+    if query.operation == OperationType.UPSERT and query.upsert_query is not None:
+        return _staged_upsert_load(generator, query, data_file, security_config, staging_threshold)
+    if query.operation != OperationType.INSERT or query.insert_query is None:
+        raise ValueError("generate_bulk_load requires an INSERT or UPSERT query")
+    
+    insert = query.insert_query
+    bulk = replace(insert, strategy="bulk", data_file=data_file or insert.data_file)
+    before, sql, after = generator._bulk_insert_statements(bulk)
+    if security_config is not None:
+        for statement in (*before, sql, *after):
+            security_config.validate_sql(statement)
+    
+    columns = generator._insert_columns(insert.columns, insert.values)
+    rows = insert.values
+    if not isinstance(rows, RowSource):
+        rows = RowSource(rows, columns)
+    return BulkLoad(
+        sql=sql,
+        format=generator.bulk_format,
+        columns=columns,
+        rows=rows,
+        before=before,
+        after=after,
+    )
+
+
+def _staged_upsert_load(
+    generator: BaseGenerator,
+    query: YQLQuery,
+    data_file: str | None,
+    security_config: "SecurityConfig | None",
+    staging_threshold: int | None,
+) -> BulkLoad:
+    upsert = query.upsert_query
+    columns = generator._insert_columns(upsert.columns, upsert.values)
+    rows = upsert.values
+    if not isinstance(rows, RowSource):
+        rows = RowSource(rows, columns)
+    
+    if staging_threshold is None:
+        staging_threshold = upsert.staging_threshold
+    if staging_threshold is None:
+        staging_threshold = DEFAULT_STAGING_THRESHOLD
+    count = rows.row_count
+    if upsert.from_query or (count is not None and count <= staging_threshold):
+        # Small enough for one statement with inline rows
+        sql = generator.generate(query)
+        if security_config is not None:
+            security_config.validate_sql(sql)
+        return BulkLoad(sql=sql, format=None, columns=columns, rows=RowSource([], columns))
+    
+    if not columns:
+        raise ValueError("Staged upsert requires 'columns' or 'values'")
+    staging = generator._staging_table(upsert.table)
+    before = generator._generate_staging_setup(upsert.table, staging, columns)
+    data_file = data_file or upsert.data_file
+    sql = generator._render(generator._write_bulk_load, staging, columns, data_file)
+    staged = generator._staged_upsert(upsert, staging, columns)
+    merge = generator._render(generator._write_upsert, staged)
+    after = [merge, *generator._generate_staging_cleanup(staging)]
+    
+    if security_config is not None:
+        # The staging table is created by the script itself
+        allowed = security_config.allowed_tables
+        config = SecurityConfig({
+            "denied_tables": list(security_config.denied_tables),
+            "allowed_tables": list(allowed | {staging}) if allowed else [],
+        })
+        for statement in (*before, sql, *after):
+            config.validate_sql(statement)
+    return BulkLoad(
+        sql=sql,
+        format=generator.bulk_format,
+        columns=columns,
+        rows=rows,
+        before=before,
+        after=after,
+    )
+
+
+def _get_bind_style(bind_style: "BindStyle | str | None") -> BindStyle | None:
+    if bind_style is None:
+        return None
+    try:
+        return BindStyle(bind_style)
+    except ValueError:
+        valid = ", ".join(s.value for s in BindStyle)
+        raise ValueError(
+            f"Unsupported bind style: {bind_style}. Valid styles are: {valid}"
+        ) from None
+
+
+def _get_generator_class(dialect: Dialect) -> type[BaseGenerator]:
+    generator_class = _GENERATORS.get(dialect)
+    if generator_class is None:
+        raise ValueError(f"Unsupported dialect: {dialect}")
+    return generator_class
 
 
 __all__ = [
     "Dialect",
     "generate_sql",
+    "generate_sql_to",
+    "iter_sql",
+    "generate_insert_batches",
+    "generate_upsert_batches",
+    "generate_bulk_load",
+    "BulkLoad",
+    "BindStyle",
+    "BindParameter",
+    "BoundSQL",
     "BaseGenerator",
     "PostgreSQLGenerator",
     "MySQLGenerator",
@@ -1,6 +1,9 @@
 """Base SQL Generator."""
 
 from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Any, Iterator
+from uuid import uuid4
 
 from ..ast import (
     Column,
@@ -13,16 +16,58 @@ from ..ast import (
     SelectQuery,
     UpdateQuery,
     UpsertQuery,
+    WhenMatchedClause,
+    WhenNotMatchedClause,
     WithClause,
     YQLQuery,
 )
+from ..rows import RowSource
+from .binding import literal_marker
+from .writer import SQLWriter
+
+# Output layouts: one clause per line with indentation, or single-line SQL
+LAYOUTS = ("pretty", "compact")
+
+# Values starting with these are parameters, array parameters, or macros,
+# which are written as-is rather than quoted
+_PASSTHROUGH_PREFIXES = ("#{", "${", "@{")
+
 
 
 class BaseGenerator(ABC):
-    """Base class for SQL generators."""
+    """Base class for SQL generators.
+    
+    Statements are written to an ``SQLWriter`` by the ``_write_*`` methods.
+    The ``_generate_*`` methods return the same fragments as strings.
+    """
     
-    def __init__(self):
+    # Limits of one multi-row INSERT used by generate_insert_batches()
+    # (None: no limit). Parameters only count in bind mode.
+    max_insert_rows: int | None = None
+    max_insert_params: int | None = None
+    max_insert_bytes: int | None = None
+    
+    # Payload format of the bulk-load statement: "text", "tsv", "csv" or
+    # "rows" (see generator/bulk.py)
+    bulk_format: str | None = None
+    
+    def __init__(self, layout: str = "pretty"):
+        """Initialize the generator.
+        
+        Args:
+            layout: "pretty" (one clause per line, indented) or "compact"
+                (single line, minimal whitespace)
+            
+        Raises:
+            ValueError: If the layout is not supported
+        """
+        if layout not in LAYOUTS:
+            valid = ", ".join(LAYOUTS)
+            raise ValueError(f"Unsupported layout: {layout}. Valid layouts are: {valid}")
+        self.layout = layout
         self._indent = "  "
+        # Literal values collected in bind mode (None: literals are inlined)
+        self._bind_literals: list | None = None
     
     def generate(self, yql: YQLQuery) -> str:
         """Generate SQL from YQL AST.
@@ -33,142 +78,209 @@ class BaseGenerator(ABC):
         Returns:
             Generated SQL string
         """
+        w = self._new_writer()
+        self.write(w, yql)
+        return w.getvalue()
+    
+    def write(self, w: SQLWriter, yql: YQLQuery) -> None:
+        """Write SQL for a YQL AST to a writer.
+        
+        Args:
+            w: Destination writer
+            yql: YQL AST
+        """
         if yql.operation == OperationType.SELECT:
             if yql.select_query is None:
                 raise ValueError("SELECT query is empty")
-            return self._generate_select(yql.select_query)
+            self._write_select(w, yql.select_query)
         elif yql.operation == OperationType.INSERT:
             if yql.insert_query is None:
                 raise ValueError("INSERT query is empty")
-            return self._generate_insert(yql.insert_query)
+            self._write_insert(w, yql.insert_query)
         elif yql.operation == OperationType.UPDATE:
             if yql.update_query is None:
                 raise ValueError("UPDATE query is empty")
-            return self._generate_update(yql.update_query)
+            self._write_update(w, yql.update_query)
         elif yql.operation == OperationType.DELETE:
             if yql.delete_query is None:
                 raise ValueError("DELETE query is empty")
-            return self._generate_delete(yql.delete_query)
+            self._write_delete(w, yql.delete_query)
         elif yql.operation == OperationType.UPSERT:
             if yql.upsert_query is None:
                 raise ValueError("UPSERT query is empty")
-            return self._generate_upsert(yql.upsert_query)
+            self._write_upsert(w, yql.upsert_query)
         else:
             raise ValueError(f"Unsupported operation: {yql.operation}")
     
+    def _new_writer(self) -> SQLWriter:
+        return SQLWriter(self._indent, compact=self.layout == "compact")
+    
+    def _render(self, write, *args) -> str:
+        """Run a ``_write_*`` method on a new writer and return its SQL."""
+        w = self._new_writer()
+        write(w, *args)
+        return w.getvalue()
+    
     def _generate_select(self, query: SelectQuery) -> str:
         """Generate SELECT statement."""
-        parts = []
-        
+        return self._render(self._write_select, query)
+    
+    def _write_select(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write SELECT statement."""
         # WITH clauses
         if query.with_clauses:
-            parts.append(self._generate_with_clauses(query.with_clauses))
+            self._write_with_clauses(w, query.with_clauses)
+            w.newline()
         
         # SELECT clause
-        parts.append(self._generate_select_clause(query.select))
+        self._write_select_clause(w, query.select)
         
         # FROM clause
         if query.from_clause:
-            parts.append(self._generate_from_clause(query.from_clause))
+            w.newline()
+            self._write_from_clause(w, query.from_clause)
         
         # JOINs
         for join in query.joins:
-            parts.append(self._generate_join(join))
+            w.newline()
+            self._write_join(w, join)
         
         # WHERE clause
         if query.where:
-            parts.append(self._generate_where_clause(query.where))
+            w.newline()
+            self._write_where_clause(w, query.where)
         
         # GROUP BY
         if query.group_by:
-            parts.append(self._generate_group_by(query.group_by))
+            w.newline()
+            self._write_group_by(w, query.group_by)
         
         # HAVING
         if query.having:
-            parts.append(self._generate_having(query.having))
+            w.newline()
+            self._write_having(w, query.having)
         
         # ORDER BY
         if query.order_by:
-            parts.append(self._generate_order_by(query.order_by))
+            w.newline()
+            self._write_order_by(w, query.order_by)
         
         # LIMIT/OFFSET or pagination
         if query.pagination:
-            parts.append(self._generate_pagination(query))
+            w.newline()
+            self._write_pagination(w, query)
         else:
             if query.limit is not None:
-                parts.append(self._generate_limit(query.limit))
+                w.newline()
+                w.write(self._generate_limit(query.limit))
             if query.offset is not None:
-                parts.append(self._generate_offset(query.offset))
-        
-        return "\n".join(parts)
+                w.newline()
+                w.write(self._generate_offset(query.offset))
     
     def _generate_with_clauses(self, with_clauses: list[WithClause]) -> str:
         """Generate WITH clauses."""
-        cte_parts = []
-        for cte in with_clauses:
-            cte_sql = self._generate_select(cte.query)
-            # Indent the CTE query
-            indented = "\n".join(f"{self._indent}{line}" for line in cte_sql.split("\n"))
-            cte_parts.append(f"{cte.name} AS (\n{indented}\n)")
-        
-        return "WITH " + ",\n".join(cte_parts)
+        return self._render(self._write_with_clauses, with_clauses)
+    
+    def _write_with_clauses(self, w: SQLWriter, with_clauses: list[WithClause]) -> None:
+        """Write WITH clauses, indenting each CTE body in place."""
+        w.write("WITH ")
+        for index, cte in enumerate(with_clauses):
+            if index:
+                w.write(",")
+                w.newline()
+            w.write(f"{cte.name} AS (")
+            with w.indented():
+                w.newline("")
+                self._write_select(w, cte.query)
+            w.newline("")
+            w.write(")")
     
     def _generate_select_clause(self, columns: list[Column]) -> str:
         """Generate SELECT clause."""
+        return self._render(self._write_select_clause, columns)
+    
+    def _write_select_clause(self, w: SQLWriter, columns: list[Column]) -> None:
+        """Write SELECT clause."""
         if not columns:
-            return "SELECT *"
-        
-        column_strs = []
-        for col in columns:
+            w.write("SELECT *")
+            return
+        
+        w.write("SELECT")
+        for index, col in enumerate(columns):
+            if index:
+                w.write(",")
+            w.newline()
+            w.indent()
             if col.alias == col.expression:
-                column_strs.append(col.expression)
+                w.write(col.expression)
             else:
-                column_strs.append(f"{col.expression} AS {col.alias}")
-        
-        return "SELECT\n" + ",\n".join(f"{self._indent}{c}" for c in column_strs)
+                w.write(f"{col.expression} AS {col.alias}")
     
     def _generate_from_clause(self, from_clause: FromClause) -> str:
         """Generate FROM clause."""
+        return self._render(self._write_from_clause, from_clause)
+    
+    def _write_from_clause(self, w: SQLWriter, from_clause: FromClause) -> None:
+        """Write FROM clause."""
         if from_clause.alias == from_clause.table:
-            return f"FROM {from_clause.table}"
-        return f"FROM {from_clause.table} {from_clause.alias}"
+            w.write(f"FROM {from_clause.table}")
+        else:
+            w.write(f"FROM {from_clause.table} {from_clause.alias}")
     
     def _generate_join(self, join: JoinClause) -> str:
         """Generate JOIN clause."""
-        join_type = join.type.value
-        
-        # Build ON conditions
-        all_conditions = list(join.on) + list(join.additional_conditions)
-        on_clause = " AND ".join(c for c in all_conditions if c)
-        
-        if on_clause:
-            return f"{join_type} JOIN {join.table} {join.alias} ON {on_clause}"
-        else:
-            # CROSS JOIN doesn't need ON clause
-            return f"{join_type} JOIN {join.table} {join.alias}"
+        return self._render(self._write_join, join)
+    
+    def _write_join(self, w: SQLWriter, join: JoinClause) -> None:
+        """Write JOIN clause."""
+        w.write(f"{join.type.value} JOIN {join.table} {join.alias}")
+        
+        # ON conditions (CROSS JOIN doesn't need ON clause)
+        conditions = [c for c in (*join.on, *join.additional_conditions) if c]
+        if conditions:
+            w.write(" ON ")
+            w.write_joined(conditions, " AND ")
     
     def _generate_where_clause(self, conditions: list[str]) -> str:
         """Generate WHERE clause."""
-        if len(conditions) == 1:
-            return f"WHERE {conditions[0]}"
-        
-        formatted = f"\n{self._indent}AND ".join(conditions)
-        return f"WHERE {formatted}"
+        return self._render(self._write_where_clause, conditions)
+    
+    def _write_where_clause(self, w: SQLWriter, conditions: list[str]) -> None:
+        """Write WHERE clause (one condition per line, AND-joined)."""
+        w.write("WHERE ")
+        for index, condition in enumerate(conditions):
+            if index:
+                w.newline()
+                w.indent()
+                w.write("AND ")
+            w.write(condition)
     
     def _generate_group_by(self, columns: list[str]) -> str:
         """Generate GROUP BY clause."""
-        return f"GROUP BY {', '.join(columns)}"
+        return self._render(self._write_group_by, columns)
+    
+    def _write_group_by(self, w: SQLWriter, columns: list[str]) -> None:
+        """Write GROUP BY clause."""
+        w.write("GROUP BY ")
+        w.write_joined(columns, ", ")
     
     def _generate_having(self, conditions: list[str]) -> str:
         """Generate HAVING clause."""
-        return f"HAVING {' AND '.join(conditions)}"
+        return self._render(self._write_having, conditions)
+    
+    def _write_having(self, w: SQLWriter, conditions: list[str]) -> None:
+        """Write HAVING clause."""
+        w.write("HAVING ")
+        w.write_joined(conditions, " AND ")
     
     def _generate_order_by(self, order_by: list[OrderByClause]) -> str:
         """Generate ORDER BY clause."""
-        parts = []
-        for ob in order_by:
-            parts.append(f"{ob.field} {ob.direction.value}")
-        return f"ORDER BY {', '.join(parts)}"
+        return self._render(self._write_order_by, order_by)
+    
+    def _write_order_by(self, w: SQLWriter, order_by: list[OrderByClause]) -> None:
+        """Write ORDER BY clause."""
+        w.write("ORDER BY ")
+        w.write_joined([f"{ob.field} {ob.direction.value}" for ob in order_by], ", ")
     
     @abstractmethod
     def _generate_limit(self, limit: int | str) -> str:
@@ -180,53 +292,219 @@ class BaseGenerator(ABC):
         """Generate OFFSET clause (dialect-specific)."""
         pass
     
-    @abstractmethod
     def _generate_pagination(self, query: SelectQuery) -> str:
-        """Generate pagination (dialect-specific)."""
+        """Generate pagination."""
+        return self._render(self._write_pagination, query)
+    
+    @abstractmethod
+    def _write_pagination(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write pagination (dialect-specific)."""
         pass
     
     # ==================== INSERT ====================
     
     def _generate_insert(self, query: InsertQuery) -> str:
         """Generate INSERT statement."""
-        parts = []
+        return self._render(self._write_insert, query)
+    
+    def _write_insert(self, w: SQLWriter, query: InsertQuery) -> None:
+        """Write INSERT statement."""
+        if query.strategy == "bulk":
+            self._write_bulk_insert(w, query)
+            return
         
         # INSERT INTO table
-        parts.append(f"INSERT INTO {query.table}")
+        w.write(f"INSERT INTO {query.table}")
+        
+        # Columns, VALUES or SELECT
+        self._write_insert_source(w, query.columns, query.values, query.from_query)
         
-        # Columns
-        if query.columns:
-            cols = ", ".join(query.columns)
-            parts.append(f"({cols})")
-        elif query.values:
-            # Infer columns from first row
-            cols = ", ".join(query.values[0].keys())
-            parts.append(f"({cols})")
+        # RETURNING
+        if query.returning:
+            w.newline()
+            w.write(self._generate_returning(query.returning))
+    
+    def _write_insert_source(
+        self,
+        w: SQLWriter,
+        columns: list[str],
+        values: "list[dict[str, Any]] | RowSource",
+        from_query: SelectQuery | None,
+    ) -> None:
+        """Write the column list and the VALUES or SELECT of an INSERT."""
+        # Columns (inferred from the first row if not given)
+        columns = self._insert_columns(columns, values)
+        if columns:
+            w.newline()
+            w.write("(")
+            w.write_joined(columns, ", ")
+            w.write(")")
         
         # VALUES or SELECT
-        if query.from_query:
-            parts.append(self._generate_select(query.from_query))
-        elif query.values:
-            values_parts = []
-            for row in query.values:
-                vals = ", ".join(self._format_value(v) for v in row.values())
-                values_parts.append(f"({vals})")
-            parts.append("VALUES " + ", ".join(values_parts))
+        if from_query:
+            w.newline()
+            self._write_select(w, from_query)
+        elif values:
+            w.newline()
+            self._write_values(w, values, columns)
+    
+    def _insert_columns(self, columns: list[str], values: "list[dict[str, Any]] | RowSource") -> list[str]:
+        """Return the declared columns, or those of the row source or first row."""
+        if columns:
+            return columns
+        if isinstance(values, RowSource):
+            return values.columns
+        return list(values[0].keys()) if values else []
+    
+    def _write_values(
+        self, w: SQLWriter, rows: "list[dict[str, Any]] | RowSource", columns: list[str]
+    ) -> None:
+        """Write a VALUES list with one tuple per row.
+        
+        Rows are formatted lazily, so streamed output never holds all of them.
+        """
+        w.write("VALUES ")
+        w.write_iter(self._iter_value_rows(rows, columns))
+    
+    def _iter_value_rows(
+        self, rows: "list[dict[str, Any]] | RowSource", columns: list[str]
+    ) -> Iterator[str]:
+        """Yield the tuples of a VALUES list, separated by ", "."""
+        for index, formatted in enumerate(self._iter_formatted_rows(rows, columns)):
+            yield ", " + formatted if index else formatted
+    
+    def _iter_formatted_rows(
+        self, rows: "list[dict[str, Any]] | RowSource", columns: list[str]
+    ) -> Iterator[str]:
+        """Yield each row formatted by ``_format_row``.
+        
+        Columnar sources are formatted a column at a time with
+        ``_format_column``, unless literals are being bound (their order
+        must follow the rows) or a dialect overrides ``_format_value``.
+        """
+        if (
+            isinstance(rows, RowSource)
+            and rows.is_columnar
+            and self._bind_literals is None
+            and type(self)._format_value is BaseGenerator._format_value
+        ):
+            format_column = self._format_column
+            for block in rows.iter_column_blocks():
+                for parts in zip(*[format_column(values) for values in block]):
+                    yield "(" + ", ".join(parts) + ")"
+        else:
+            for row in rows:
+                yield self._format_row(row, columns)
+    
+    def _format_row(self, row: "dict[str, Any] | tuple", columns: list[str]) -> str:
+        """Format one row (a dict, or a tuple from a RowSource) as a parenthesized value tuple."""
+        format_value = self._format_value
+        return "(" + ", ".join([format_value(v) for v in self._row_values(row, columns)]) + ")"
+    
+    @staticmethod
+    def _row_values(row: "dict[str, Any] | tuple", columns: list[str]) -> "tuple | list":
+        """Return the values of a row in column order (missing keys of a dict become None)."""
+        if isinstance(row, dict):
+            return [row.get(column) for column in columns]
+        return row
+    
+    def _write_insert_batch(
+        self, w: SQLWriter, query: InsertQuery, columns: list[str], rows: list[str]
+    ) -> None:
+        """Write one statement of a batched INSERT.
+        
+        Args:
+            w: Destination writer
+            query: INSERT query (table and RETURNING)
+            columns: Column names
+            rows: Rows formatted by ``_format_row``
+        """
+        w.write(f"INSERT INTO {query.table}")
+        w.newline()
+        w.write("(")
+        w.write_joined(columns, ", ")
+        w.write(")")
+        w.newline()
+        w.write("VALUES ")
+        w.write_joined(rows, ", ")
         
         # RETURNING
         if query.returning:
-            parts.append(self._generate_returning(query.returning))
+            w.newline()
+            w.write(self._generate_returning(query.returning))
+    
+    def _write_bulk_insert(self, w: SQLWriter, query: InsertQuery) -> None:
+        """Write the bulk-load statements of an INSERT with ``strategy: bulk``."""
+        before, sql, after = self._bulk_insert_statements(query)
+        for statement in before:
+            w.write(f"{statement};")
+            w.newline()
+        w.write(sql)
+        for statement in after:
+            w.write(";")
+            w.newline()
+            w.write(statement)
+    
+    def _bulk_insert_statements(self, query: InsertQuery) -> tuple[list[str], str, list[str]]:
+        """Return the statements of an INSERT with ``strategy: bulk``.
+        
+        Returns:
+            The statements to run before the load, the bulk-load statement
+            and the statements to run after it
+        """
+        columns = self._bulk_insert_columns(query)
+        return [], self._render(self._write_bulk_load, query.table, columns, query.data_file), []
+    
+    def _bulk_insert_columns(self, query: InsertQuery) -> list[str]:
+        """Return the payload columns of a bulk INSERT, checking the query."""
+        if query.from_query:
+            raise ValueError("Bulk load requires 'values' rows, not 'from_query'")
+        if query.returning:
+            raise ValueError("Bulk load does not support RETURNING")
+        columns = self._insert_columns(query.columns, query.values)
+        if not columns:
+            raise ValueError("Bulk load requires 'columns' or 'values'")
+        return columns
+    
+    @abstractmethod
+    def _write_bulk_load(
+        self, w: SQLWriter, table: str, columns: list[str], data_file: str | None
+    ) -> None:
+        """Write the dialect's bulk-load statement.
+        
+        The rows are sent separately in ``bulk_format`` (see generator/bulk.py).
         
-        return "\n".join(parts)
+        Args:
+            w: Destination writer
+            table: Target table
+            columns: Column names, in payload order
+            data_file: Path of the payload file for statements that read one
+        """
+        pass
+    
+    def _quote_data_file(self, data_file: str) -> str:
+        """Return the payload file path as a string literal."""
+        return self._quote_string(data_file)
+    
+    @staticmethod
+    def _quote_string(value: str) -> str:
+        """Return ``value`` as an escaped SQL string literal."""
+        return "'" + value.replace("'", "''") + "'"
     
     def _format_value(self, value) -> str:
         """Format a value for SQL.
         
         Parameters, macros, and expressions are passed through as-is
-        to allow template engines to handle them.
+        to allow template engines to handle them. In bind mode, literals are
+        collected and replaced by a marker that becomes a driver placeholder.
         """
         if value is None:
             return "NULL"
+        elif self._bind_literals is not None and not (
+            isinstance(value, str) and value.startswith(_PASSTHROUGH_PREFIXES)
+        ):
+            self._bind_literals.append(value)
+            return literal_marker(len(self._bind_literals) - 1)
         elif isinstance(value, str):
             # Pass through parameters, macros, and expressions as-is
             # This allows template engines (Jinja2, etc.) to handle them
@@ -244,6 +522,34 @@ class BaseGenerator(ABC):
         else:
             return str(value)
     
+    def _format_column(self, values: list[Any]) -> list[str]:
+        """Format a column of literals; the result matches ``_format_value`` per value.
+        
+        The type check runs once per column, so a column of a single type
+        (plus NULLs) is formatted without per-value dispatch.
+        """
+        types = set(map(type, values))
+        nulls = type(None) in types
+        types.discard(type(None))
+        
+        if types <= {int, float}:
+            if not nulls:
+                return list(map(str, values))
+            return ["NULL" if v is None else str(v) for v in values]
+        elif types == {str}:
+            # Parameters, array parameters, and macros pass through
+            if not nulls:
+                return [v if v.startswith(_PASSTHROUGH_PREFIXES) else f"'{v}'" for v in values]
+            return [
+                "NULL" if v is None else v if v.startswith(_PASSTHROUGH_PREFIXES) else f"'{v}'"
+                for v in values
+            ]
+        elif types == {bool}:
+            return ["NULL" if v is None else "TRUE" if v else "FALSE" for v in values]
+        
+        format_value = self._format_value
+        return [format_value(v) for v in values]
+    
     def _generate_returning(self, columns: list[str]) -> str:
         """Generate RETURNING clause (PostgreSQL-specific, override for others)."""
         return f"RETURNING {', '.join(columns)}"
@@ -252,62 +558,135 @@ class BaseGenerator(ABC):
     
     def _generate_update(self, query: UpdateQuery) -> str:
         """Generate UPDATE statement."""
-        parts = []
-        
+        return self._render(self._write_update, query)
+    
+    def _write_update(self, w: SQLWriter, query: UpdateQuery) -> None:
+        """Write UPDATE statement."""
         # UPDATE table
         if query.alias:
-            parts.append(f"UPDATE {query.table} {query.alias}")
+            w.write(f"UPDATE {query.table} {query.alias}")
         else:
-            parts.append(f"UPDATE {query.table}")
+            w.write(f"UPDATE {query.table}")
         
         # SET clause
-        set_parts = []
-        for col, val in query.set_values.items():
-            set_parts.append(f"{col} = {self._format_value(val)}")
-        parts.append("SET " + ", ".join(set_parts))
+        w.newline()
+        w.write("SET ")
+        for index, (col, val) in enumerate(query.set_values.items()):
+            if index:
+                w.write(", ")
+            w.write(f"{col} = {self._format_value(val)}")
         
         # JOINs (dialect-specific, default: not supported)
         # Override in dialect-specific generators
         
         # WHERE clause
         if query.where:
-            parts.append(self._generate_where_clause(query.where))
+            w.newline()
+            self._write_where_clause(w, query.where)
         
         # RETURNING
         if query.returning:
-            parts.append(self._generate_returning(query.returning))
-        
-        return "\n".join(parts)
+            w.newline()
+            w.write(self._generate_returning(query.returning))
     
     # ==================== DELETE ====================
     
     def _generate_delete(self, query: DeleteQuery) -> str:
         """Generate DELETE statement."""
-        parts = []
-        
+        return self._render(self._write_delete, query)
+    
+    def _write_delete(self, w: SQLWriter, query: DeleteQuery) -> None:
+        """Write DELETE statement."""
         # DELETE FROM table
         if query.alias:
-            parts.append(f"DELETE FROM {query.table} {query.alias}")
+            w.write(f"DELETE FROM {query.table} {query.alias}")
         else:
-            parts.append(f"DELETE FROM {query.table}")
+            w.write(f"DELETE FROM {query.table}")
         
         # JOINs (dialect-specific, default: not supported)
         # Override in dialect-specific generators
         
         # WHERE clause
         if query.where:
-            parts.append(self._generate_where_clause(query.where))
+            w.newline()
+            self._write_where_clause(w, query.where)
         
         # RETURNING
         if query.returning:
-            parts.append(self._generate_returning(query.returning))
-        
-        return "\n".join(parts)
+            w.newline()
+            w.write(self._generate_returning(query.returning))
 
 
     # ==================== UPSERT ====================
     
-    @abstractmethod
     def _generate_upsert(self, query: UpsertQuery) -> str:
-        """Generate UPSERT statement (dialect-specific)."""
+        """Generate UPSERT statement."""
+        return self._render(self._write_upsert, query)
+    
+    @abstractmethod
+    def _write_upsert(self, w: SQLWriter, query: UpsertQuery) -> None:
+        """Write UPSERT statement (dialect-specific)."""
         pass
+    
+    def _merge_actions(
+        self, query: UpsertQuery, columns: list[str]
+    ) -> tuple[WhenMatchedClause | None, WhenNotMatchedClause | None]:
+        """Return the WHEN MATCHED / WHEN NOT MATCHED actions of a MERGE.
+        
+        A MERGE from ``values`` without any action updates every column
+        except the ``match_on`` columns and inserts every column.
+        """
+        if query.using is not None or query.when_matched or query.when_not_matched:
+            return query.when_matched, query.when_not_matched
+        update = {column: f"source.{column}" for column in columns if column not in query.match_on}
+        when_matched = WhenMatchedClause(update=update) if update else None
+        insert = {column: f"source.{column}" for column in columns}
+        return when_matched, WhenNotMatchedClause(insert=insert)
+    
+    # ==================== STAGED UPSERT ====================
+    
+    def _staging_table(self, table: str) -> str:
+        """Return a unique staging table name for the staged rows of ``table``.
+        
+        Each load gets its own table (``users_staging_1a2b3c4d``), so
+        concurrent loads into the same table never collide, whether the
+        dialect's temporary tables are per session or schema objects.
+        """
+        return f"{table.rsplit('.', 1)[-1]}_staging_{uuid4().hex[:8]}"
+    
+    def _generate_staging_setup(self, table: str, staging: str, columns: list[str]) -> list[str]:
+        """Generate the statements creating an empty staging table with the target's types."""
+        select = f"SELECT {', '.join(columns)} FROM {table} WHERE 1 = 0"
+        return [f"CREATE TEMPORARY TABLE {staging} AS {select}"]
+    
+    def _generate_staging_cleanup(self, staging: str) -> list[str]:
+        """Generate the statements dropping the staging table."""
+        return [f"DROP TABLE {staging}"]
+    
+    def _staged_upsert(self, query: UpsertQuery, staging: str, columns: list[str]) -> UpsertQuery:
+        """Return ``query`` reading its rows from the staging table (INSERT ... SELECT)."""
+        staged_rows = self._staging_select(staging, columns)
+        return replace(query, columns=columns, values=[], from_query=staged_rows)
+    
+    def _staged_merge(self, query: UpsertQuery, staging: str, columns: list[str]) -> UpsertQuery:
+        """Return MERGE ``query`` using the staging table as its source.
+        
+        The default actions are resolved before 'using' is set, since
+        ``_merge_actions`` returns only explicit actions for a 'using' query.
+        """
+        when_matched, when_not_matched = self._merge_actions(query, columns)
+        return replace(
+            query,
+            columns=columns,
+            values=[],
+            using=self._staging_select(staging, columns),
+            when_matched=when_matched,
+            when_not_matched=when_not_matched,
+        )
+    
+    def _staging_select(self, staging: str, columns: list[str]) -> SelectQuery:
+        """Return SELECT of all staged rows."""
+        return SelectQuery(
+            select=[Column(alias=column, expression=f"s.{column}") for column in columns],
+            from_clause=FromClause(alias="s", table=staging),
+        )
@@ -0,0 +1,211 @@
+"""Bind-parameter output for generated SQL.
+
+In bind mode, ``#{name}`` / ``#{name:default}`` placeholders and the literal
+values of INSERT/UPDATE statements are replaced by driver placeholders, so
+one prepared statement serves every set of values. ``${name}`` (array
+expansion) and ``@{name}`` (macros) are left as-is.
+"""
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+
+class BindStyle(Enum):
+    """Driver placeholder styles (PEP 249 ``paramstyle``, plus PostgreSQL's ``$n``)."""
+    QMARK = "qmark"        # WHERE id = ?
+    NUMERIC = "numeric"    # WHERE id = :1
+    NAMED = "named"        # WHERE id = :id
+    PYFORMAT = "pyformat"  # WHERE id = %(id)s
+    DOLLAR = "dollar"      # WHERE id = $1 (PostgreSQL PREPARE, asyncpg)
+
+
+@dataclass
+class BindParameter:
+    """A parameter of a bound statement."""
+    name: str
+    default: Any = None
+    has_default: bool = False
+    is_literal: bool = False  # A literal value taken from the YQL (default holds the value)
+
+
+@dataclass
+class BoundSQL:
+    """SQL with driver placeholders and its ordered parameters.
+
+    For ``qmark`` every placeholder has its own entry in ``params``. For the
+    other styles a parameter used several times appears once, in order of
+    first use.
+    """
+    sql: str
+    style: BindStyle
+    params: list[BindParameter] = field(default_factory=list)
+
+    def bind(self, values: dict[str, Any] | None = None) -> list[Any] | dict[str, Any]:
+        """Build the driver arguments for this statement.
+
+        Args:
+            values: Parameter values by name (defaults and literals fill the rest)
+
+        Returns:
+            A list for ``qmark``/``numeric``/``dollar``, a dict for
+            ``named``/``pyformat``
+
+        Raises:
+            ValueError: If a parameter has neither a value nor a default
+        """
+        if values is None:
+            values = {}
+        resolved = []
+        for param in self.params:
+            if not param.is_literal and param.name in values:
+                resolved.append((param.name, values[param.name]))
+            elif param.has_default:
+                resolved.append((param.name, param.default))
+            else:
+                raise ValueError(f"Missing value for parameter '{param.name}'")
+
+        if self.style in POSITIONAL_STYLES:
+            return [value for _, value in resolved]
+        return dict(resolved)
+
+
+# Styles whose arguments are a list rather than a dict
+POSITIONAL_STYLES = (BindStyle.QMARK, BindStyle.NUMERIC, BindStyle.DOLLAR)
+
+
+# Marks a literal value in generated SQL. YAML text can contain NUL (a "\0"
+# escape), so bind_sql() rejects SQL text with a NUL that is not a marker
+_LITERAL_MARK = "\x00"
+
+_BIND_PATTERN = re.compile(
+    r"#\{([A-Za-z_][\w.]*)(?::([^{}]*))?\}"
+    r"|" + _LITERAL_MARK + r"(\d+)" + _LITERAL_MARK
+)
+
+
+def literal_marker(index: int) -> str:
+    """Return the marker written into SQL for the literal at ``index``."""
+    return f"{_LITERAL_MARK}{index}{_LITERAL_MARK}"
+
+
+def bind_sql(sql: str, style: BindStyle, literals: list[Any] | None = None) -> BoundSQL:
+    """Replace parameter placeholders and literal markers in SQL.
+
+    Args:
+        sql: SQL generated with literal markers
+        style: Target placeholder style
+        literals: Literal values referenced by the markers
+
+    Returns:
+        BoundSQL
+
+    Raises:
+        ValueError: If the SQL text contains a NUL character of its own (it
+            could pass for a literal marker)
+    """
+    if literals is None:
+        literals = []
+
+    names = {match.group(1) for match in _BIND_PATTERN.finditer(sql) if match.group(1)}
+    literal_names: dict[int, str] = {}
+    counter = 0
+    for index in range(len(literals)):
+        counter += 1
+        while f"lit{counter}" in names:
+            counter += 1
+        literal_names[index] = f"lit{counter}"
+
+    bound = BoundSQL(sql="", style=style)
+    positions: dict[str, int] = {}
+    parts = []
+    position = 0
+
+    seen: set[int] = set()
+
+    for match in _BIND_PATTERN.finditer(sql):
+        parts.append(_escape(_check_text(sql[position:match.start()]), style))
+        position = match.end()
+
+        if match.group(1) is not None:
+            param = BindParameter(name=match.group(1))
+            if match.group(2) is not None:
+                param.default = _coerce_default(match.group(2))
+                param.has_default = True
+        else:
+            index = int(match.group(3))
+            # Every literal is written exactly once; anything else came from the query text
+            if index >= len(literals) or index in seen:
+                raise ValueError("SQL text contains a NUL character")
+            seen.add(index)
+            param = BindParameter(
+                name=literal_names[index],
+                default=literals[index],
+                has_default=True,
+                is_literal=True,
+            )
+
+        if style == BindStyle.QMARK:
+            bound.params.append(param)
+            parts.append("?")
+            continue
+
+        if param.name in positions:
+            existing = bound.params[positions[param.name]]
+            if param.has_default and not existing.has_default:
+                existing.default = param.default
+                existing.has_default = True
+        else:
+            positions[param.name] = len(bound.params)
+            bound.params.append(param)
+
+        if style == BindStyle.NUMERIC:
+            parts.append(f":{positions[param.name] + 1}")
+        elif style == BindStyle.DOLLAR:
+            parts.append(f"${positions[param.name] + 1}")
+        elif style == BindStyle.NAMED:
+            parts.append(f":{param.name}")
+        else:
+            parts.append(f"%({param.name})s")
+
+    parts.append(_escape(_check_text(sql[position:]), style))
+    bound.sql = "".join(parts)
+    return bound
+
+
+def _check_text(text: str) -> str:
+    """Reject SQL text between markers that contains a NUL character."""
+    if _LITERAL_MARK in text:
+        raise ValueError("SQL text contains a NUL character")
+    return text
+
+
+def _escape(text: str, style: BindStyle) -> str:
+    """Escape literal '%' for drivers that use pyformat."""
+    if style == BindStyle.PYFORMAT:
+        return text.replace("%", "%%")
+    return text
+
+
+def _coerce_default(text: str) -> Any:
+    """Convert the default of ``#{name:default}`` to a Python value."""
+    value = text.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+        return value[1:-1]
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    if lowered in ("null", "none", "~"):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    return value
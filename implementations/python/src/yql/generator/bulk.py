@@ -0,0 +1,160 @@
+"""Dialect-native bulk loads.
+
+An INSERT with ``strategy: bulk`` is generated as the dialect's bulk-load
+statement instead of a VALUES list, and its rows are sent separately:
+
+- PostgreSQL: ``COPY ... FROM STDIN``; ``iter_payload()`` yields COPY text
+  format for the driver's copy API
+- MySQL: ``LOAD DATA LOCAL INFILE``; ``write_payload()`` writes the
+  tab-separated file named by ``data_file``
+- SQL Server: ``BULK INSERT``; ``write_payload()`` writes the CSV file named
+  by ``data_file``
+- Oracle: a single-row ``INSERT`` with positional binds; ``iter_row_batches()``
+  yields row lists for ``executemany`` (array binding)
+
+The payload is encoded as it is consumed, so a RowSource is never
+materialized.
+
+A large UPSERT is run as a staged script: ``before`` creates a staging
+table, ``sql`` bulk-loads the rows into it, and ``after`` merges them into
+the target in one set-based statement and drops the staging table.
+
+Example:
+    load = generate_bulk_load(query, Dialect.POSTGRESQL)
+    with cursor.copy(load.sql) as copy:
+        for chunk in load.iter_payload():
+            copy.write(chunk)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, TextIO
+
+from ..rows import RowSource
+
+# Rows per executemany() call of an array-bind load
+DEFAULT_ROW_BATCH_SIZE = 10000
+
+# Backslash escapes of the COPY text and LOAD DATA formats
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+@dataclass
+class BulkLoad:
+    """A bulk-load statement and the rows it loads.
+
+    Run the ``before`` statements, then ``sql`` with the payload, then the
+    ``after`` statements.
+
+    ``format`` is the payload encoding: "text" (PostgreSQL COPY), "tsv"
+    (MySQL LOAD DATA), "csv" (SQL Server BULK INSERT) or "rows" (Oracle
+    array binding). Values are written as data; ``#{name}`` placeholders
+    are not substituted. ``None`` means the rows are inline in ``sql``
+    (an UPSERT below its staging threshold) and there is no payload.
+    """
+    sql: str
+    format: str | None
+    columns: list[str]
+    rows: RowSource
+    before: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+
+    def iter_payload(self, chunk_size: int = 65536) -> Iterator[str]:
+        """Yield the encoded rows in chunks of about ``chunk_size`` characters.
+
+        Raises:
+            ValueError: For the "rows" format, which has no text payload
+        """
+        if self.format is None:
+            return
+        encode = _ENCODERS.get(self.format)
+        if encode is None:
+            raise ValueError(
+                f"Bulk load format '{self.format}' has no text payload; use iter_row_batches()"
+            )
+        lines: list[str] = []
+        size = 0
+        for row in self.rows:
+            line = encode(row)
+            lines.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield "".join(lines)
+                lines = []
+                size = 0
+        if lines:
+            yield "".join(lines)
+
+    def write_payload(
+        self, sink: TextIO, chunk_size: int = 65536, encoding: str | None = None
+    ) -> int:
+        """Write the encoded rows to ``sink`` (e.g. the ``data_file``).
+
+        Args:
+            sink: Object with a ``write()`` method
+            chunk_size: Approximate size of each write in characters
+            encoding: If given, chunks are encoded and written as bytes
+
+        Returns:
+            Number of characters written
+        """
+        written = 0
+        for chunk in self.iter_payload(chunk_size):
+            sink.write(chunk.encode(encoding) if encoding is not None else chunk)
+            written += len(chunk)
+        return written
+
+    def iter_row_batches(self, batch_size: int = DEFAULT_ROW_BATCH_SIZE) -> Iterator[list[tuple]]:
+        """Yield lists of row tuples in column order, e.g. for ``executemany``."""
+        batch: list[tuple] = []
+        for row in self.rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _text_field(value: Any, true: str, false: str) -> str:
+    if value is None:
+        return "\\N"
+    elif value is True:
+        return true
+    elif value is False:
+        return false
+    elif isinstance(value, str):
+        return value.translate(_TEXT_ESCAPES)
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def _encode_copy_text(row: tuple) -> str:
+    return "\t".join([_text_field(value, "t", "f") for value in row]) + "\n"
+
+
+def _encode_tsv(row: tuple) -> str:
+    return "\t".join([_text_field(value, "1", "0") for value in row]) + "\n"
+
+
+def _csv_field(value: Any) -> str:
+    # An unquoted empty field is NULL (KEEPNULLS), a quoted one is ''
+    if value is None:
+        return ""
+    elif value is True:
+        return "1"
+    elif value is False:
+        return "0"
+    text = value if isinstance(value, str) else str(value)
+    if not text or any(c in text for c in ',"\n\r'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _encode_csv(row: tuple) -> str:
+    return ",".join([_csv_field(value) for value in row]) + "\n"
+
+
+_ENCODERS: dict[str, Callable[[tuple], str]] = {
+    "text": _encode_copy_text,
+    "tsv": _encode_tsv,
+    "csv": _encode_csv,
+}
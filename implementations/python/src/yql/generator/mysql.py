@@ -2,11 +2,20 @@
 
 from ..ast import SelectQuery, UpsertQuery
 from .base import BaseGenerator
+from .writer import SQLWriter
 
 
 class MySQLGenerator(BaseGenerator):
     """MySQL-specific SQL generator."""
     
+    # Placeholders per prepared statement, and a statement size that fits
+    # the smallest common max_allowed_packet (4 MiB, the MySQL 5.7 default)
+    max_insert_params = 65535
+    max_insert_bytes = 4 * 1024 * 1024
+    
+    # LOAD DATA reads tab-separated lines with backslash escapes and \N for NULL
+    bulk_format = "tsv"
+    
     def _generate_limit(self, limit: int | str) -> str:
         """Generate LIMIT clause for MySQL."""
         return f"LIMIT {limit}"
@@ -18,13 +27,13 @@ class MySQLGenerator(BaseGenerator):
         """
         return f"OFFSET {offset}"
     
-    def _generate_pagination(self, query: SelectQuery) -> str:
-        """Generate pagination for MySQL.
+    def _write_pagination(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write pagination for MySQL.
         
         Converts pagination settings to LIMIT/OFFSET.
         """
         if query.pagination is None:
-            return ""
+            return
         
         page = query.pagination.page
         per_page = query.pagination.per_page
@@ -46,51 +55,59 @@ class MySQLGenerator(BaseGenerator):
             except ValueError:
                 offset_expr = f"(({page} - 1) * {per_page})"
         
-        return f"LIMIT {limit_expr}\nOFFSET {offset_expr}"
+        w.write(f"LIMIT {limit_expr}")
+        w.newline()
+        w.write(f"OFFSET {offset_expr}")
+    
+    @staticmethod
+    def _quote_string(value: str) -> str:
+        """Return ``value`` as an escaped SQL string literal.
+        
+        Backslash is an escape character in MySQL strings (unless
+        NO_BACKSLASH_ESCAPES is set), so it is escaped as well.
+        """
+        return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+    
+    def _write_bulk_load(
+        self, w: SQLWriter, table: str, columns: list[str], data_file: str | None
+    ) -> None:
+        """Write LOAD DATA LOCAL INFILE for a tab-separated payload file."""
+        if not data_file:
+            raise ValueError("MySQL bulk load requires 'data_file'")
+        
+        w.write(f"LOAD DATA LOCAL INFILE {self._quote_data_file(data_file)}")
+        w.newline()
+        w.write(f"INTO TABLE {table}")
+        w.newline()
+        w.write("CHARACTER SET utf8mb4")
+        w.newline()
+        w.write(f"({', '.join(columns)})")
+    
+    def _generate_staging_cleanup(self, staging: str) -> list[str]:
+        """Generate DROP TEMPORARY TABLE (never drops a permanent table)."""
+        return [f"DROP TEMPORARY TABLE {staging}"]
     
-    def _generate_upsert(self, query: UpsertQuery) -> str:
-        """Generate UPSERT statement for MySQL (INSERT ... ON DUPLICATE KEY UPDATE)."""
+    def _write_upsert(self, w: SQLWriter, query: UpsertQuery) -> None:
+        """Write UPSERT statement for MySQL (INSERT ... ON DUPLICATE KEY UPDATE)."""
         if not query.on_duplicate_key:
             raise ValueError("MySQL UPSERT requires 'on_duplicate_key' clause")
         
-        parts = []
-        
         # INSERT INTO table
-        parts.append(f"INSERT INTO {query.table}")
+        w.write(f"INSERT INTO {query.table}")
         
-        # Columns
-        if query.columns:
-            cols = ", ".join(query.columns)
-            parts.append(f"({cols})")
-        elif query.values:
-            # Infer columns from first row
-            cols = ", ".join(query.values[0].keys())
-            parts.append(f"({cols})")
-        elif query.from_query:
-            # INSERT ... SELECT
-            if query.columns:
-                cols = ", ".join(query.columns)
-                parts.append(f"({cols})")
-        
-        # VALUES or SELECT
-        if query.from_query:
-            parts.append(self._generate_select(query.from_query))
-        elif query.values:
-            values_parts = []
-            for row in query.values:
-                vals = ", ".join(self._format_value(v) for v in row.values())
-                values_parts.append(f"({vals})")
-            parts.append("VALUES " + ", ".join(values_parts))
+        # Columns, VALUES or SELECT
+        self._write_insert_source(w, query.columns, query.values, query.from_query)
         
         # ON DUPLICATE KEY UPDATE
         duplicate = query.on_duplicate_key
         if not duplicate.update:
             raise ValueError("MySQL ON DUPLICATE KEY UPDATE requires 'update' clause")
         
-        update_parts = []
-        for col, val in duplicate.update.items():
-            update_parts.append(f"{col} = {val}")
-        
-        parts.append("ON DUPLICATE KEY UPDATE\n" + ",\n".join(f"  {u}" for u in update_parts))
-        
-        return "\n".join(parts)
+        w.newline()
+        w.write("ON DUPLICATE KEY UPDATE")
+        for index, (col, val) in enumerate(duplicate.update.items()):
+            if index:
+                w.write(",")
+            w.newline()
+            w.indent()
+            w.write(f"{col} = {val}")
@@ -1,12 +1,22 @@
 """Oracle SQL Generator."""
 
-from ..ast import SelectQuery, UpsertQuery
+from typing import Any, Iterator
+
+from ..ast import InsertQuery, SelectQuery, UpsertQuery
+from ..rows import RowSource
 from .base import BaseGenerator
+from .writer import SQLWriter
 
 
 class OracleGenerator(BaseGenerator):
     """Oracle-specific SQL generator."""
     
+    # Bind variables per statement
+    max_insert_params = 65535
+    
+    # Rows are bound as arrays (executemany) to a single-row INSERT
+    bulk_format = "rows"
+    
     def _generate_limit(self, limit: int | str) -> str:
         """Generate LIMIT clause for Oracle.
         
@@ -26,14 +36,14 @@ class OracleGenerator(BaseGenerator):
         # This shouldn't be called directly - offset is handled via ROW_NUMBER()
         raise NotImplementedError("Oracle offset must be used with limit via ROW_NUMBER() OVER()")
     
-    def _generate_pagination(self, query: SelectQuery) -> str:
-        """Generate pagination for Oracle.
+    def _write_pagination(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write pagination for Oracle.
         
         Oracle uses ROW_NUMBER() OVER() for pagination with offset.
         If offset is 0, uses ROWNUM <= limit.
         """
         if query.pagination is None:
-            return ""
+            return
         
         page = query.pagination.page
         per_page = query.pagination.per_page
@@ -61,10 +71,7 @@ class OracleGenerator(BaseGenerator):
             except ValueError:
                 offset_expr = f"(({page} - 1) * {per_page})"
         
-        # Generate ORDER BY fields for ROW_NUMBER()
-        order_by_fields = ", ".join(f"{ob.field} {ob.direction.value}" for ob in query.order_by)
-        
-        # Generate inner query (without pagination)
+        # Inner query (without pagination)
         inner_query = SelectQuery(
             select=query.select,
             from_clause=query.from_clause,
@@ -75,78 +82,70 @@ class OracleGenerator(BaseGenerator):
             order_by=query.order_by,
             with_clauses=query.with_clauses
         )
-        inner_sql = super()._generate_select(inner_query)
-        
-        # Generate column list for outer SELECT
-        if query.select:
-            column_list = ", ".join(f"{col.expression} AS {col.alias}" if col.alias != col.expression else col.expression for col in query.select)
-        else:
-            column_list = "*"
         
-        # Generate outer query with ROW_NUMBER() and WHERE clause
-        return f"""SELECT {column_list} FROM (
-  SELECT {column_list}, ROW_NUMBER() OVER (ORDER BY {order_by_fields}) AS rn
-  FROM ({inner_sql}) subquery
-) WHERE rn > {offset_expr} AND rn <= ({offset_expr} + {limit_expr})"""
+        # Outer query with ROW_NUMBER() and WHERE clause
+        self._write_row_number_query(w, query, inner_query, offset_expr, limit_expr)
     
-    def _generate_select(self, query: SelectQuery) -> str:
-        """Generate SELECT statement for Oracle.
+    def _write_select(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write SELECT statement for Oracle.
         
         Handles LIMIT/OFFSET conversion to ROWNUM or ROW_NUMBER() OVER().
         """
         # If we have both limit and offset, use ROW_NUMBER() OVER()
         if query.limit is not None and query.offset is not None and query.offset != 0:
-            return self._generate_select_with_row_number(query)
+            self._write_select_with_row_number(w, query)
         
         # If we have only limit with offset=0, use ROWNUM
-        if query.limit is not None and (query.offset is None or query.offset == 0):
-            return self._generate_select_with_rownum(query)
+        elif query.limit is not None and (query.offset is None or query.offset == 0):
+            self._write_select_with_rownum(w, query)
         
         # Otherwise, use standard SELECT
-        return super()._generate_select(query)
+        else:
+            super()._write_select(w, query)
     
-    def _generate_select_with_rownum(self, query: SelectQuery) -> str:
-        """Generate SELECT with ROWNUM for simple limit (offset=0)."""
-        parts = []
-        
+    def _write_select_with_rownum(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write SELECT with ROWNUM for simple limit (offset=0)."""
         # WITH clauses
         if query.with_clauses:
-            parts.append(self._generate_with_clauses(query.with_clauses))
+            self._write_with_clauses(w, query.with_clauses)
+            w.newline()
         
         # SELECT clause
-        parts.append(self._generate_select_clause(query.select))
+        self._write_select_clause(w, query.select)
         
         # FROM clause
         if query.from_clause:
-            parts.append(self._generate_from_clause(query.from_clause))
+            w.newline()
+            self._write_from_clause(w, query.from_clause)
         
         # JOINs
         for join in query.joins:
-            parts.append(self._generate_join(join))
+            w.newline()
+            self._write_join(w, join)
         
-        # WHERE clause
+        # WHERE clause with the ROWNUM condition
         where_conditions = list(query.where) if query.where else []
-        # Add ROWNUM condition
         where_conditions.append(f"ROWNUM <= {query.limit}")
-        if where_conditions:
-            parts.append(self._generate_where_clause(where_conditions))
+        w.newline()
+        self._write_where_clause(w, where_conditions)
         
         # GROUP BY
         if query.group_by:
-            parts.append(self._generate_group_by(query.group_by))
+            w.newline()
+            self._write_group_by(w, query.group_by)
         
         # HAVING
         if query.having:
-            parts.append(self._generate_having(query.having))
+            w.newline()
+            self._write_having(w, query.having)
         
         # ORDER BY
         if query.order_by:
-            parts.append(self._generate_order_by(query.order_by))
-        
-        return "\n".join(parts)
+            w.newline()
+            self._write_order_by(w, query.order_by)
     
-    def _generate_select_with_row_number(self, query: SelectQuery) -> str:
-        """Generate SELECT with ROW_NUMBER() OVER() for limit with offset."""
+    def _write_select_with_row_number(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write SELECT with ROW_NUMBER() OVER() for limit with offset."""
         # Oracle requires ORDER BY for ROW_NUMBER() OVER()
         if not query.order_by:
             raise ValueError("Oracle LIMIT with OFFSET requires ORDER BY clause")
@@ -163,27 +162,74 @@ class OracleGenerator(BaseGenerator):
             with_clauses=query.with_clauses
         )
         
+        # Calculate offset and limit
+        offset_val = query.offset if isinstance(query.offset, (int, str)) else str(query.offset)
+        limit_val = query.limit if isinstance(query.limit, (int, str)) else str(query.limit)
+        
+        # Generate outer query with ROW_NUMBER()
+        self._write_row_number_query(w, query, inner_query, offset_val, limit_val)
+    
+    def _write_row_number_query(
+        self,
+        w: SQLWriter,
+        query: SelectQuery,
+        inner_query: SelectQuery,
+        offset: int | str,
+        limit: int | str,
+    ) -> None:
+        """Write an outer query that filters ``inner_query`` by ROW_NUMBER()."""
         # Generate ORDER BY fields for ROW_NUMBER()
         order_by_fields = ", ".join(f"{ob.field} {ob.direction.value}" for ob in query.order_by)
         
-        # Generate inner query SQL
-        inner_sql = super()._generate_select(inner_query)
-        
         # Generate column list for outer SELECT
         if query.select:
             column_list = ", ".join(f"{col.expression} AS {col.alias}" if col.alias != col.expression else col.expression for col in query.select)
         else:
             column_list = "*"
         
-        # Calculate offset and limit
-        offset_val = query.offset if isinstance(query.offset, (int, str)) else str(query.offset)
-        limit_val = query.limit if isinstance(query.limit, (int, str)) else str(query.limit)
+        w.write(f"SELECT {column_list} FROM (")
+        w.newline("")
+        w.indent()
+        w.write(f"SELECT {column_list}, ROW_NUMBER() OVER (ORDER BY {order_by_fields}) AS rn")
+        w.newline()
+        w.indent()
+        w.write("FROM (")
+        # Inner query SQL, written in place
+        super()._write_select(w, inner_query)
+        w.write(") subquery")
+        w.newline("")
+        w.write(f") WHERE rn > {offset} AND rn <= ({offset} + {limit})")
+    
+    def _write_bulk_load(
+        self, w: SQLWriter, table: str, columns: list[str], data_file: str | None
+    ) -> None:
+        """Write a single-row INSERT with positional binds for array binding."""
+        w.write(f"INSERT INTO {table}")
+        w.newline()
+        w.write(f"({', '.join(columns)})")
+        w.newline()
+        w.write(f"VALUES ({', '.join(f':{index}' for index in range(1, len(columns) + 1))})")
+    
+    def _write_insert_batch(
+        self, w: SQLWriter, query: InsertQuery, columns: list[str], rows: list[str]
+    ) -> None:
+        """Write one statement of a batched INSERT for Oracle.
         
-        # Generate outer query with ROW_NUMBER()
-        return f"""SELECT {column_list} FROM (
-  SELECT {column_list}, ROW_NUMBER() OVER (ORDER BY {order_by_fields}) AS rn
-  FROM ({inner_sql}) subquery
-) WHERE rn > {offset_val} AND rn <= ({offset_val} + {limit_val})"""
+        Oracle has no multi-row VALUES, so rows are inserted with INSERT ALL.
+        """
+        if query.returning:
+            # Raises: RETURNING is not supported
+            self._generate_returning(query.returning)
+        
+        into = f"INTO {query.table} ({', '.join(columns)}) VALUES "
+        w.write("INSERT ALL")
+        for row in rows:
+            w.newline()
+            w.indent()
+            w.write(into)
+            w.write(row)
+        w.newline()
+        w.write("SELECT * FROM DUAL")
     
     def _generate_returning(self, columns: list[str]) -> str:
         """Generate RETURNING clause for Oracle.
@@ -193,57 +239,113 @@ class OracleGenerator(BaseGenerator):
         """
         raise NotImplementedError("Oracle does not support RETURNING clause. Use RETURNING INTO in stored procedures.")
     
-    def _generate_upsert(self, query: UpsertQuery) -> str:
-        """Generate UPSERT statement for Oracle (MERGE)."""
-        if not query.using or not query.match_on:
-            raise ValueError("Oracle UPSERT requires 'using' and 'match_on' clauses")
+    def _generate_staging_setup(self, table: str, staging: str, columns: list[str]) -> list[str]:
+        """Generate a global temporary table for the staged rows."""
+        return [
+            f"CREATE GLOBAL TEMPORARY TABLE {staging} ON COMMIT PRESERVE ROWS "
+            f"AS SELECT {', '.join(columns)} FROM {table} WHERE 1 = 0"
+        ]
+    
+    def _generate_staging_cleanup(self, staging: str) -> list[str]:
+        """Generate TRUNCATE and DROP (a temporary table in use cannot be dropped)."""
+        return [f"TRUNCATE TABLE {staging}", f"DROP TABLE {staging}"]
+    
+    def _staged_upsert(self, query: UpsertQuery, staging: str, columns: list[str]) -> UpsertQuery:
+        """Return ``query`` merging from the staging table."""
+        return self._staged_merge(query, staging, columns)
+    
+    def _write_upsert(self, w: SQLWriter, query: UpsertQuery) -> None:
+        """Write UPSERT statement for Oracle (MERGE).
         
-        parts = []
+        Without 'using', the source is a UNION ALL of ``SELECT ... FROM DUAL``
+        rows built from ``values`` (Oracle has no VALUES table constructor).
+        """
+        has_rows = isinstance(query.values, RowSource) or bool(query.values)
+        if not query.match_on or not (query.using or has_rows):
+            raise ValueError("Oracle UPSERT requires 'using' (or 'values') and 'match_on' clauses")
         
-        # MERGE table AS target
+        # MERGE INTO table target (Oracle takes no AS before table aliases)
         target_alias = query.alias or "target"
-        parts.append(f"MERGE {query.table} AS {target_alias}")
+        w.write(f"MERGE INTO {query.table} {target_alias}")
         
         # USING clause
-        # Check if using query needs FROM DUAL (constant values)
-        using_sql = self._generate_select(query.using)
-        # For Oracle, if using has no FROM clause, add FROM DUAL
-        if "FROM" not in using_sql.upper():
-            # This is a simplified check - in practice, we'd need to parse the SELECT
-            # For now, assume if it's a simple SELECT with constants, add FROM DUAL
-            using_sql = using_sql.rstrip() + "\nFROM DUAL"
-        
-        parts.append(f"USING ({using_sql}) AS source")
+        w.newline()
+        if query.using:
+            # Check if using query needs FROM DUAL (constant values)
+            using_sql = self._generate_select(query.using)
+            w.write("USING (")
+            # For Oracle, if using has no FROM clause, add FROM DUAL
+            if "FROM" not in using_sql.upper():
+                # This is a simplified check - in practice, we'd need to parse the SELECT
+                # For now, assume if it's a simple SELECT with constants, add FROM DUAL
+                w.write(using_sql.rstrip())
+                w.newline()
+                w.write("FROM DUAL")
+            else:
+                w.write(using_sql)
+            when_matched, when_not_matched = query.when_matched, query.when_not_matched
+        else:
+            columns = self._insert_columns(query.columns, query.values)
+            w.write("USING (")
+            separator = " UNION ALL " if w.compact else "\nUNION ALL\n"
+            w.write_iter(self._iter_dual_rows(columns, query.values, separator))
+            when_matched, when_not_matched = self._merge_actions(query, columns)
+        w.write(") source")
         
         # ON clause (match_on) - Oracle requires parentheses
         match_conditions = [f"{target_alias}.{col} = source.{col}" for col in query.match_on]
-        parts.append(f"ON ({' AND '.join(match_conditions)})")
+        w.newline()
+        w.write(f"ON ({' AND '.join(match_conditions)})")
         
         # WHEN MATCHED
-        if query.when_matched:
-            matched = query.when_matched
+        if when_matched:
+            matched = when_matched
             if matched.delete:
-                parts.append("WHEN MATCHED THEN DELETE")
+                w.newline()
+                w.write("WHEN MATCHED THEN DELETE")
             elif matched.update:
-                update_parts = []
-                for col, val in matched.update.items():
-                    update_parts.append(f"{col} = {val}")
-                
-                matched_clause = "WHEN MATCHED"
+                w.newline()
+                w.write("WHEN MATCHED")
                 if matched.where:
-                    matched_clause += f" AND {matched.where}"
-                matched_clause += " THEN\n  UPDATE SET\n" + ",\n".join(f"    {u}" for u in update_parts)
-                parts.append(matched_clause)
+                    w.write(f" AND {matched.where}")
+                w.write(" THEN")
+                w.newline()
+                w.indent()
+                w.write("UPDATE SET")
+                for index, (col, val) in enumerate(matched.update.items()):
+                    if index:
+                        w.write(",")
+                    w.newline()
+                    w.indent(2)
+                    w.write(f"{col} = {val}")
         
         # WHEN NOT MATCHED
-        if query.when_not_matched:
-            not_matched = query.when_not_matched
+        if when_not_matched:
+            not_matched = when_not_matched
             if not_matched.insert:
                 insert_cols = list(not_matched.insert.keys())
                 insert_vals = [not_matched.insert[col] for col in insert_cols]
                 
-                parts.append(f"WHEN NOT MATCHED THEN\n  INSERT ({', '.join(insert_cols)})\n  VALUES ({', '.join(insert_vals)})")
-        
-        # Add semicolon for Oracle
-        return "\n".join(parts) + ";"
-
+                w.newline()
+                w.write("WHEN NOT MATCHED THEN")
+                w.newline()
+                w.indent()
+                w.write(f"INSERT ({', '.join(insert_cols)})")
+                w.newline()
+                w.indent()
+                w.write(f"VALUES ({', '.join(insert_vals)})")
+    
+    def _iter_dual_rows(
+        self, columns: list[str], rows: "list[dict[str, Any]] | RowSource", separator: str
+    ) -> Iterator[str]:
+        """Yield one ``SELECT ... FROM DUAL`` per row; the first names the columns."""
+        format_value = self._format_value
+        for index, row in enumerate(rows):
+            values = [format_value(v) for v in self._row_values(row, columns)]
+            if index:
+                yield f"{separator}SELECT {', '.join(values)} FROM DUAL"
+            else:
+                selected = ", ".join(
+                    f"{value} AS {column}" for value, column in zip(values, columns)
+                )
+                yield f"SELECT {selected} FROM DUAL"
@@ -1,12 +1,63 @@
 """PostgreSQL SQL Generator."""
 
-from ..ast import SelectQuery, UpsertQuery
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from ..ast import InsertQuery, SelectQuery, UpsertQuery
+from ..rows import RowSource
 from .base import BaseGenerator
+from .binding import literal_marker
+from .writer import SQLWriter
+
+# PostgreSQL types of the YQL schema types (docs/specs/schema.md), used as
+# unnest() array element types; other names are used as written
+_YQL_TYPES = {
+    "integer": "integer",
+    "bigint": "bigint",
+    "smallint": "smallint",
+    "decimal": "numeric",
+    "float": "real",
+    "double": "double precision",
+    "string": "varchar",
+    "char": "bpchar",
+    "text": "text",
+    "enum": "text",
+    "boolean": "boolean",
+    "date": "date",
+    "time": "time",
+    "timestamp": "timestamp",
+    "timestamptz": "timestamptz",
+    "json": "jsonb",
+    "uuid": "uuid",
+    "binary": "bytea",
+}
+
+# Element types inferred from the Python values of an undeclared column
+_VALUE_TYPES = {
+    bool: "boolean",
+    int: "bigint",
+    float: "double precision",
+    Decimal: "numeric",
+    str: "text",
+    date: "date",
+    datetime: "timestamp",
+    time: "time",
+    UUID: "uuid",
+    bytes: "bytea",
+}
 
 
 class PostgreSQLGenerator(BaseGenerator):
     """PostgreSQL-specific SQL generator."""
     
+    # Bind parameters per statement (16-bit count in the wire protocol)
+    max_insert_params = 65535
+    
+    # COPY text format: tab-separated, backslash escapes, \N for NULL
+    bulk_format = "text"
+    
     def _generate_limit(self, limit: int | str) -> str:
         """Generate LIMIT clause for PostgreSQL."""
         return f"LIMIT {limit}"
@@ -15,13 +66,13 @@ class PostgreSQLGenerator(BaseGenerator):
         """Generate OFFSET clause for PostgreSQL."""
         return f"OFFSET {offset}"
     
-    def _generate_pagination(self, query: SelectQuery) -> str:
-        """Generate pagination for PostgreSQL.
+    def _write_pagination(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write pagination for PostgreSQL.
         
         Converts pagination settings to LIMIT/OFFSET.
         """
         if query.pagination is None:
-            return ""
+            return
         
         page = query.pagination.page
         per_page = query.pagination.per_page
@@ -50,72 +101,166 @@ class PostgreSQLGenerator(BaseGenerator):
             except ValueError:
                 offset_expr = f"(({page} - 1) * {per_page})"
         
-        return f"LIMIT {limit_expr}\nOFFSET {offset_expr}"
+        w.write(f"LIMIT {limit_expr}")
+        w.newline()
+        w.write(f"OFFSET {offset_expr}")
+    
+    def _write_bulk_load(
+        self, w: SQLWriter, table: str, columns: list[str], data_file: str | None
+    ) -> None:
+        """Write COPY ... FROM STDIN; the rows are streamed in COPY text format."""
+        w.write(f"COPY {table} ({', '.join(columns)})")
+        w.newline()
+        w.write("FROM STDIN")
+    
+    def _write_insert(self, w: SQLWriter, query: InsertQuery) -> None:
+        """Write INSERT statement; the "unnest" strategy passes one array per column."""
+        if query.strategy != "unnest" or query.from_query:
+            super()._write_insert(w, query)
+            return
+        
+        w.write(f"INSERT INTO {query.table}")
+        self._write_unnest_source(w, query.columns, query.values, query.column_types)
+        
+        # RETURNING
+        if query.returning:
+            w.newline()
+            w.write(self._generate_returning(query.returning))
+    
+    def _write_unnest_source(
+        self,
+        w: SQLWriter,
+        columns: list[str],
+        values: "list[dict[str, Any]] | RowSource",
+        column_types: dict[str, str],
+    ) -> None:
+        """Write the column list and ``SELECT * FROM unnest(...)`` with one array per column.
+        
+        In bind mode every column array is one parameter (``$1::bigint[]``),
+        so the statement is the same for any number of rows; otherwise the
+        arrays are written as ``ARRAY[...]`` literals. Values are passed as
+        data; ``#{name}`` placeholders inside the arrays are not substituted.
+        """
+        columns = self._insert_columns(columns, values)
+        if not columns:
+            raise ValueError("PostgreSQL unnest insert requires 'columns' or 'values'")
+        
+        w.newline()
+        w.write(f"({', '.join(columns)})")
+        w.newline()
+        w.write("SELECT * FROM unnest(")
+        for index, (column, array) in enumerate(zip(columns, self._column_arrays(columns, values))):
+            if index:
+                w.write(", ")
+            array_type = self._array_type(column, column_types.get(column), array)
+            if self._bind_literals is not None:
+                self._bind_literals.append(array)
+                w.write(f"{literal_marker(len(self._bind_literals) - 1)}::{array_type}[]")
+            else:
+                w.write(f"ARRAY[{', '.join(self._format_column(array))}]::{array_type}[]")
+        w.write(")")
+    
+    def _column_arrays(
+        self, columns: list[str], values: "list[dict[str, Any]] | RowSource"
+    ) -> list[list[Any]]:
+        """Return the values of each column as a list."""
+        if isinstance(values, RowSource) and values.is_columnar:
+            arrays: list[list[Any]] = [[] for _ in columns]
+            for block in values.iter_column_blocks():
+                for array, part in zip(arrays, block):
+                    array.extend(part)
+            return arrays
+        if isinstance(values, RowSource):
+            rows = iter(values)
+        else:
+            rows = (tuple(row.get(column) for column in columns) for row in values)
+        return [list(array) for array in zip(*rows)] or [[] for _ in columns]
+    
+    def _array_type(self, column: str, declared: str | None, values: list[Any]) -> str:
+        """Return the element type of a column array.
+        
+        A declared YQL type is mapped to its PostgreSQL type (keeping a
+        length or precision, e.g. ``decimal(10,2)`` -> ``numeric(10,2)``);
+        without one the type is inferred from the values.
+        
+        Raises:
+            ValueError: If an undeclared column has no non-NULL values or
+                values of mixed types
+        """
+        if declared is not None:
+            name, paren, args = declared.partition("(")
+            name = name.strip()
+            if name.lower() == "array":
+                raise ValueError("PostgreSQL unnest cannot insert array columns")
+            return _YQL_TYPES.get(name.lower(), name) + paren + args.replace(" ", "")
+        
+        types = {type(value) for value in values if value is not None}
+        if types == {int, float}:
+            return "double precision"
+        if not types:
+            raise ValueError(
+                f"Cannot infer the type of column '{column}' without non-NULL values; "
+                "declare it in 'column_types'"
+            )
+        if len(types) > 1:
+            raise ValueError(
+                f"Cannot infer the type of column '{column}' from values of mixed types; "
+                "declare it in 'column_types'"
+            )
+        value_type = types.pop()
+        if value_type is datetime and any(
+            value is not None and value.tzinfo is not None for value in values
+        ):
+            return "timestamptz"
+        return _VALUE_TYPES.get(value_type, "text")
     
-    def _generate_upsert(self, query: UpsertQuery) -> str:
-        """Generate UPSERT statement for PostgreSQL (INSERT ... ON CONFLICT)."""
+    def _write_upsert(self, w: SQLWriter, query: UpsertQuery) -> None:
+        """Write UPSERT statement for PostgreSQL (INSERT ... ON CONFLICT)."""
         if not query.on_conflict:
             raise ValueError("PostgreSQL UPSERT requires 'on_conflict' clause")
         
-        parts = []
-        
         # INSERT INTO table
-        parts.append(f"INSERT INTO {query.table}")
-        
-        # Columns
-        if query.columns:
-            cols = ", ".join(query.columns)
-            parts.append(f"({cols})")
-        elif query.values:
-            # Infer columns from first row
-            cols = ", ".join(query.values[0].keys())
-            parts.append(f"({cols})")
-        elif query.from_query:
-            # INSERT ... SELECT
-            if query.columns:
-                cols = ", ".join(query.columns)
-                parts.append(f"({cols})")
-        
-        # VALUES or SELECT
-        if query.from_query:
-            parts.append(self._generate_select(query.from_query))
-        elif query.values:
-            values_parts = []
-            for row in query.values:
-                vals = ", ".join(self._format_value(v) for v in row.values())
-                values_parts.append(f"({vals})")
-            parts.append("VALUES " + ", ".join(values_parts))
+        w.write(f"INSERT INTO {query.table}")
+        
+        # Columns, VALUES or SELECT (or unnest() arrays)
+        if query.strategy == "unnest" and not query.from_query:
+            self._write_unnest_source(w, query.columns, query.values, query.column_types)
+        else:
+            self._write_insert_source(w, query.columns, query.values, query.from_query)
         
         # ON CONFLICT
         conflict = query.on_conflict
+        w.newline()
         if conflict.target:
-            parts.append(f"ON CONFLICT ({', '.join(conflict.target)})")
+            w.write(f"ON CONFLICT ({', '.join(conflict.target)})")
         elif conflict.unique_constraint:
-            parts.append(f"ON CONFLICT ON CONSTRAINT {conflict.unique_constraint}")
+            w.write(f"ON CONFLICT ON CONSTRAINT {conflict.unique_constraint}")
         else:
             raise ValueError("PostgreSQL ON CONFLICT requires 'target' or 'unique_constraint'")
         
         # Action
         if conflict.action == "ignore":
-            parts.append("DO NOTHING")
+            w.newline()
+            w.write("DO NOTHING")
         elif conflict.action == "update":
             if not conflict.update:
                 raise ValueError("PostgreSQL ON CONFLICT UPDATE requires 'update' clause")
             
-            update_parts = []
-            for col, val in conflict.update.items():
-                update_parts.append(f"{col} = {val}")
-            
-            update_clause = "DO UPDATE SET\n" + ",\n".join(f"  {u}" for u in update_parts)
+            w.newline()
+            w.write("DO UPDATE SET")
+            for index, (col, val) in enumerate(conflict.update.items()):
+                if index:
+                    w.write(",")
+                w.newline()
+                w.indent()
+                w.write(f"{col} = {val}")
             
             # Conditional update
             if conflict.where:
-                update_clause += f"\nWHERE {conflict.where}"
-            
-            parts.append(update_clause)
+                w.newline()
+                w.write(f"WHERE {conflict.where}")
         
         # RETURNING
         if query.returning:
-            parts.append(self._generate_returning(query.returning))
-        
-        return "\n".join(parts)
+            w.newline()
+            w.write(self._generate_returning(query.returning))
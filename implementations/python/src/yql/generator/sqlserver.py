@@ -1,12 +1,21 @@
 """SQL Server SQL Generator."""
 
-from ..ast import OrderByClause, SelectQuery, UpsertQuery
+from ..ast import InsertQuery, OrderByClause, SelectQuery, UpsertQuery
+from ..rows import RowSource
 from .base import BaseGenerator
+from .writer import SQLWriter
 
 
 class SQLServerGenerator(BaseGenerator):
     """SQL Server-specific SQL generator."""
     
+    # Row limit of a VALUES list and parameter limit of a statement
+    max_insert_rows = 1000
+    max_insert_params = 2100
+    
+    # BULK INSERT reads an RFC 4180 CSV file (SQL Server 2017+)
+    bulk_format = "csv"
+    
     def _generate_limit(self, limit: int | str) -> str:
         """Generate TOP clause for SQL Server.
         
@@ -18,86 +27,97 @@ class SQLServerGenerator(BaseGenerator):
     
     def _generate_offset(self, offset: int | str) -> str:
         """Generate OFFSET clause for SQL Server."""
-        return ""  # Handled in _generate_select
+        return ""  # Handled in _write_select
     
-    def _generate_select(self, query: SelectQuery) -> str:
-        """Generate SELECT statement for SQL Server.
+    def _write_select(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write SELECT statement for SQL Server.
         
         Overrides base to handle TOP and OFFSET-FETCH syntax.
         """
-        parts = []
-        
         # WITH clauses
         if query.with_clauses:
-            parts.append(self._generate_with_clauses(query.with_clauses))
+            self._write_with_clauses(w, query.with_clauses)
+            w.newline()
         
         # SELECT clause (with TOP if only LIMIT, no OFFSET)
         if query.limit is not None and query.offset is None and query.pagination is None:
-            parts.append(self._generate_select_clause_with_top(query.select, query.limit))
+            self._write_select_clause_with_top(w, query.select, query.limit)
         else:
-            parts.append(self._generate_select_clause(query.select))
+            self._write_select_clause(w, query.select)
         
         # FROM clause
         if query.from_clause:
-            parts.append(self._generate_from_clause(query.from_clause))
+            w.newline()
+            self._write_from_clause(w, query.from_clause)
         
         # JOINs
         for join in query.joins:
-            parts.append(self._generate_join(join))
+            w.newline()
+            self._write_join(w, join)
         
         # WHERE clause
         if query.where:
-            parts.append(self._generate_where_clause(query.where))
+            w.newline()
+            self._write_where_clause(w, query.where)
         
         # GROUP BY
         if query.group_by:
-            parts.append(self._generate_group_by(query.group_by))
+            w.newline()
+            self._write_group_by(w, query.group_by)
         
         # HAVING
         if query.having:
-            parts.append(self._generate_having(query.having))
+            w.newline()
+            self._write_having(w, query.having)
         
         # ORDER BY (required for OFFSET-FETCH)
         if query.order_by:
-            parts.append(self._generate_order_by(query.order_by))
+            w.newline()
+            self._write_order_by(w, query.order_by)
         elif (query.offset is not None or query.pagination is not None):
             # SQL Server requires ORDER BY for OFFSET-FETCH
             # Add a dummy ORDER BY if not specified
-            parts.append("ORDER BY (SELECT NULL)")
+            w.newline()
+            w.write("ORDER BY (SELECT NULL)")
         
         # OFFSET-FETCH (when both LIMIT and OFFSET, or pagination)
         if query.pagination:
-            parts.append(self._generate_pagination(query))
+            w.newline()
+            self._write_pagination(w, query)
         elif query.limit is not None and query.offset is not None:
-            parts.append(self._generate_offset_fetch(query.offset, query.limit))
-        
-        return "\n".join(parts)
+            w.newline()
+            self._write_offset_fetch(w, query.offset, query.limit)
     
-    def _generate_select_clause_with_top(self, columns: list, limit: int | str) -> str:
-        """Generate SELECT clause with TOP for SQL Server."""
+    def _write_select_clause_with_top(self, w: SQLWriter, columns: list, limit: int | str) -> None:
+        """Write SELECT clause with TOP for SQL Server."""
         if not columns:
-            return f"SELECT TOP {limit} *"
+            w.write(f"SELECT TOP {limit} *")
+            return
         
-        column_strs = []
-        for col in columns:
+        w.write(f"SELECT TOP {limit}")
+        for index, col in enumerate(columns):
+            if index:
+                w.write(",")
+            w.newline()
+            w.indent()
             if col.alias == col.expression:
-                column_strs.append(col.expression)
+                w.write(col.expression)
             else:
-                column_strs.append(f"{col.expression} AS {col.alias}")
-        
-        return f"SELECT TOP {limit}\n" + ",\n".join(f"{self._indent}{c}" for c in column_strs)
+                w.write(f"{col.expression} AS {col.alias}")
     
-    def _generate_offset_fetch(self, offset: int | str, limit: int | str) -> str:
-        """Generate OFFSET-FETCH clause for SQL Server."""
-        return f"OFFSET {offset} ROWS\nFETCH NEXT {limit} ROWS ONLY"
+    def _write_offset_fetch(self, w: SQLWriter, offset: int | str, limit: int | str) -> None:
+        """Write OFFSET-FETCH clause for SQL Server."""
+        w.write(f"OFFSET {offset} ROWS")
+        w.newline()
+        w.write(f"FETCH NEXT {limit} ROWS ONLY")
     
-    def _generate_pagination(self, query: SelectQuery) -> str:
-        """Generate pagination for SQL Server.
+    def _write_pagination(self, w: SQLWriter, query: SelectQuery) -> None:
+        """Write pagination for SQL Server.
         
         Uses OFFSET-FETCH syntax.
         """
         if query.pagination is None:
-            return ""
+            return
         
         page = query.pagination.page
         per_page = query.pagination.per_page
@@ -116,52 +136,132 @@ class SQLServerGenerator(BaseGenerator):
             except ValueError:
                 offset_expr = f"(({page} - 1) * {per_page})"
         
-        return f"OFFSET {offset_expr} ROWS\nFETCH NEXT {per_page} ROWS ONLY"
+        self._write_offset_fetch(w, offset_expr, per_page)
     
-    def _generate_upsert(self, query: UpsertQuery) -> str:
-        """Generate UPSERT statement for SQL Server (MERGE)."""
-        if not query.using or not query.match_on:
-            raise ValueError("SQL Server UPSERT requires 'using' and 'match_on' clauses")
+    def _bulk_insert_statements(self, query: InsertQuery) -> tuple[list[str], str, list[str]]:
+        """Return BULK INSERT into a staging table and INSERT ... SELECT from it.
         
-        parts = []
+        BULK INSERT has no column list and maps the file columns to the
+        table columns by position. The payload is loaded into a staging
+        table with exactly its columns and copied by name.
+        """
+        columns = self._bulk_insert_columns(query)
+        staging = self._staging_table(query.table)
+        sql = self._render(self._write_bulk_load, staging, columns, query.data_file)
+        column_list = ", ".join(columns)
+        insert = f"INSERT INTO {query.table} ({column_list}) SELECT {column_list} FROM {staging}"
+        before = self._generate_staging_setup(query.table, staging, columns)
+        return before, sql, [insert, *self._generate_staging_cleanup(staging)]
+    
+    def _write_bulk_load(
+        self, w: SQLWriter, table: str, columns: list[str], data_file: str | None
+    ) -> None:
+        """Write BULK INSERT for a CSV payload file.
+        
+        BULK INSERT has no column list: the file columns must match the
+        columns of the table in order, so ``table`` is a staging table with
+        exactly the payload columns.
+        """
+        if not data_file:
+            raise ValueError("SQL Server bulk load requires 'data_file'")
+        
+        w.write(f"BULK INSERT {table}")
+        w.newline()
+        w.write(f"FROM {self._quote_data_file(data_file)}")
+        w.newline()
+        w.write("WITH (FORMAT = 'CSV', CODEPAGE = '65001', ROWTERMINATOR = '0x0a', KEEPNULLS)")
+    
+    def _staging_table(self, table: str) -> str:
+        """Return a local temporary table (#name) for the staged rows."""
+        return "#" + super()._staging_table(table)
+    
+    def _generate_staging_setup(self, table: str, staging: str, columns: list[str]) -> list[str]:
+        """Generate SELECT ... INTO for an empty staging table.
+        
+        SELECT ... INTO copies the IDENTITY property of a column, and BULK
+        INSERT would then replace the keys from the file. A UNION ALL query
+        creates the columns without it.
+        """
+        select = f"SELECT {', '.join(columns)}"
+        empty = f"FROM {table} WHERE 1 = 0"
+        return [f"{select} INTO {staging} {empty} UNION ALL {select} {empty}"]
+    
+    def _staged_upsert(self, query: UpsertQuery, staging: str, columns: list[str]) -> UpsertQuery:
+        """Return ``query`` merging from the staging table."""
+        return self._staged_merge(query, staging, columns)
+    
+    def _write_upsert(self, w: SQLWriter, query: UpsertQuery) -> None:
+        """Write UPSERT statement for SQL Server (MERGE).
+        
+        Without 'using', the source is a VALUES table constructor of the
+        ``values`` rows.
+        """
+        has_rows = isinstance(query.values, RowSource) or bool(query.values)
+        if not query.match_on or not (query.using or has_rows):
+            raise ValueError(
+                "SQL Server UPSERT requires 'using' (or 'values') and 'match_on' clauses"
+            )
         
         # MERGE table AS target
         target_alias = query.alias or "target"
-        parts.append(f"MERGE {query.table} AS {target_alias}")
+        w.write(f"MERGE {query.table} AS {target_alias}")
         
         # USING clause
-        using_sql = self._generate_select(query.using)
-        parts.append(f"USING ({using_sql}) AS source")
+        w.newline()
+        if query.using:
+            w.write("USING (")
+            self._write_select(w, query.using)
+            w.write(") AS source")
+            when_matched, when_not_matched = query.when_matched, query.when_not_matched
+        else:
+            columns = self._insert_columns(query.columns, query.values)
+            w.write("USING (VALUES ")
+            w.write_iter(self._iter_value_rows(query.values, columns))
+            w.write(f") AS source ({', '.join(columns)})")
+            when_matched, when_not_matched = self._merge_actions(query, columns)
         
         # ON clause (match_on)
         match_conditions = [f"{target_alias}.{col} = source.{col}" for col in query.match_on]
-        parts.append(f"ON {' AND '.join(match_conditions)}")
+        w.newline()
+        w.write(f"ON {' AND '.join(match_conditions)}")
         
         # WHEN MATCHED
-        if query.when_matched:
-            matched = query.when_matched
+        if when_matched:
+            matched = when_matched
             if matched.delete:
-                parts.append("WHEN MATCHED THEN DELETE")
+                w.newline()
+                w.write("WHEN MATCHED THEN DELETE")
             elif matched.update:
-                update_parts = []
-                for col, val in matched.update.items():
-                    update_parts.append(f"{col} = {val}")
-                
-                matched_clause = "WHEN MATCHED"
+                w.newline()
+                w.write("WHEN MATCHED")
                 if matched.where:
-                    matched_clause += f" AND {matched.where}"
-                matched_clause += " THEN\n  UPDATE SET\n" + ",\n".join(f"    {u}" for u in update_parts)
-                parts.append(matched_clause)
+                    w.write(f" AND {matched.where}")
+                w.write(" THEN")
+                w.newline()
+                w.indent()
+                w.write("UPDATE SET")
+                for index, (col, val) in enumerate(matched.update.items()):
+                    if index:
+                        w.write(",")
+                    w.newline()
+                    w.indent(2)
+                    w.write(f"{col} = {val}")
         
         # WHEN NOT MATCHED
-        if query.when_not_matched:
-            not_matched = query.when_not_matched
+        if when_not_matched:
+            not_matched = when_not_matched
             if not_matched.insert:
                 insert_cols = list(not_matched.insert.keys())
                 insert_vals = [not_matched.insert[col] for col in insert_cols]
                 
-                parts.append(f"WHEN NOT MATCHED THEN\n  INSERT ({', '.join(insert_cols)})\n  VALUES ({', '.join(insert_vals)})")
+                w.newline()
+                w.write("WHEN NOT MATCHED THEN")
+                w.newline()
+                w.indent()
+                w.write(f"INSERT ({', '.join(insert_cols)})")
+                w.newline()
+                w.indent()
+                w.write(f"VALUES ({', '.join(insert_vals)})")
         
         # Add semicolon for SQL Server
-        return "\n".join(parts) + ";"
-
+        w.write(";")
@@ -0,0 +1,128 @@
+"""Buffer for building SQL text in one pass."""
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+
+class SQLWriter:
+    """Append-only SQL buffer that tracks block indentation.
+
+    Fragments are collected in a list and joined once by ``getvalue()``.
+    Inside ``indented()`` every new line, including the lines of multi-line
+    fragments, starts with the current indentation, so nested statements
+    (e.g. CTE bodies) are written in place instead of being generated as
+    separate strings and re-indented at every level.
+
+    In compact mode (``compact=True``) line breaks become single spaces, or
+    nothing next to parentheses, and indentation is dropped, so the same
+    generator code produces single-line SQL. Newlines inside fragments
+    (e.g. in string literals) are kept as written.
+
+    Large repeated parts (e.g. VALUES rows) can be added lazily with
+    ``write_iter()``; they are produced only when the SQL is read, so
+    ``iter_chunks()`` can stream a statement without holding all of it.
+
+    Example:
+        w = SQLWriter()
+        w.write("cte AS (")
+        with w.indented():
+            w.newline()
+            w.write("SELECT 1")
+        w.newline()
+        w.write(")")
+    """
+
+    __slots__ = ("_parts", "_indent", "_prefix", "compact")
+
+    def __init__(self, indent: str = "  ", compact: bool = False):
+        """Initialize the writer.
+
+        Args:
+            indent: Indentation added per ``indented()`` level
+            compact: Write single-line SQL
+        """
+        # Strings, or (lazy fragments, indentation) pairs
+        self._parts: list = []
+        self._indent = "" if compact else indent
+        self._prefix = ""
+        self.compact = compact
+
+    def write(self, text: str) -> None:
+        """Append a fragment (embedded newlines get the current indentation)."""
+        if self._prefix and "\n" in text:
+            text = text.replace("\n", "\n" + self._prefix)
+        self._parts.append(text)
+
+    def write_iter(self, fragments: Iterable[str]) -> None:
+        """Append fragments that are produced lazily when the SQL is read.
+
+        The iterable is consumed once, by ``getvalue()`` or ``iter_chunks()``.
+        """
+        self._parts.append((fragments, self._prefix))
+
+    def newline(self, compact: str = " ") -> None:
+        """Start a new line at the current indentation.
+
+        Args:
+            compact: Written instead in compact mode ("" where no separator
+                is needed, e.g. after "(")
+        """
+        if self.compact:
+            if compact:
+                self._parts.append(compact)
+        else:
+            self._parts.append("\n" + self._prefix)
+
+    def indent(self, levels: int = 1) -> None:
+        """Write indentation within a line (nothing in compact mode)."""
+        if self._indent:
+            self._parts.append(self._indent * levels)
+
+    def write_joined(self, items: "list[str]", separator: str) -> None:
+        """Append items separated by ``separator``."""
+        for index, item in enumerate(items):
+            if index:
+                self.write(separator)
+            self.write(item)
+
+    @contextmanager
+    def indented(self) -> Iterator[None]:
+        """Indent lines started inside the block by one level."""
+        previous = self._prefix
+        self._prefix = previous + self._indent
+        try:
+            yield
+        finally:
+            self._prefix = previous
+
+    def getvalue(self) -> str:
+        """Return the SQL written so far."""
+        return "".join(self._iter_fragments())
+
+    def iter_chunks(self, chunk_size: int = 65536) -> Iterator[str]:
+        """Yield the SQL written so far in chunks of about ``chunk_size`` characters.
+
+        Lazy fragments are produced as the chunks are consumed.
+        """
+        buffer: list[str] = []
+        size = 0
+        for fragment in self._iter_fragments():
+            buffer.append(fragment)
+            size += len(fragment)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def _iter_fragments(self) -> Iterator[str]:
+        for part in self._parts:
+            if isinstance(part, str):
+                yield part
+                continue
+            fragments, prefix = part
+            for fragment in fragments:
+                if prefix and "\n" in fragment:
+                    fragment = fragment.replace("\n", "\n" + prefix)
+                yield fragment
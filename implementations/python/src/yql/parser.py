@@ -1,11 +1,23 @@
 """YQL Parser - Parses YAML into AST."""
 
+import io
+import json
+import os
+import re
+import stat as stat_module
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
 import yaml
 
 from .ast import (
+    INSERT_STRATEGIES,
+    UPSERT_STRATEGIES,
     Column,
     DeleteQuery,
     FromClause,
@@ -26,6 +38,20 @@ from .ast import (
     WithClause,
     YQLQuery,
 )
+from .rows import RowSource
+
+if TYPE_CHECKING:
+    from .ast_cache import ASTCache
+
+# Prefer libyaml's C loader; fall back to the pure-Python loader when PyYAML
+# was built without libyaml. Both accept the same YAML and raise the same
+# yaml.YAMLError subclasses.
+try:
+    from yaml import CSafeLoader as _SafeLoader
+    YAML_BACKEND = "libyaml"
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+    YAML_BACKEND = "python"
 
 
 class ParseError(Exception):
@@ -51,35 +77,126 @@ class ParseError(Exception):
         return self.message
 
 
-def parse(yql_content: str, base_path: Path | None = None) -> YQLQuery:
+def _load_yaml(content: str) -> Any:
+    """Load a single YAML document with the fastest available safe loader.
+    
+    Raises:
+        yaml.YAMLError: With a source snippet and caret under the error
+            position for either loader
+    """
+    try:
+        return yaml.load(content, Loader=_SafeLoader)
+    except yaml.MarkedYAMLError as e:
+        _add_snippets(e, content)
+        raise
+
+
+def _add_snippets(error: yaml.MarkedYAMLError, content: str) -> None:
+    """Give libyaml's marks the source text so the error shows the snippet.
+    
+    The pure-Python loader's marks point into the source and print the
+    offending line with a caret; libyaml's marks only carry line and column.
+    """
+    lines = content.split("\n")
+    buffer = content + "\0"
+    for attr in ("context_mark", "problem_mark"):
+        mark = getattr(error, attr)
+        if mark is None or mark.get_snippet() is not None:
+            continue
+        # A mark past the last line (end of stream) points at the end
+        pointer = min(sum(len(line) + 1 for line in lines[:mark.line]) + mark.column, len(content))
+        snippet_mark = yaml.Mark(mark.name, mark.index, mark.line, mark.column, buffer, pointer)
+        setattr(error, attr, snippet_mark)
+
+
+def _intern(value: Any) -> Any:
+    """Intern identifier and condition strings shared across many queries."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_list(values: Any) -> Any:
+    if isinstance(values, list):
+        return [_intern(value) for value in values]
+    return _intern(values)
+
+
+def yaml_backend() -> str:
+    """Return the YAML loader backend in use ("libyaml" or "python")."""
+    return YAML_BACKEND
+
+
+def parse(
+    yql_content: str,
+    base_path: Path | None = None,
+    keep_raw: bool = True,
+    format: str | None = None,
+) -> YQLQuery:
     """Parse YQL string into AST.
     
     Args:
-        yql_content: YQL content as string (YAML format)
+        yql_content: YQL content as string (YAML or JSON format)
         base_path: Base path for resolving relative imports (optional)
+        keep_raw: Keep the loaded YAML data in ``YQLQuery.raw``. Pass False
+            when many ASTs are kept in memory and ``raw`` is not needed.
+        format: "yaml", "json", or None to detect JSON (content starting
+            with ``{``) and fall back to YAML if it is not valid JSON
         
     Returns:
         YQLQuery AST
         
     Raises:
         ParseError: If parsing fails
+        ValueError: If format is not supported
     """
-    try:
-        data = yaml.safe_load(yql_content)
-    except yaml.YAMLError as e:
-        raise ParseError(f"YAML parse error: {e}") from e
+    return _parse_content(yql_content, base_path, keep_raw=keep_raw, format=format)
+
+
+def parse_obj(
+    data: dict[str, Any],
+    base_path: Path | None = None,
+    keep_raw: bool = True,
+) -> YQLQuery:
+    """Parse an already decoded YQL structure into AST.
+    
+    For callers that hold the document as a dict (e.g. from a JSON API), so
+    no text is encoded or decoded. ``data`` is not modified; with
+    ``keep_raw`` it is referenced by ``YQLQuery.raw``.
     
+    Args:
+        data: YQL document as a mapping
+        base_path: Base path for resolving relative imports (optional)
+        keep_raw: Keep ``data`` in ``YQLQuery.raw``
+        
+    Returns:
+        YQLQuery AST
+        
+    Raises:
+        ParseError: If parsing fails
+    """
     if not isinstance(data, dict):
-        raise ParseError("YQL must be a YAML mapping")
+        raise ParseError("YQL must be a mapping")
     
-    return _parse_yql(data, base_path)
+    query = _parse_yql(data, base_path)
+    if not keep_raw:
+        query.raw = {}
+    return query
 
 
-def parse_file(path: str | Path) -> YQLQuery:
+def parse_file(
+    path: str | Path,
+    cache: "ASTCache | None" = None,
+    keep_raw: bool = True,
+    format: str | None = None,
+) -> YQLQuery:
     """Parse YQL file into AST.
     
     Args:
         path: Path to YQL file
+        cache: Optional on-disk AST cache. Unchanged files (including their
+            imports) are loaded from the cache without parsing YAML.
+        keep_raw: Keep the loaded YAML data in ``YQLQuery.raw``
+        format: "yaml", "json", or None to use JSON for ``.json`` files and
+            detect it otherwise (see ``parse``)
         
     Returns:
         YQLQuery AST
@@ -89,17 +206,224 @@ def parse_file(path: str | Path) -> YQLQuery:
         FileNotFoundError: If file not found
     """
     path = Path(path)
+    if format is None and path.suffix.lower() == ".json":
+        format = "json"
+    
+    if cache is not None:
+        query = cache.parse_file(path, format=format)
+        if not keep_raw:
+            query.raw = {}
+        return query
+    
     content = path.read_text(encoding="utf-8")
-    base_path = path.parent
-    return parse(content, base_path)
+    return parse(content, path.parent, keep_raw=keep_raw, format=format)
+
+
+def iter_parse(
+    stream: str | Iterable[str],
+    base_path: Path | None = None,
+    on_error: Callable[[ParseError], None] | None = None,
+    keep_raw: bool = True,
+) -> Iterator[YQLQuery]:
+    """Parse a multi-document YQL stream lazily.
+    
+    Documents are separated by ``---`` (and optionally terminated by ``...``)
+    as in YAML. Lines are read from the stream one at a time and each document
+    is parsed as soon as it is complete, so only one document is held in
+    memory. Empty documents are skipped.
+    
+    Args:
+        stream: YQL text or an iterable of lines (e.g. an open text file)
+        base_path: Base path for resolving relative imports (optional)
+        on_error: Called with the ParseError of each invalid document, after
+            which parsing continues with the next document. If omitted, the
+            first error is raised.
+        keep_raw: Keep the loaded YAML data in ``YQLQuery.raw``
+        
+    Yields:
+        YQLQuery AST for each document
+        
+    Raises:
+        ParseError: If a document is invalid and ``on_error`` is not given.
+            ``details`` contains ``document_index`` (0-based, counting
+            non-empty documents) and ``line`` (1-based start line).
+    """
+    if isinstance(stream, str):
+        stream = io.StringIO(stream)
+    
+    index = 0
+    for start_line, content in _iter_documents(stream):
+        try:
+            query = _parse_document(content, base_path, keep_raw)
+        except ParseError as e:
+            error = ParseError(
+                f"Document {index} (line {start_line}): {e.message}",
+                category=e.category,
+                details={**e.details, "document_index": index, "line": start_line},
+            )
+            if on_error is None:
+                raise error from e
+            on_error(error)
+            index += 1
+            continue
+        
+        if query is None:
+            # Empty document (only comments or whitespace)
+            continue
+        yield query
+        index += 1
+
+
+def iter_parse_file(
+    path: str | Path,
+    on_error: Callable[[ParseError], None] | None = None,
+    keep_raw: bool = True,
+) -> Iterator[YQLQuery]:
+    """Parse a multi-document YQL file lazily.
+    
+    See ``iter_parse`` for details. Imports are resolved relative to the
+    file's directory.
+    
+    Args:
+        path: Path to YQL file
+        on_error: Called with the ParseError of each invalid document
+        keep_raw: Keep the loaded YAML data in ``YQLQuery.raw``
+        
+    Yields:
+        YQLQuery AST for each document
+    """
+    path = Path(path)
+    with path.open(encoding="utf-8") as f:
+        yield from iter_parse(f, path.parent, on_error=on_error, keep_raw=keep_raw)
+
+
+def _iter_documents(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """Split a YAML stream into documents.
+    
+    A ``---`` or ``...`` marker at column 0 always ends a document in YAML
+    (even inside block scalars), so documents can be split line by line
+    without parsing. Directives (``%YAML``, ``%TAG``) before a ``---`` stay
+    with the document they introduce.
+    
+    Yields:
+        Tuple of (1-based start line, document text)
+    """
+    buffer: list[str] = []
+    start_line = 1
+    for line_number, line in enumerate(lines, start=1):
+        if _is_document_marker(line, "---"):
+            if _is_directive_prologue(buffer):
+                buffer.append(line)
+                continue
+            if buffer:
+                yield start_line, "".join(buffer)
+            # The marker line stays with its document ("--- {a: 1}" is valid)
+            buffer = [line]
+            start_line = line_number
+        elif _is_document_marker(line, "..."):
+            if buffer:
+                yield start_line, "".join(buffer)
+            buffer = []
+            start_line = line_number + 1
+        else:
+            if not buffer:
+                start_line = line_number
+            buffer.append(line)
+    if buffer:
+        yield start_line, "".join(buffer)
+
+
+def _parse_document(content: str, base_path: Path | None, keep_raw: bool = True) -> YQLQuery | None:
+    """Parse one document of a stream, returning None if it is empty."""
+    try:
+        data = _load_yaml(content)
+    except yaml.YAMLError as e:
+        raise ParseError(f"YAML parse error: {e}") from e
+    
+    if data is None:
+        return None
+    if not isinstance(data, dict):
+        raise ParseError("YQL must be a YAML mapping")
+    
+    query = _parse_yql(data, base_path)
+    if not keep_raw:
+        query.raw = {}
+    return query
 
 
-def _parse_yql(data: dict[str, Any], base_path: Path | None = None) -> YQLQuery:
+def _is_document_marker(line: str, marker: str) -> bool:
+    """Return True if ``line`` starts with a document marker."""
+    return line.startswith(marker) and (len(line) == 3 or line[3] in " \t\r\n")
+
+
+def _is_directive_prologue(lines: list[str]) -> bool:
+    """Return True if ``lines`` hold directives and only comments or blank lines besides."""
+    has_directive = False
+    for line in lines:
+        if line.startswith("%"):
+            has_directive = True
+        elif line.strip() and not line.lstrip().startswith("#"):
+            return False
+    return has_directive
+
+
+def _parse_content(
+    yql_content: str,
+    base_path: Path | None = None,
+    loaded_files: list[Path] | None = None,
+    keep_raw: bool = True,
+    format: str | None = None,
+) -> YQLQuery:
+    """Parse YQL string into AST, optionally recording imported files.
+    
+    Args:
+        yql_content: YQL content as string (YAML or JSON format)
+        base_path: Base path for resolving relative imports (optional)
+        loaded_files: If given, every imported file is appended to it
+        keep_raw: Keep the loaded YAML data in ``YQLQuery.raw``
+        format: "yaml", "json", or None to detect (see ``parse``)
+    """
+    data = _load_document(yql_content, format)
+    
+    if not isinstance(data, dict):
+        raise ParseError("YQL must be a YAML mapping")
+    
+    query = _parse_yql(data, base_path, loaded_files=loaded_files)
+    if not keep_raw:
+        query.raw = {}
+    return query
+
+
+def _load_document(content: str, format: str | None) -> Any:
+    """Decode a YQL document as JSON or YAML."""
+    if format not in (None, "yaml", "json"):
+        raise ValueError(f"Unsupported format: {format}. Valid formats are: yaml, json")
+    
+    if format == "json" or (format is None and content.lstrip().startswith("{")):
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            if format == "json":
+                raise ParseError(f"JSON parse error: {e}") from e
+            # Not JSON - YAML flow mappings also start with "{"
+    
+    try:
+        return _load_yaml(content)
+    except yaml.YAMLError as e:
+        raise ParseError(f"YAML parse error: {e}") from e
+
+
+def _parse_yql(
+    data: dict[str, Any],
+    base_path: Path | None = None,
+    loaded_files: list[Path] | None = None,
+) -> YQLQuery:
     """Parse top-level YQL structure.
     
     Args:
         data: Parsed YAML data
         base_path: Base path for resolving relative imports (optional)
+        loaded_files: If given, every imported file is appended to it
     """
     # Handle imports first
     imports = data.get("imports", [])
@@ -108,16 +432,21 @@ def _parse_yql(data: dict[str, Any], base_path: Path | None = None) -> YQLQuery:
         if base_path is None:
             # If no base_path provided, try to use current working directory
             base_path = Path.cwd()
-        imported_definitions = _load_imports(imports, base_path, current_file=base_path)
+        imported_definitions = _load_imports(
+            imports,
+            base_path,
+            current_file=base_path,
+            loaded_files=loaded_files,
+        )
     
     # Determine operation type
     operation_str = data.get("operation", "").lower()
     
     # Check for DML operations
     if operation_str == "upsert" or "on_conflict" in data or "on_duplicate_key" in data or ("using" in data and "match_on" in data):
-        return _parse_upsert_yql(data, imported_definitions)
-    elif operation_str == "insert" or "values" in data:
-        return _parse_insert_yql(data, imported_definitions)
+        return _parse_upsert_yql(data, imported_definitions, base_path)
+    elif operation_str in ("insert", "bulk_load") or "values" in data or "values_from" in data:
+        return _parse_insert_yql(data, imported_definitions, base_path)
     elif operation_str == "update" or ("set" in data and "select" not in data):
         return _parse_update_yql(data, imported_definitions)
     elif operation_str == "delete" or (operation_str == "delete" and "table" in data):
@@ -140,7 +469,11 @@ def _parse_yql(data: dict[str, Any], base_path: Path | None = None) -> YQLQuery:
     )
 
 
-def _parse_upsert_yql(data: dict[str, Any], imported_definitions: dict[str, Any] | None = None) -> YQLQuery:
+def _parse_upsert_yql(
+    data: dict[str, Any],
+    imported_definitions: dict[str, Any] | None = None,
+    base_path: Path | None = None,
+) -> YQLQuery:
     """Parse UPSERT YQL."""
     table = data.get("table", "")
     if not table:
@@ -171,6 +504,8 @@ def _parse_upsert_yql(data: dict[str, Any], imported_definitions: dict[str, Any]
                 raise ParseError(f"Invalid values format: {item}")
     elif isinstance(values_data, dict):
         values = [values_data]
+    if "values_from" in data:
+        values = _parse_values_from(data["values_from"], columns, base_path)
     
     # Parse from_query (INSERT ... SELECT)
     from_query = None
@@ -222,19 +557,39 @@ def _parse_upsert_yql(data: dict[str, Any], imported_definitions: dict[str, Any]
             insert=not_matched_data.get("insert", {}),
         )
     
+    # Parse staged bulk upsert options
+    staging_threshold = data.get("staging_threshold")
+    if staging_threshold is not None and (
+        isinstance(staging_threshold, bool)
+        or not isinstance(staging_threshold, int)
+        or staging_threshold < 0
+    ):
+        raise ParseError(f"Invalid staging_threshold: {staging_threshold!r}")
+    data_file = data.get("data_file")
+    
+    # Parse strategy
+    strategy = data.get("strategy", "values")
+    if strategy not in UPSERT_STRATEGIES:
+        valid = ", ".join(UPSERT_STRATEGIES)
+        raise ParseError(f"Invalid UPSERT strategy: {strategy}. Valid strategies are: {valid}")
+    
     upsert_query = UpsertQuery(
-        table=table,
-        alias=alias,
-        columns=columns,
+        table=_intern(table),
+        alias=_intern(alias),
+        columns=_intern_list(columns),
         values=values,
         from_query=from_query,
         on_conflict=on_conflict,
         on_duplicate_key=on_duplicate_key,
         using=using,
-        match_on=match_on,
+        match_on=_intern_list(match_on),
         when_matched=when_matched,
         when_not_matched=when_not_matched,
         returning=returning if isinstance(returning, list) else [returning],
+        staging_threshold=staging_threshold,
+        data_file=data_file,
+        strategy=strategy,
+        column_types=_parse_column_types(data.get("column_types")),
     )
     
     return YQLQuery(
@@ -244,7 +599,66 @@ def _parse_upsert_yql(data: dict[str, Any], imported_definitions: dict[str, Any]
     )
 
 
-def _parse_insert_yql(data: dict[str, Any], imported_definitions: dict[str, Any] | None = None) -> YQLQuery:
+# A type name with an optional length or precision/scale, e.g. "bigint",
+# "double precision", "varchar(100)", "decimal(10, 2)"
+_COLUMN_TYPE_PATTERN = re.compile(r"[A-Za-z_][\w ]*?(\(\s*\d+\s*(,\s*\d+\s*)?\))?")
+
+
+def _parse_column_types(spec: Any) -> dict[str, str]:
+    """Parse ``column_types``: column name to a type.
+    
+    A type is a YQL type name (``integer``, ``string``, ``decimal(10,2)``,
+    ...), a PostgreSQL type name, or a mapping in the form of a schema column
+    definition (``type`` with ``precision``/``scale`` or ``max_length``).
+    """
+    if spec is None:
+        return {}
+    if not isinstance(spec, dict):
+        raise ParseError(f"Invalid column_types: {spec!r}")
+    
+    column_types = {}
+    for column, type_spec in spec.items():
+        if isinstance(type_spec, dict):
+            type_name = type_spec.get("type")
+            if "precision" in type_spec:
+                type_name = f"{type_name}({type_spec['precision']},{type_spec.get('scale', 0)})"
+            elif "max_length" in type_spec:
+                type_name = f"{type_name}({type_spec['max_length']})"
+        else:
+            type_name = type_spec
+        if not isinstance(type_name, str) or not _COLUMN_TYPE_PATTERN.fullmatch(type_name.strip()):
+            raise ParseError(f"Invalid type for column '{column}': {type_spec!r}")
+        column_types[_intern(column)] = type_name.strip()
+    return column_types
+
+
+def _parse_values_from(spec: Any, columns: list[str], base_path: Path | None) -> RowSource:
+    """Parse ``values_from`` (a CSV path, or a mapping with ``path`` and CSV options).
+    
+    Relative paths are resolved against the YQL file's directory.
+    """
+    options = {"path": spec} if isinstance(spec, str) else spec
+    if not isinstance(options, dict) or not isinstance(options.get("path"), str):
+        raise ParseError(f"Invalid values_from: {spec!r}")
+    unknown = set(options) - {"path", "delimiter", "encoding", "header", "null_value"}
+    if unknown:
+        raise ParseError(f"Unknown values_from options: {', '.join(sorted(unknown))}")
+    
+    options = dict(options)
+    path = Path(options.pop("path"))
+    if not path.is_absolute():
+        path = (base_path or Path.cwd()) / path
+    try:
+        return RowSource.from_csv(path, columns=columns or None, **options)
+    except (OSError, ValueError) as e:
+        raise ParseError(f"Cannot read values_from {path}: {e}") from e
+
+
+def _parse_insert_yql(
+    data: dict[str, Any],
+    imported_definitions: dict[str, Any] | None = None,
+    base_path: Path | None = None,
+) -> YQLQuery:
     """Parse INSERT YQL."""
     table = data.get("table", "")
     if not table:
@@ -264,18 +678,32 @@ def _parse_insert_yql(data: dict[str, Any], imported_definitions: dict[str, Any]
                 raise ParseError(f"Invalid values format: {item}")
     elif isinstance(values_data, dict):
         values = [values_data]
+    if "values_from" in data:
+        values = _parse_values_from(data["values_from"], columns, base_path)
     
     # Parse from_query (INSERT ... SELECT)
     from_query = None
     if "from_query" in data:
         from_query = _parse_select_query(data["from_query"])
     
+    # Parse strategy (operation: bulk_load is short for strategy: bulk)
+    if data.get("operation", "").lower() == "bulk_load":
+        strategy = "bulk"
+    else:
+        strategy = data.get("strategy", "values")
+    if strategy not in INSERT_STRATEGIES:
+        valid = ", ".join(INSERT_STRATEGIES)
+        raise ParseError(f"Invalid INSERT strategy: {strategy}. Valid strategies are: {valid}")
+    
     insert_query = InsertQuery(
-        table=table,
-        columns=columns,
+        table=_intern(table),
+        columns=_intern_list(columns),
         values=values,
         from_query=from_query,
         returning=returning if isinstance(returning, list) else [returning],
+        strategy=strategy,
+        data_file=data.get("data_file"),
+        column_types=_parse_column_types(data.get("column_types")),
     )
     
     return YQLQuery(
@@ -311,8 +739,8 @@ def _parse_update_yql(data: dict[str, Any], imported_definitions: dict[str, Any]
         joins = _parse_joins(data["joins"])
     
     update_query = UpdateQuery(
-        table=table,
-        alias=alias,
+        table=_intern(table),
+        alias=_intern(alias),
         set_values=set_values,
         joins=joins,
         where=where,
@@ -351,8 +779,8 @@ def _parse_delete_yql(data: dict[str, Any], imported_definitions: dict[str, Any]
         joins = _parse_joins(data["joins"])
     
     delete_query = DeleteQuery(
-        table=table,
-        alias=alias,
+        table=_intern(table),
+        alias=_intern(alias),
         joins=joins,
         where=where,
         returning=returning if isinstance(returning, list) else [returning],
@@ -432,9 +860,10 @@ def _parse_select_clause(data: list[Any]) -> list[Column]:
         if isinstance(item, dict):
             # Format: {alias: expression}
             for alias, expr in item.items():
-                columns.append(Column(alias=str(alias), expression=str(expr)))
+                columns.append(Column(alias=_intern(str(alias)), expression=_intern(str(expr))))
         elif isinstance(item, str):
             # Simple column name (should have alias per spec, but handle gracefully)
+            item = _intern(item)
             columns.append(Column(alias=item, expression=item))
         else:
             raise ParseError(f"Invalid SELECT column format: {item}")
@@ -452,9 +881,10 @@ def _parse_from_clause(data: Any) -> FromClause:
         if len(data) != 1:
             raise ParseError(f"FROM clause must have exactly one alias: {data}")
         alias, table = next(iter(data.items()))
-        return FromClause(alias=str(alias), table=str(table))
+        return FromClause(alias=_intern(str(alias)), table=_intern(str(table)))
     elif isinstance(data, str):
         # Legacy format: "table_name" (alias same as table)
+        data = _intern(data)
         return FromClause(alias=data, table=data)
     else:
         raise ParseError(f"Invalid FROM clause format: {data}")
@@ -488,24 +918,24 @@ def _parse_joins(data: list[Any]) -> list[JoinClause]:
         
         # Handle on conditions
         if isinstance(on, list):
-            on_conditions = on
+            on_conditions = _intern_list(on)
         elif on:
-            on_conditions = [on]
+            on_conditions = [_intern(on)]
         else:
             on_conditions = []
         
         # Handle additional conditions
         if isinstance(additional, list):
-            add_conditions = additional
+            add_conditions = _intern_list(additional)
         elif additional:
-            add_conditions = [additional]
+            add_conditions = [_intern(additional)]
         else:
             add_conditions = []
         
         joins.append(JoinClause(
             type=join_type,
-            alias=alias,
-            table=table,
+            alias=_intern(alias),
+            table=_intern(table),
             on=on_conditions,
             additional_conditions=add_conditions,
         ))
@@ -519,20 +949,20 @@ def _parse_where_clause(data: list[Any] | str) -> list[str]:
     Format: Array of conditions (AND-joined)
     """
     if isinstance(data, str):
-        return [data]
+        return [_intern(data)]
     elif isinstance(data, list):
         conditions = []
         for item in data:
             if isinstance(item, str):
-                conditions.append(item)
+                conditions.append(_intern(item))
             elif isinstance(item, dict):
                 # Complex condition (field, operator, subquery, etc.)
-                conditions.append(_format_complex_condition(item))
+                conditions.append(_intern(_format_complex_condition(item)))
             else:
-                conditions.append(str(item))
+                conditions.append(_intern(str(item)))
         return conditions
     else:
-        return [str(data)]
+        return [_intern(str(data))]
 
 
 def _format_complex_condition(item: dict[str, Any]) -> str:
@@ -554,21 +984,21 @@ def _format_complex_condition(item: dict[str, Any]) -> str:
 def _parse_group_by(data: list[Any] | str) -> list[str]:
     """Parse GROUP BY clause."""
     if isinstance(data, str):
-        return [data]
+        return [_intern(data)]
     elif isinstance(data, list):
-        return [str(item) for item in data]
+        return [_intern(str(item)) for item in data]
     else:
-        return [str(data)]
+        return [_intern(str(data))]
 
 
 def _parse_having(data: list[Any] | str) -> list[str]:
     """Parse HAVING clause."""
     if isinstance(data, str):
-        return [data]
+        return [_intern(data)]
     elif isinstance(data, list):
-        return [str(item) for item in data]
+        return [_intern(str(item)) for item in data]
     else:
-        return [str(data)]
+        return [_intern(str(data))]
 
 
 def _parse_order_by(data: list[Any]) -> list[OrderByClause]:
@@ -607,18 +1037,209 @@ def _parse_order_by(data: list[Any]) -> list[OrderByClause]:
                     f"Valid directions are: {valid_directions}"
                 )
             order_by.append(OrderByClause(
-                field=field,
+                field=_intern(field),
                 direction=direction,
             ))
         elif isinstance(item, str):
             # Simple field name (ASC by default)
-            order_by.append(OrderByClause(field=item, direction=SortDirection.ASC))
+            order_by.append(OrderByClause(field=_intern(item), direction=SortDirection.ASC))
         else:
             raise ParseError(f"Invalid ORDER BY format: {item}")
     
     return order_by
 
 
+_MISSING = object()
+
+
+@dataclass
+class ImportCacheStats:
+    """Import cache counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ImportCache:
+    """Process-wide cache of loaded import files.
+    
+    Entries are keyed by resolved path and hold the YAML data of one imported
+    file. An entry is reused while the file's mtime and size are unchanged.
+    The cache is bounded by entry count and by the total size of the cached
+    files (used as an estimate of their memory cost), evicting least recently
+    used entries first.
+    
+    Only file loading is cached: import limits and circular dependency checks
+    run on every parse.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached files
+            max_bytes: Maximum total size of cached files in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[int, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def load(
+        self,
+        path: Path,
+        key: str | None = None,
+        st: os.stat_result | None = None,
+    ) -> Any:
+        """Return the YAML data of a file, reading it only if it changed.
+        
+        Args:
+            path: Path to the file
+            key: Resolved path string (computed from ``path`` if omitted)
+            st: Result of ``os.stat(path)`` if the caller already has it
+            
+        Raises:
+            OSError: If the file cannot be read
+            yaml.YAMLError: If the file is not valid YAML
+        """
+        if key is None:
+            key = str(path.resolve())
+        if st is None:
+            st = os.stat(path)
+        
+        data = self._lookup(key, st)
+        if data is _MISSING:
+            data = self._read(path, key, st)
+        return data
+    
+    def _lookup(self, key: str, st: os.stat_result) -> Any:
+        """Return cached data if the entry matches ``st``, else ``_MISSING``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2]
+            self._misses += 1
+            return _MISSING
+    
+    def _read(self, path: Path, key: str, st: os.stat_result) -> Any:
+        """Read and load a file, then store it in the cache."""
+        data = _load_yaml(path.read_text(encoding="utf-8"))
+        
+        with self._lock:
+            self._remove(key)
+            if st.st_size <= self.max_bytes and self.max_entries > 0:
+                self._entries[key] = (st.st_mtime_ns, st.st_size, data)
+                self._bytes += st.st_size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    oldest = next(iter(self._entries))
+                    self._remove(oldest)
+                    self._evictions += 1
+        return data
+    
+    def invalidate(self, path: Path | str | None = None) -> None:
+        """Remove one file (or every file if ``path`` is None) from the cache."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._remove(str(Path(path).resolve()))
+    
+    def stats(self) -> ImportCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return ImportCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+_import_cache = ImportCache()
+
+
+def get_import_cache() -> ImportCache:
+    """Return the process-wide import cache."""
+    return _import_cache
+
+
+# Maximum number of threads used to read import files that are not cached
+_MAX_IMPORT_WORKERS = 8
+
+
+@dataclass
+class _ImportNode:
+    """A distinct imported file in the import graph."""
+    path: Path
+    key: str  # Resolved path string
+    chain: list[str]  # Import chain of the first path that reached this file
+    data: dict[str, Any]
+    children: list[tuple[str, str]]  # (import path as written, child key)
+
+
+def _resolve_import_path(import_path: str, base_path: Path) -> tuple[Path, os.stat_result | None]:
+    """Resolve an import path to a file.
+    
+    Relative paths are looked up in the fixtures directory (the parent of
+    ``base_path``) first, then in ``base_path``. A directory resolves to its
+    ``before.yql``, and ``.yql`` is appended to paths without a suffix.
+    
+    Returns:
+        Tuple of (resolved path, stat result or None if the file does not exist)
+    """
+    def stat(path: Path) -> os.stat_result | None:
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+    
+    st = None
+    if import_path.startswith("/"):
+        # Absolute path
+        full_path = Path(import_path)
+    else:
+        # Relative path: try fixtures_dir first, then base_path
+        # Find fixtures directory (parent of base_path if base_path is in a test fixture directory)
+        fixtures_dir = base_path.parent if base_path.name != "fixtures" else base_path
+        # Check if import_path is a directory name (e.g., "test_import_customer_summary")
+        candidate_path = fixtures_dir / import_path
+        candidate_st = stat(candidate_path)
+        if candidate_st is not None and stat_module.S_ISDIR(candidate_st.st_mode):
+            # If it's a directory, look for before.yql inside it
+            full_path = candidate_path / "before.yql"
+        elif candidate_st is not None:
+            # Otherwise, treat it as a file path
+            full_path = candidate_path
+            st = candidate_st
+        else:
+            # Fallback to base_path
+            full_path = base_path / import_path
+    
+    # Add .yql extension if not present and it's not already a directory with before.yql
+    if not full_path.suffix and not full_path.name.endswith(".yql"):
+        full_path = full_path.with_suffix(".yql")
+        st = None
+    
+    if st is None:
+        st = stat(full_path)
+    return full_path, st
+
+
 def _load_imports(
     imports: list[str],
     base_path: Path,
@@ -628,9 +1249,18 @@ def _load_imports(
     max_imports: int = 10,
     visited: set[str] | None = None,
     import_chain: list[str] | None = None,
+    loaded_files: list[Path] | None = None,
 ) -> dict[str, Any]:
     """Load imported YQL files with limits and circular dependency detection.
     
+    The import graph is resolved in three phases:
+    
+    1. The graph is discovered breadth-first. Each distinct file is resolved
+       with one ``stat`` and loaded once, however many paths reach it. Files
+       missing from the import cache are read concurrently on a thread pool.
+    2. Cycles and the depth limit are checked on the complete graph.
+    3. Definitions are assembled in topological order (dependencies first).
+    
     Args:
         imports: List of import paths (relative to fixtures directory)
         base_path: Base path for resolving relative imports
@@ -638,8 +1268,12 @@ def _load_imports(
         depth: Current import depth (default: 0)
         max_depth: Maximum import depth (default: 3)
         max_imports: Maximum number of imports per file (default: 10)
-        visited: Set of visited import paths (for circular dependency detection)
+        visited: Set of resolved paths of files that are already being imported
+            (importing any of them again is a circular dependency)
         import_chain: List of import paths in current chain (for error reporting)
+        loaded_files: If given, every loaded import file is appended to it
+            (on a ParseError while resolving the graph: every file that was
+            tried, including missing ones)
         
     Returns:
         Dictionary mapping import names to their definitions
@@ -652,6 +1286,70 @@ def _load_imports(
     if import_chain is None:
         import_chain = []
     
+    _check_import_limits(imports, current_file, depth, max_depth, max_imports, import_chain)
+    
+    nodes: dict[str, _ImportNode] = {}
+    attempted: list[Path] = []
+    try:
+        root_children = _discover_import_graph(
+            imports, base_path, current_file, depth, max_depth, max_imports, visited, import_chain,
+            nodes, attempted,
+        )
+        _check_import_graph(
+            root_children, nodes, current_file, depth, max_depth, visited, import_chain
+        )
+    except ParseError:
+        # Report the files that were tried (including a missing one), so a
+        # caller tracking dependencies can retry when they appear or change
+        if loaded_files is not None:
+            loaded_files.extend(attempted)
+        raise
+    
+    # Assemble definitions in topological order (post-order DFS)
+    imported_definitions: dict[str, Any] = {}
+    owners: dict[str, str] = {}
+    emitted: set[str] = set()
+    
+    def emit(key: str) -> None:
+        if key in emitted:
+            return
+        emitted.add(key)
+        node = nodes[key]
+        for _, child_key in node.children:
+            emit(child_key)
+        
+        # Extract name from imported file
+        name = node.data.get("name", node.path.stem)
+        if name in owners and owners[name] != key:
+            raise ParseError(
+                f"Duplicate import name '{name}' in import chain",
+                category="logic_error",
+                details={
+                    "file": str(node.path),
+                    "import_chain": node.chain,
+                    "duplicate_name": name,
+                },
+            )
+        owners[name] = key
+        imported_definitions[name] = node.data
+        if loaded_files is not None:
+            loaded_files.append(node.path)
+    
+    for _, child_key in root_children:
+        emit(child_key)
+    
+    return imported_definitions
+
+
+def _check_import_limits(
+    imports: list[str],
+    current_file: Path | None,
+    depth: int,
+    max_depth: int,
+    max_imports: int,
+    import_chain: list[str],
+) -> None:
+    """Check the import count and depth limits for one file's imports."""
     # Check import count limit
     if len(imports) > max_imports:
         raise ParseError(
@@ -675,142 +1373,356 @@ def _load_imports(
                 "import_chain": import_chain,
             },
         )
-    
-    imported_definitions = {}
-    
-    # Find fixtures directory (parent of base_path if base_path is in a test fixture directory)
-    fixtures_dir = base_path.parent if base_path.name != "fixtures" else base_path
-    
-    for import_path in imports:
-        # Resolve import path
-        if import_path.startswith("/"):
-            # Absolute path
-            full_path = Path(import_path)
-        else:
-            # Relative path: try fixtures_dir first, then base_path
-            # Check if import_path is a directory name (e.g., "test_import_customer_summary")
-            candidate_path = fixtures_dir / import_path
-            if candidate_path.is_dir():
-                # If it's a directory, look for before.yql inside it
-                full_path = candidate_path / "before.yql"
-            else:
-                # Otherwise, treat it as a file path
-                full_path = candidate_path
-                if not full_path.exists():
-                    # Fallback to base_path
-                    full_path = base_path / import_path
+
+
+def _discover_import_graph(
+    imports: list[str],
+    base_path: Path,
+    current_file: Path | None,
+    depth: int,
+    max_depth: int,
+    max_imports: int,
+    visited: set[str],
+    import_chain: list[str],
+    nodes: dict[str, _ImportNode],
+    attempted: list[Path],
+) -> list[tuple[str, str]]:
+    """Resolve and load every file reachable from ``imports`` (breadth-first).
+    
+    Fills ``nodes``, appends every resolved path (found or not) to
+    ``attempted`` and returns the (import path, key) edges of the root.
+    """
+    root_children: list[tuple[str, str]] = []
+    # Each frontier item: (owner node or None for the root, imports, base path, owner file, chain)
+    frontier: list[tuple[_ImportNode | None, list[str], Path, Path | None, list[str]]] = [
+        (None, imports, base_path, current_file, import_chain),
+    ]
+    level = 0
+    
+    while frontier:
+        level += 1
+        pending: dict[str, tuple[Path, os.stat_result, list[str]]] = {}
         
-        # Add .yql extension if not present and it's not already a directory with before.yql
-        if not full_path.suffix and not full_path.name.endswith(".yql"):
-            full_path = full_path.with_suffix(".yql")
+        for owner, owner_imports, owner_base, owner_file, owner_chain in frontier:
+            edges = root_children if owner is None else owner.children
+            for import_path in owner_imports:
+                full_path, st = _resolve_import_path(import_path, owner_base)
+                attempted.append(full_path)
+                if st is None:
+                    raise ParseError(
+                        f"Import file not found: {full_path}",
+                        category="logic_error",
+                        details={
+                            "file": str(owner_file) if owner_file else None,
+                            "import_path": import_path,
+                            "import_chain": owner_chain,
+                        },
+                    )
+                key = str(full_path.resolve())
+                edges.append((import_path, key))
+                if key not in nodes and key not in pending and key not in visited:
+                    pending[key] = (full_path, st, owner_chain + [key])
         
-        if not full_path.exists():
-            raise ParseError(
-                f"Import file not found: {full_path}",
-                category="logic_error",
-                details={
-                    "file": str(current_file) if current_file else None,
-                    "import_path": import_path,
-                    "import_chain": import_chain,
-                },
+        loaded = _load_import_files(pending)
+        
+        frontier = []
+        for key, (full_path, _, chain) in pending.items():
+            imported_data = loaded[key]
+            node = _ImportNode(
+                path=full_path, key=key, chain=chain, data=imported_data, children=[]
             )
+            nodes[key] = node
+            
+            nested_imports = imported_data.get("imports", [])
+            if nested_imports:
+                # The file's imports are processed one level deeper than the file itself
+                _check_import_limits(
+                    nested_imports, full_path, depth + level, max_depth, max_imports, chain,
+                )
+                frontier.append((node, nested_imports, full_path.parent, full_path, chain))
+    
+    return root_children
+
+
+def _load_import_files(
+    pending: dict[str, tuple[Path, os.stat_result, list[str]]],
+) -> dict[str, dict[str, Any]]:
+    """Load import files, reading cache misses concurrently.
+    
+    Args:
+        pending: Mapping of resolved path to (path, stat result, import chain)
         
-        # Check depth limit before loading the file
-        # This ensures we check before processing nested imports
-        if depth >= max_depth:
+    Returns:
+        Mapping of resolved path to the file's YAML mapping
+    """
+    results: dict[str, Any] = {}
+    misses = []
+    for key, (full_path, st, _) in pending.items():
+        data = _import_cache._lookup(key, st)
+        if data is _MISSING:
+            misses.append(key)
+        else:
+            results[key] = data
+    
+    def read(key: str) -> Any:
+        full_path, st, _ = pending[key]
+        try:
+            return _import_cache._read(full_path, key, st)
+        except Exception as e:
+            return _ImportFailure(e)
+    
+    if len(misses) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(misses), _MAX_IMPORT_WORKERS)) as executor:
+            for key, data in zip(misses, executor.map(read, misses)):
+                results[key] = data
+    else:
+        for key in misses:
+            results[key] = read(key)
+    
+    # Report errors and validate in discovery order so failures are deterministic
+    for key, (full_path, _, chain) in pending.items():
+        data = results[key]
+        if isinstance(data, _ImportFailure):
+            e = data.error
+            if isinstance(e, yaml.YAMLError):
+                raise ParseError(
+                    f"Failed to parse import file {full_path}: {e}",
+                    category="syntax_error",
+                    details={"file": str(full_path), "import_chain": chain},
+                ) from e
             raise ParseError(
-                f"Import depth exceeds maximum ({max_depth})",
+                f"Error loading import file {full_path}: {e}",
                 category="logic_error",
-                details={
-                    "file": str(current_file) if current_file else None,
-                    "depth": depth,
-                    "max_depth": max_depth,
-                    "import_chain": import_chain,
-                    "import_path": import_path,
-                },
+                details={"file": str(full_path), "import_chain": chain},
+            ) from e
+        if not isinstance(data, dict):
+            raise ParseError(
+                f"Imported file must be a YAML mapping: {full_path}",
+                category="syntax_error",
+                details={"file": str(full_path), "import_chain": chain},
             )
-        
-        # Check for circular dependency
-        full_path_str = str(full_path.resolve())
-        if full_path_str in visited:
-            cycle = import_chain + [full_path_str]
+    
+    return results
+
+
+@dataclass
+class _ImportFailure:
+    """Exception raised while loading an import file on a worker thread."""
+    error: Exception
+
+
+def _check_import_graph(
+    root_children: list[tuple[str, str]],
+    nodes: dict[str, _ImportNode],
+    current_file: Path | None,
+    depth: int,
+    max_depth: int,
+    visited: set[str],
+    import_chain: list[str],
+) -> None:
+    """Detect cycles and enforce the depth limit on every import path."""
+    # Longest chain of non-empty import lists below each node
+    heights: dict[str, int] = {}
+    on_stack: list[str] = []
+    
+    def walk(key: str, import_path: str, owner_file: Path | None) -> int:
+        if key in on_stack or key in visited:
+            if key in on_stack:
+                cycle = on_stack[on_stack.index(key):] + [key]
+            else:
+                # Back to a file that the caller is already importing
+                cycle = import_chain + on_stack + [key]
             raise ParseError(
-                f"Circular dependency detected: {' -> '.join(cycle)} -> {full_path_str}",
+                f"Circular dependency detected: {' -> '.join(cycle)}",
                 category="logic_error",
                 details={
-                    "file": str(current_file) if current_file else None,
+                    "file": str(owner_file) if owner_file else None,
                     "import_path": import_path,
-                    "import_chain": import_chain,
-                    "circular_path": cycle + [full_path_str],
+                    "import_chain": import_chain + on_stack,
+                    "circular_path": cycle,
                 },
             )
+        if key in heights:
+            return heights[key]
         
-        # Mark as visited and add to chain
-        visited.add(full_path_str)
-        new_chain = import_chain + [full_path_str]
-        
-        # Load and parse imported file
-        try:
-            content = full_path.read_text(encoding="utf-8")
-            imported_data = yaml.safe_load(content)
-            
-            if not isinstance(imported_data, dict):
-                raise ParseError(
-                    f"Imported file must be a YAML mapping: {full_path}",
-                    category="syntax_error",
-                    details={"file": str(full_path), "import_chain": new_chain},
-                )
-            
-            # Extract name from imported file
-            name = imported_data.get("name", full_path.stem)
-            
-            # Recursively load nested imports
-            nested_imports = imported_data.get("imports", [])
-            if nested_imports:
-                # Recursive call with depth+1 (depth limit is checked at the start of _load_imports)
-                nested_definitions = _load_imports(
-                    nested_imports,
-                    full_path.parent,
-                    current_file=full_path,
-                    depth=depth + 1,
-                    max_depth=max_depth,
-                    max_imports=max_imports,
-                    visited=visited.copy(),  # Copy to allow parallel imports
-                    import_chain=new_chain,
-                )
-                # Merge nested definitions (with name collision check)
-                for nested_name, nested_def in nested_definitions.items():
-                    if nested_name in imported_definitions:
-                        raise ParseError(
-                            f"Duplicate import name '{nested_name}' in import chain",
-                            category="logic_error",
-                            details={
-                                "file": str(current_file) if current_file else None,
-                                "import_chain": new_chain,
-                                "duplicate_name": nested_name,
-                            },
-                        )
-                    imported_definitions[nested_name] = nested_def
-            
-            imported_definitions[name] = imported_data
-            
-        except yaml.YAMLError as e:
-            raise ParseError(
-                f"Failed to parse import file {full_path}: {e}",
-                category="syntax_error",
-                details={"file": str(full_path), "import_chain": new_chain},
-            ) from e
-        except ParseError:
-            # Re-raise ParseError with updated context
-            raise
-        except Exception as e:
-            raise ParseError(
-                f"Error loading import file {full_path}: {e}",
-                category="logic_error",
-                details={"file": str(full_path), "import_chain": new_chain},
-            ) from e
+        node = nodes[key]
+        on_stack.append(key)
+        height = 0
+        for child_import_path, child_key in node.children:
+            height = max(height, walk(child_key, child_import_path, node.path) + 1)
+        on_stack.pop()
+        heights[key] = height
+        return height
+    
+    for import_path, key in root_children:
+        walk(key, import_path, current_file)
+    
+    # A file at level L whose imports are non-empty processes them at depth + L;
+    # the deepest such file below a root import is at level heights[key].
+    for _, key in root_children:
+        if heights[key] == 0 or depth + heights[key] < max_depth:
+            continue
+        # Follow the longest path to the first file that exceeds the limit
+        node = nodes[key]
+        level = 1
+        while depth + level < max_depth:
+            _, next_key = max(node.children, key=lambda edge: heights[edge[1]])
+            node = nodes[next_key]
+            level += 1
+        raise ParseError(
+            f"Import depth exceeds maximum ({max_depth})",
+            category="logic_error",
+            details={
+                "file": str(node.path),
+                "depth": depth + level,
+                "max_depth": max_depth,
+                "import_chain": import_chain + _longest_chain(key, node.key, nodes, heights),
+            },
+        )
+
+
+def _longest_chain(
+    start: str,
+    end: str,
+    nodes: dict[str, _ImportNode],
+    heights: dict[str, int],
+) -> list[str]:
+    """Return the chain of keys from ``start`` to ``end`` along the longest path."""
+    chain = [start]
+    key = start
+    while key != end:
+        _, key = max(nodes[key].children, key=lambda edge: heights[edge[1]])
+        chain.append(key)
+    return chain
+
+
+# Parameter templates
+#
+# Imported select_definitions are compiled once into templates in which every
+# #{name} placeholder is tokenized, so applying parameters is a single join per
+# string instead of one str.replace per parameter. ${name} and @{name} are
+# passed through unchanged and stay in the literal segments.
+
+_PLACEHOLDER_PATTERN = re.compile(r"#\{([^{}]*)\}")
+
+# Number of compiled select_definitions kept in memory
+_TEMPLATE_CACHE_SIZE = 256
+
+
+class _StringTemplate:
+    """A string split into literal segments and #{name} placeholders."""
+    
+    __slots__ = ("source", "segments", "names", "exact")
+    
+    def __init__(self, source: str):
+        self.source = source
+        self.segments: list[str] = []
+        self.names: list[str] = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(source):
+            self.segments.append(source[position:match.start()])
+            self.names.append(match.group(1))
+            position = match.end()
+        self.segments.append(source[position:])
+        # "#{" outside a placeholder (e.g. "#{#{a}}") can form new placeholders
+        # once values are substituted, which only sequential replacement reproduces
+        self.exact = source.count("#{") == len(self.names)
+    
+    def render(self, values: dict[str, str], params: dict[str, Any]) -> str:
+        if not self.exact:
+            return _replace_parameters(self.source, params)
+        parts = [self.segments[0]]
+        for name, segment in zip(self.names, self.segments[1:]):
+            value = values.get(name)
+            parts.append(f"#{{{name}}}" if value is None else value)
+            parts.append(segment)
+        return "".join(parts)
+
+
+class _DictTemplate:
+    __slots__ = ("items",)
     
-    return imported_definitions
+    def __init__(self, items: list[tuple[Any, Any]]):
+        self.items = items
+    
+    def render(self, values: dict[str, str], params: dict[str, Any]) -> dict[Any, Any]:
+        return {key: _render_template(node, values, params) for key, node in self.items}
+
+
+class _ListTemplate:
+    __slots__ = ("items",)
+    
+    def __init__(self, items: list[Any]):
+        self.items = items
+    
+    def render(self, values: dict[str, str], params: dict[str, Any]) -> list[Any]:
+        return [_render_template(node, values, params) for node in self.items]
+
+
+_TEMPLATE_TYPES = (_StringTemplate, _DictTemplate, _ListTemplate)
+
+
+def _compile_template(data: Any) -> Any:
+    """Compile a YQL data structure into a parameter template.
+    
+    Subtrees without placeholders are kept as the original objects and are
+    returned as-is when rendering.
+    """
+    if isinstance(data, dict):
+        items = [(key, _compile_template(value)) for key, value in data.items()]
+        if any(isinstance(node, _TEMPLATE_TYPES) for _, node in items):
+            return _DictTemplate(items)
+        return data
+    elif isinstance(data, list):
+        items = [_compile_template(item) for item in data]
+        if any(isinstance(node, _TEMPLATE_TYPES) for node in items):
+            return _ListTemplate(items)
+        return data
+    elif isinstance(data, str) and "#{" in data:
+        return _StringTemplate(data)
+    return data
+
+
+def _render_template(node: Any, values: dict[str, str], params: dict[str, Any]) -> Any:
+    if isinstance(node, _TEMPLATE_TYPES):
+        return node.render(values, params)
+    return node
+
+
+_template_cache: "OrderedDict[int, tuple[Any, Any]]" = OrderedDict()
+_template_lock = threading.Lock()
+
+
+def _get_template(data: Any) -> Any:
+    """Return the compiled template of a select_definition.
+    
+    Import data is shared through the import cache, so templates are keyed by
+    object identity. The cached entry keeps a reference to ``data`` so the id
+    cannot be reused while the entry exists.
+    """
+    key = id(data)
+    with _template_lock:
+        entry = _template_cache.get(key)
+        if entry is not None and entry[0] is data:
+            _template_cache.move_to_end(key)
+            return entry[1]
+    
+    template = _compile_template(data)
+    with _template_lock:
+        _template_cache[key] = (data, template)
+        _template_cache.move_to_end(key)
+        while len(_template_cache) > _TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    return template
+
+
+def _format_parameter(value: Any) -> str:
+    """Format a parameter value for substitution."""
+    if isinstance(value, str):
+        # String literal - add quotes
+        return f"'{value}'"
+    # Number, bool, etc. - convert to string as-is
+    return str(value)
 
 
 def _apply_parameters(data: Any, provided_params: dict[str, Any], default_params: dict[str, Any] | None = None) -> Any:
@@ -831,39 +1743,30 @@ def _apply_parameters(data: Any, provided_params: dict[str, Any], default_params
     
     # Merge default and provided parameters (provided takes precedence)
     params = {**default_params, **provided_params}
+    values = {str(name): _format_parameter(value) for name, value in params.items()}
     
+    # A value that contains "#" or "{" may be part of a placeholder after
+    # substitution; keep the sequential replacement semantics in that case
+    if any("#" in value or "{" in value for value in values.values()) or any(
+        "{" in name or "}" in name for name in values
+    ):
+        return _replace_parameters(data, params)
+    
+    return _render_template(_get_template(data), values, params)
+
+
+def _replace_parameters(data: Any, params: dict[str, Any]) -> Any:
+    """Replace #{paramName} placeholders one parameter at a time."""
     if isinstance(data, dict):
-        # Recursively apply to dictionary values
-        return {key: _apply_parameters(value, provided_params, default_params) for key, value in data.items()}
+        return {key: _replace_parameters(value, params) for key, value in data.items()}
     elif isinstance(data, list):
-        # Recursively apply to list items
-        return [_apply_parameters(item, provided_params, default_params) for item in data]
+        return [_replace_parameters(item, params) for item in data]
     elif isinstance(data, str):
-        # Replace parameter placeholders in strings
         result = data
         for param_name, param_value in params.items():
-            # Replace #{paramName} with the value
             placeholder = f"#{{{param_name}}}"
             if placeholder in result:
-                # Format the value appropriately
-                if isinstance(param_value, str):
-                    # String literal - add quotes
-                    formatted_value = f"'{param_value}'"
-                else:
-                    # Number, bool, etc. - convert to string as-is
-                    formatted_value = str(param_value)
-                result = result.replace(placeholder, formatted_value)
-        
-        # Also handle ${paramArray} for array expansion (pass through as-is for now)
-        # This will be handled by SQL libraries later
-        for param_name, param_value in params.items():
-            placeholder = f"${{{param_name}}}"
-            if placeholder in result and isinstance(param_value, list):
-                # Array expansion - pass through as-is (will be handled by SQL libraries)
-                pass
-        
-        # Also handle @{macro} for macro expansion (pass through as-is for now)
-        # This will be handled by SQL libraries later
+                result = result.replace(placeholder, _format_parameter(param_value))
         return result
     else:
         # For other types (int, bool, etc.), return as-is
@@ -905,11 +1808,11 @@ def _parse_with_clauses(data: dict[str, Any], imported_definitions: dict[str, An
                     select_def = _apply_parameters(select_def, parameters, imported_def.get("parameters", {}))
                 
                 query = _parse_select_query(select_def)
-                with_clauses.append(WithClause(name=name, query=query))
+                with_clauses.append(WithClause(name=_intern(name), query=query))
             else:
                 # Inline definition
                 query = _parse_select_query(definition)
-                with_clauses.append(WithClause(name=name, query=query))
+                with_clauses.append(WithClause(name=_intern(name), query=query))
         else:
             raise ParseError(f"Invalid WITH clause definition: {definition}")
     
@@ -0,0 +1,271 @@
+"""Lazy row sources for INSERT and UPSERT values.
+
+A ``RowSource`` can stand in for the ``values`` list of an ``InsertQuery`` or
+``UpsertQuery``. The column list is declared once and rows are produced as
+tuples while SQL is generated, so streaming (``iter_sql``,
+``generate_sql_to``) and batching (``generate_insert_batches``) keep only the
+current rows in memory.
+
+Column-oriented data (a mapping of column name to sequence, or a NumPy
+array) is wrapped with ``RowSource.from_columns``; its literals are then
+formatted a column at a time instead of cell by cell.
+
+Example:
+    rows = RowSource(((i, f"user{i}") for i in range(5_000_000)), columns=["id", "name"])
+    insert = InsertQuery(table="users", values=rows)
+    query = YQLQuery(operation=OperationType.INSERT, insert_query=insert)
+    for sql in generate_insert_batches(query, Dialect.POSTGRESQL):
+        cursor.execute(sql)
+
+    # Or from YQL
+    #   operation: insert
+    #   table: users
+    #   values_from: users.csv
+"""
+
+import csv
+import itertools
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+
+class RowSource:
+    """Rows for INSERT/UPSERT ``values`` that are read lazily.
+    
+    Rows may be tuples/lists in column order or mappings (looked up by
+    column name, missing keys become NULL). A source over a list or a CSV
+    file can be generated any number of times; a source over an iterator
+    (e.g. a generator) can be consumed only once.
+    """
+    
+    __slots__ = ("columns", "_rows", "_first", "_csv", "_column_data", "_consumed")
+    
+    def __init__(self, rows: Iterable[Any], columns: list[str] | None = None):
+        """Initialize the source.
+        
+        Args:
+            rows: Iterable of tuples, lists or mappings
+            columns: Column names; required for tuple rows, taken from the
+                keys of the first row for mappings
+        
+        Raises:
+            ValueError: If the columns cannot be determined
+        """
+        self._rows = rows
+        self._first: list[Any] = []
+        self._csv: dict[str, Any] | None = None
+        self._column_data: list[Any] | None = None
+        self._consumed = False
+        if columns is None:
+            columns = self._infer_columns()
+        self.columns = list(columns)
+    
+    @classmethod
+    def from_csv(
+        cls,
+        path: Path | str,
+        columns: list[str] | None = None,
+        delimiter: str = ",",
+        encoding: str = "utf-8",
+        header: bool = True,
+        null_value: str | None = None,
+    ) -> "RowSource":
+        """Create a source that reads rows from a CSV file on every iteration.
+        
+        Values are inserted as strings.
+        
+        Args:
+            path: CSV file path
+            columns: Column names (default: the header row)
+            delimiter: Field delimiter
+            encoding: File encoding
+            header: Whether the first row is a header (skipped when reading rows)
+            null_value: Field value that becomes NULL (e.g. "" or "\\N")
+        
+        Raises:
+            OSError: If the header cannot be read
+            ValueError: If there are neither columns nor a header
+        """
+        path = Path(path)
+        if columns is None:
+            if not header:
+                raise ValueError("CSV row source without a header needs 'columns'")
+            with open(path, newline="", encoding=encoding) as f:
+                columns = next(csv.reader(f, delimiter=delimiter), [])
+            if not columns:
+                raise ValueError(f"CSV file has no header: {path}")
+        
+        source = cls.__new__(cls)
+        source._rows = None
+        source._first = []
+        source._column_data = None
+        source._csv = {
+            "path": path,
+            "delimiter": delimiter,
+            "encoding": encoding,
+            "header": header,
+            "null_value": null_value,
+        }
+        source._consumed = False
+        source.columns = list(columns)
+        return source
+    
+    @classmethod
+    def from_columns(cls, data: Any, columns: list[str] | None = None) -> "RowSource":
+        """Create a source over column-oriented data.
+        
+        Args:
+            data: Mapping of column name to sequence (list, tuple, NumPy
+                array, ...), a 2-D NumPy array (one column per array
+                column) or a NumPy structured array
+            columns: Column names; selects and orders the columns of a
+                mapping or structured array, required for a 2-D array
+        
+        Raises:
+            ValueError: If the columns cannot be determined or the
+                sequences differ in length
+        """
+        if isinstance(data, Mapping):
+            names = list(data.keys()) if columns is None else list(columns)
+            column_data = [data[name] for name in names]
+        elif getattr(getattr(data, "dtype", None), "names", None):
+            # NumPy structured array
+            names = list(data.dtype.names) if columns is None else list(columns)
+            column_data = [data[name] for name in names]
+        elif getattr(data, "ndim", None) == 2:
+            if columns is None:
+                raise ValueError("RowSource.from_columns needs 'columns' for a 2-D array")
+            names = list(columns)
+            if len(names) != data.shape[1]:
+                raise ValueError(f"Array has {data.shape[1]} columns, expected {len(names)}")
+            column_data = [data[:, index] for index in range(len(names))]
+        else:
+            raise ValueError("RowSource.from_columns needs a mapping or a NumPy array")
+        
+        lengths = {len(values) for values in column_data}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns differ in length: {sorted(lengths)}")
+        
+        source = cls.__new__(cls)
+        source._rows = None
+        source._first = []
+        source._csv = None
+        source._column_data = column_data
+        source._consumed = False
+        source.columns = names
+        return source
+    
+    @property
+    def is_columnar(self) -> bool:
+        """Whether the source was created by ``from_columns``."""
+        return self._column_data is not None
+    
+    def iter_column_blocks(self, block_size: int = 4096) -> Iterator[list[list[Any]]]:
+        """Yield blocks of a columnar source as one list of Python values per column.
+        
+        NumPy values are converted with ``tolist()``, so the lists hold
+        plain ``int``/``float``/``bool``/``str`` values.
+        
+        Raises:
+            ValueError: If the source is not columnar
+        """
+        column_data = self._column_data
+        if column_data is None:
+            raise ValueError("RowSource is not columnar")
+        count = len(column_data[0]) if column_data else 0
+        for start in range(0, count, block_size):
+            yield [_to_list(values[start:start + block_size]) for values in column_data]
+    
+    @property
+    def row_count(self) -> int | None:
+        """Number of rows if known without reading them (sequences and columns), else None."""
+        if self._column_data is not None:
+            return len(self._column_data[0]) if self._column_data else 0
+        rows = self._rows
+        if self._csv is None and iter(rows) is not rows and hasattr(rows, "__len__"):
+            return len(rows)
+        return None
+    
+    @property
+    def csv_options(self) -> dict[str, Any] | None:
+        """Options of a CSV source (path, delimiter, encoding, header, null_value), else None."""
+        return dict(self._csv) if self._csv is not None else None
+    
+    def __iter__(self) -> Iterator[tuple]:
+        """Yield rows as tuples in column order."""
+        if self._csv is not None:
+            return self._iter_csv()
+        if self._column_data is not None:
+            return self._iter_columns()
+        
+        rows = self._rows
+        if iter(rows) is rows:
+            if self._consumed:
+                raise ValueError("RowSource over an iterator can only be consumed once")
+            self._consumed = True
+            # Include the row peeked to infer the columns
+            rows = itertools.chain(self._first, rows)
+            self._first = []
+        return self._iter_rows(rows)
+    
+    def _iter_rows(self, rows: Iterable[Any]) -> Iterator[tuple]:
+        columns = self.columns
+        width = len(columns)
+        for row in rows:
+            if isinstance(row, Mapping):
+                yield tuple(row.get(column) for column in columns)
+            else:
+                row = tuple(row)
+                if len(row) != width:
+                    raise ValueError(f"Row has {len(row)} values, expected {width}: {row!r}")
+                yield row
+    
+    def _iter_columns(self) -> Iterator[tuple]:
+        for block in self.iter_column_blocks():
+            yield from zip(*block)
+    
+    def _iter_csv(self) -> Iterator[tuple]:
+        options = self._csv
+        null_value = options["null_value"]
+        with open(options["path"], newline="", encoding=options["encoding"]) as f:
+            reader = csv.reader(f, delimiter=options["delimiter"])
+            if options["header"]:
+                next(reader, None)
+            # Skip blank lines
+            rows = (row for row in reader if row)
+            if null_value is not None:
+                rows = ([None if field == null_value else field for field in row] for row in rows)
+            yield from self._iter_rows(rows)
+    
+    def _infer_columns(self) -> list[str]:
+        rows = self._rows
+        if iter(rows) is rows:
+            # Keep the peeked row for the first iteration
+            first = next(rows, None)
+            if first is not None:
+                self._first = [first]
+        else:
+            first = next(iter(rows), None)
+        if isinstance(first, Mapping):
+            return list(first.keys())
+        raise ValueError("RowSource needs 'columns' unless the rows are mappings")
+    
+    def __repr__(self) -> str:
+        if self._csv is not None:
+            path = str(self._csv["path"])
+            options = ", ".join(
+                f"{key}={value!r}" for key, value in self._csv.items() if key != "path"
+            )
+            return f"RowSource.from_csv({path!r}, columns={self.columns!r}, {options})"
+        if self._column_data is not None:
+            count = len(self._column_data[0]) if self._column_data else 0
+            return f"RowSource.from_columns(columns={self.columns!r}, rows={count})"
+        rows = f"<{type(self._rows).__name__} at {id(self._rows):#x}>"
+        return f"RowSource(columns={self.columns!r}, rows={rows})"
+
+
+def _to_list(values: Any) -> list[Any]:
+    """Convert a column slice (list, tuple, NumPy array, ...) to a list."""
+    tolist = getattr(values, "tolist", None)
+    return tolist() if tolist is not None else list(values)
@@ -2,7 +2,7 @@
 
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import yaml
 
@@ -43,7 +43,15 @@ class SecurityConfig:
             config = yaml.safe_load(f)
         
         return cls(config)
-    
+
+    def fingerprint(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Return a hashable summary of the access rules.
+
+        Two configurations with the same denied and allowed tables have the
+        same fingerprint, so they can share cached SQL.
+        """
+        return (tuple(sorted(self.denied_tables)), tuple(sorted(self.allowed_tables)))
+
     def validate_sql(self, sql: str) -> None:
         """Validate generated SQL against security rules.
         
@@ -55,13 +63,19 @@ class SecurityConfig:
         """
         # Extract table names from SQL
         # Simple regex to find table names after FROM, JOIN, UPDATE, INSERT INTO, DELETE FROM
+        # and in bulk-load statements
         table_patterns = [
-            r'\bFROM\s+(\w+)',  # FROM table_name
+            # FROM table_name (not FROM STDIN, Oracle's DUAL or unnest(...))
+            r'\bFROM\s+(?!STDIN\b|DUAL\b|unnest\s*\()(\w+)',
             r'\bJOIN\s+(\w+)',  # JOIN table_name
-            r'\bUPDATE\s+(\w+)',  # UPDATE table_name
+            # UPDATE table_name (not DO UPDATE SET / ON DUPLICATE KEY UPDATE)
+            r'(?<!KEY )\bUPDATE\s+(?!SET\b)(\w+)',
             r'\bINSERT\s+INTO\s+(\w+)',  # INSERT INTO table_name
             r'\bDELETE\s+FROM\s+(\w+)',  # DELETE FROM table_name
-            r'\bMERGE\s+INTO\s+(\w+)',  # MERGE INTO table_name (Oracle/SQL Server)
+            r'\bMERGE\s+(?:INTO\s+)?(\w+)',  # MERGE [INTO] table_name (Oracle/SQL Server)
+            r'^COPY\s+(\w+)\s*\(',  # COPY table_name (columns) (PostgreSQL bulk load)
+            r'\bINTO\s+TABLE\s+(\w+)',  # LOAD DATA ... INTO TABLE table_name (MySQL)
+            r'\bBULK\s+INSERT\s+(\w+)',  # BULK INSERT table_name (SQL Server)
         ]
         
         found_tables = set()
@@ -89,6 +103,47 @@ class SecurityConfig:
                     all_tables=list(found_tables),
                 )
 
+    def validate_sql_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Validate SQL that is produced in chunks, yielding it once validated.
+        
+        Text is validated up to the last character that cannot be part of a
+        table reference (anything but letters, digits, "_" and whitespace),
+        so a reference split across chunks is checked as a whole. Nothing is
+        yielded before it has been validated.
+        
+        Args:
+            chunks: SQL fragments in order
+            
+        Yields:
+            Validated SQL fragments (concatenated, equal to the input)
+            
+        Raises:
+            SecurityError: If forbidden tables are used
+        """
+        pending = ""
+        for chunk in chunks:
+            pending += chunk
+            cut = _reference_boundary(pending)
+            if cut:
+                validated, pending = pending[:cut], pending[cut:]
+                self.validate_sql(validated)
+                yield validated
+        if pending:
+            self.validate_sql(pending)
+            yield pending
+
+
+def _reference_boundary(text: str) -> int:
+    """Return the index after the last character that cannot occur in a table reference.
+    
+    Returns 0 if there is none.
+    """
+    for index in range(len(text) - 1, -1, -1):
+        char = text[index]
+        if not (char.isalnum() or char == "_" or char.isspace()):
+            return index + 1
+    return 0
+
 
 class SecurityError(Exception):
     """Security validation error."""
@@ -0,0 +1,233 @@
+"""Binary serialization of YQL ASTs.
+
+``dumps``/``loads`` encode AST nodes (and lists or dicts of them, e.g. a whole
+query catalog) to a compact binary format so that worker processes can load
+compiled catalogs without parsing YAML.
+
+Nodes are converted to tagged tuples and written with ``marshal``; no
+third-party dependency is needed and, unlike ``pickle``, loading cannot run
+arbitrary code. Subtrees that contain only plain data (str, int, float,
+bool, None, list, dict) are stored as-is and returned without being walked.
+
+Format: ``b"YQLB"``, format version (uint16), ``marshal`` version (uint8),
+marshal payload. The ``marshal`` format may change between Python
+versions, so data must be loaded by the Python version that wrote it.
+
+Example:
+    with open("catalog.yqlb", "wb") as f:
+        dump({"orders": parse_file("orders.yql")}, f)
+    with open("catalog.yqlb", "rb") as f:
+        catalog = load(f)
+"""
+
+import marshal
+import struct
+from dataclasses import fields
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, BinaryIO
+
+from . import ast
+from .rows import RowSource
+
+MAGIC = b"YQLB"
+
+# Bump when the encoding or the AST layout changes.
+FORMAT_VERSION = 4
+
+_HEADER = struct.Struct(">4sHB")
+
+# Node classes by tag (append only - tags are part of the format)
+_NODE_TYPES: list[type] = [
+    ast.Column,
+    ast.FromClause,
+    ast.JoinClause,
+    ast.OrderByClause,
+    ast.WithClause,
+    ast.Pagination,
+    ast.SelectQuery,
+    ast.InsertQuery,
+    ast.UpdateQuery,
+    ast.DeleteQuery,
+    ast.OnConflictClause,
+    ast.OnDuplicateKeyClause,
+    ast.WhenMatchedClause,
+    ast.WhenNotMatchedClause,
+    ast.UpsertQuery,
+    ast.YQLQuery,
+]
+
+_ENUM_TYPES: list[type[Enum]] = [
+    ast.JoinType,
+    ast.SortDirection,
+    ast.OperationType,
+]
+
+# Tags of non-node values (negative so they never clash with node tags)
+_ENUM = -1
+_LIST = -2
+_DICT = -3
+_TUPLE = -4
+_SET = -5
+_DATE = -6
+_DATETIME = -7
+_TIME = -8
+_CSV_ROWS = -9
+
+_NODE_TAGS = {cls: tag for tag, cls in enumerate(_NODE_TYPES)}
+_ENUM_TAGS = {cls: tag for tag, cls in enumerate(_ENUM_TYPES)}
+# Constructor arguments of each node class, in order
+_NODE_FIELDS = [tuple(f.name for f in fields(cls) if f.init) for cls in _NODE_TYPES]
+
+# Enum members by tag and value
+_ENUM_MEMBERS = [{member.value: member for member in cls} for cls in _ENUM_TYPES]
+
+_PLAIN_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize an AST node, or a list/dict containing nodes, to bytes.
+
+    Raises:
+        TypeError: If a value cannot be serialized
+    """
+    encoded, _ = _encode(value)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version) + marshal.dumps(encoded)
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize bytes produced by ``dumps``.
+
+    Raises:
+        ValueError: If the data is not in this format, is corrupt or was
+            written by an incompatible version
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a YQL binary AST: data is too short")
+    magic, version, marshal_version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a YQL binary AST: bad magic")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported YQL binary AST version {version} (expected {FORMAT_VERSION})"
+        )
+    if marshal_version != marshal.version:
+        raise ValueError(
+            f"YQL binary AST was written with marshal version {marshal_version} "
+            f"(this Python uses {marshal.version})"
+        )
+    try:
+        return _decode(marshal.loads(memoryview(data)[_HEADER.size:]))
+    except (EOFError, IndexError, KeyError, TypeError) as e:
+        # Truncated payload, or tuples of the wrong shape
+        raise ValueError(f"Corrupt YQL binary AST (format version {FORMAT_VERSION}): {e!r}") from e
+
+
+def dump(value: Any, file: BinaryIO) -> None:
+    """Serialize ``value`` to a binary file object."""
+    file.write(dumps(value))
+
+
+def load(file: BinaryIO) -> Any:
+    """Deserialize a value from a binary file object."""
+    return loads(file.read())
+
+
+def _encode(value: Any) -> tuple[Any, bool]:
+    """Encode a value.
+
+    Returns:
+        Tuple of (encoded value, True if the decoder has to walk it)
+    """
+    if isinstance(value, _PLAIN_TYPES):
+        return value, False
+
+    tag = _NODE_TAGS.get(type(value))
+    if tag is not None:
+        return (tag, *(_encode(getattr(value, name))[0] for name in _NODE_FIELDS[tag])), True
+
+    if isinstance(value, list):
+        items = [_encode(item) for item in value]
+        if any(walk for _, walk in items):
+            return (_LIST, [item for item, _ in items]), True
+        return value, False
+    elif isinstance(value, dict):
+        items = [(_encode(k), _encode(v)) for k, v in value.items()]
+        if any(kwalk or vwalk for (_, kwalk), (_, vwalk) in items):
+            return (_DICT, [(k, v) for (k, _), (v, _) in items]), True
+        return value, False
+    elif isinstance(value, Enum):
+        enum_tag = _ENUM_TAGS.get(type(value))
+        if enum_tag is None:
+            raise TypeError(f"Cannot serialize enum {type(value).__name__}")
+        return (_ENUM, enum_tag, value.value), True
+    elif isinstance(value, tuple):
+        return (_TUPLE, [_encode(item)[0] for item in value]), True
+    elif isinstance(value, (set, frozenset)):
+        return (_SET, [_encode(item)[0] for item in value]), True
+    elif isinstance(value, datetime):
+        return (_DATETIME, value.isoformat()), True
+    elif isinstance(value, date):
+        return (_DATE, value.isoformat()), True
+    elif isinstance(value, time):
+        return (_TIME, value.isoformat()), True
+    elif isinstance(value, RowSource):
+        # A CSV source is stored as its file reference; in-memory rows are not
+        options = value.csv_options
+        if options is None:
+            raise TypeError("Cannot serialize a RowSource over in-memory rows")
+        return (
+            _CSV_ROWS, str(options["path"]), value.columns,
+            options["delimiter"], options["encoding"], options["header"], options["null_value"],
+        ), True
+    raise TypeError(f"Cannot serialize value of type {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if type(value) is not tuple:
+        # Plain data is stored as-is
+        return value
+
+    tag = value[0]
+    if type(tag) is not int or not _CSV_ROWS <= tag < len(_NODE_TYPES):
+        raise ValueError(
+            f"Corrupt YQL binary AST (format version {FORMAT_VERSION}): unknown tag {tag!r}"
+        )
+    if tag >= 0:
+        return _NODE_TYPES[tag](*[
+            _decode(item) if type(item) is tuple else item for item in value[1:]
+        ])
+    elif tag == _ENUM:
+        if not 0 <= value[1] < len(_ENUM_MEMBERS) or value[2] not in _ENUM_MEMBERS[value[1]]:
+            raise ValueError(
+                f"Corrupt YQL binary AST (format version {FORMAT_VERSION}): "
+                f"unknown enum {value[1]!r} value {value[2]!r}"
+            )
+        return _ENUM_MEMBERS[value[1]][value[2]]
+    elif tag == _LIST:
+        return [_decode(item) if type(item) is tuple else item for item in value[1]]
+    elif tag == _DICT:
+        return {_decode(k): _decode(v) for k, v in value[1]}
+    elif tag == _TUPLE:
+        return tuple(_decode(item) for item in value[1])
+    elif tag == _SET:
+        return {_decode(item) for item in value[1]}
+    elif tag == _DATETIME:
+        return datetime.fromisoformat(value[1])
+    elif tag == _DATE:
+        return date.fromisoformat(value[1])
+    elif tag == _TIME:
+        return time.fromisoformat(value[1])
+    elif tag == _CSV_ROWS:
+        path, columns, delimiter, encoding, header, null_value = value[1:]
+        return RowSource.from_csv(
+            path,
+            columns=columns,
+            delimiter=delimiter,
+            encoding=encoding,
+            header=header,
+            null_value=null_value,
+        )
+    raise ValueError(
+        f"Corrupt YQL binary AST (format version {FORMAT_VERSION}): unknown tag {tag!r}"
+    )
@@ -0,0 +1,207 @@
+"""Watch mode: incremental rebuilds driven by import dependencies.
+
+The watcher polls file stats (no extra dependencies) and keeps a
+reverse-dependency index built from the import closure of every compiled
+file. When a file changes, only that file and the files that import it,
+directly or transitively, are recompiled.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .batch import CompileResult, _write_outputs, compile_file, discover_yql_files, output_path
+from .generator import Dialect
+
+# (mtime_ns, size) of a file, or None if it does not exist
+_Signature = tuple[int, int] | None
+
+# Recorded for an import modified while its importer was compiling, so the
+# next poll sees it as changed
+_STALE: _Signature = (-1, -1)
+
+
+@dataclass
+class RebuildStats:
+    """Result of one rebuild pass."""
+    changed: list[Path] = field(default_factory=list)  # Changed files (sources and imports)
+    rebuilt: list[CompileResult] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)  # Deleted sources
+    skipped: int = 0  # Sources that were up to date
+    elapsed: float = 0.0
+
+    @property
+    def failures(self) -> list[CompileResult]:
+        return [r for r in self.rebuilt if r.errors]
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Watcher:
+    """Incrementally compile a directory of YQL files.
+
+    Example:
+        watcher = Watcher("queries", "out", [Dialect.POSTGRESQL])
+        watcher.build()
+        while True:
+            stats = watcher.poll()
+            time.sleep(1.0)
+    """
+
+    def __init__(self, src_dir: Path | str, out_dir: Path | str, dialects: list[Dialect]):
+        """Initialize the watcher.
+
+        Args:
+            src_dir: Source directory (searched recursively for ``.yql`` files)
+            out_dir: Output directory
+            dialects: Target dialects
+        """
+        self.src_dir = Path(src_dir)
+        self.out_dir = Path(out_dir)
+        self.dialects = dialects
+        # Last seen signature of every source and import file
+        self._signatures: dict[Path, _Signature] = {}
+        # Source -> resolved import closure
+        self._imports: dict[Path, set[Path]] = {}
+        # Resolved import file -> sources whose closure contains it
+        self._dependents: dict[Path, set[Path]] = {}
+
+    def build(self) -> RebuildStats:
+        """Compile every source file and build the dependency index."""
+        start = time.perf_counter()
+        sources = self._scan_sources()
+        stats = RebuildStats()
+        # Snapshot before compiling, so an edit made meanwhile is seen by the next poll
+        for source in sources:
+            self._signatures[source] = _signature(source)
+        for source in sources:
+            stats.rebuilt.append(self._compile(source))
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def poll(self) -> RebuildStats:
+        """Check for changes and recompile the affected files.
+
+        Returns:
+            RebuildStats (``changed`` is empty if nothing changed)
+        """
+        start = time.perf_counter()
+        stats = RebuildStats()
+        sources = set(self._scan_sources())
+        known_sources = set(self._imports)
+
+        # Sources plus every import file seen so far (imports may live outside src_dir)
+        watched = sources | known_sources | set(self._dependents)
+        changed = set()
+        for path in watched:
+            signature = _signature(path)
+            if self._signatures.get(path, False) != signature:
+                changed.add(path)
+                self._signatures[path] = signature
+
+        for source in sorted(known_sources - sources):
+            self._forget(source)
+            stats.removed.append(source)
+
+        affected = {path for path in changed if path in sources}
+        for path in changed:
+            affected.update(self._dependents.get(path, ()))
+        affected &= sources
+
+        for source in sorted(affected):
+            stats.rebuilt.append(self._compile(source))
+
+        stats.changed = sorted(changed)
+        stats.skipped = len(sources) - len(affected)
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def run(
+        self,
+        interval: float = 1.0,
+        on_rebuild: Callable[[RebuildStats], None] | None = None,
+        max_polls: int | None = None,
+    ) -> None:
+        """Build once, then poll until interrupted.
+
+        Args:
+            interval: Seconds between polls
+            on_rebuild: Called with the stats of the initial build and of every
+                poll that found changes
+            max_polls: Stop after this many polls (default: run forever)
+        """
+        stats = self.build()
+        if on_rebuild is not None:
+            on_rebuild(stats)
+
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            time.sleep(interval)
+            stats = self.poll()
+            polls += 1
+            if stats.changed and on_rebuild is not None:
+                on_rebuild(stats)
+
+    def dependents(self, path: Path | str) -> set[Path]:
+        """Return the sources that import ``path`` directly or transitively."""
+        return set(self._dependents.get(Path(path).resolve(), set()))
+
+    def _scan_sources(self) -> list[Path]:
+        return [path.resolve() for path in discover_yql_files(self.src_dir)]
+
+    def _compile(self, source: Path) -> CompileResult:
+        """Compile one source, write its outputs and update the index."""
+        started = time.time_ns()
+        result = compile_file(source, self.dialects)
+        result.source = source.relative_to(self.src_dir.resolve())
+        # Remove outputs of dialects that no longer compile instead of leaving stale SQL
+        for dialect in self.dialects:
+            if dialect not in result.sql:
+                output_path(self.out_dir, result.source, dialect).unlink(missing_ok=True)
+        _write_outputs(self.out_dir, result)
+
+        # A file that fails to parse keeps its previous dependencies and adds
+        # the imports it tried to load (e.g. one that does not exist yet), so
+        # it is retried when one of them changes or appears.
+        imports = {path.resolve() for path in result.imports}
+        if "parse" in result.errors:
+            imports |= self._imports.get(source, set())
+        self._set_imports(source, imports, started)
+        return result
+
+    def _set_imports(self, source: Path, imports: set[Path], started: int | None = None) -> None:
+        """Record the import closure of ``source``.
+
+        ``started`` is the ``time.time_ns()`` at which the compile that
+        found the imports started. A newly seen import modified after that
+        may have been read before the change, so it is marked stale.
+        """
+        for path in self._imports.get(source, set()) - imports:
+            self._dependents[path].discard(source)
+            if not self._dependents[path]:
+                del self._dependents[path]
+        for path in imports:
+            self._dependents.setdefault(path, set()).add(source)
+            if path not in self._signatures:
+                signature = _signature(path)
+                if started is not None and signature is not None and signature[0] >= started:
+                    signature = _STALE
+                self._signatures[path] = signature
+        self._imports[source] = imports
+
+    def _forget(self, source: Path) -> None:
+        """Drop a deleted source from the index and remove its outputs."""
+        self._set_imports(source, set())
+        del self._imports[source]
+        self._signatures.pop(source, None)
+        relative = source.relative_to(self.src_dir.resolve())
+        for dialect in self.dialects:
+            output_path(self.out_dir, relative, dialect).unlink(missing_ok=True)
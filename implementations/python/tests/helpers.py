@@ -0,0 +1,16 @@
+"""Shared helpers for the tests."""
+
+from yql.ast import InsertQuery, OperationType, YQLQuery
+
+
+def make_insert(rows, table: str = "events", **kwargs) -> YQLQuery:
+    """Build an INSERT query over ``rows`` (row dicts or a RowSource)."""
+    return YQLQuery(
+        operation=OperationType.INSERT,
+        insert_query=InsertQuery(table=table, values=rows, **kwargs),
+    )
+
+
+def numbered_rows(count: int, columns: int = 2) -> list[dict]:
+    """Return ``count`` rows of ``c0`` (the row number) and string columns ``c1``..."""
+    return [{f"c{c}": f"v{i}" if c else i for c in range(columns)} for i in range(count)]
@@ -0,0 +1,68 @@
+"""Tests for AST fingerprints."""
+
+import pytest
+
+from yql import Dialect, generate_sql, parse
+from yql.ast import FromClause, SelectQuery, fingerprint
+
+YQL = """
+query:
+  with_clauses:
+    active:
+      select:
+        - id: c.id
+      from: { c: customers }
+      where:
+        - "c.status = 'active'"
+  select:
+    - id: a.id
+  from: { a: active }
+"""
+
+
+class TestFingerprint:
+    """Tests for fingerprint()."""
+    
+    def test_equal_structure(self):
+        """Test that separately parsed equal queries share a fingerprint."""
+        assert fingerprint(parse(YQL)) == fingerprint(parse(YQL))
+        assert fingerprint(parse(YQL)) == fingerprint(parse(YQL, keep_raw=False))
+    
+    def test_different_structure(self):
+        """Test that any change in a subtree changes the fingerprint."""
+        changed = parse(YQL.replace("'active'", "'inactive'"))
+        assert fingerprint(changed) != fingerprint(parse(YQL))
+        
+        assert fingerprint(SelectQuery(limit=1)) != fingerprint(SelectQuery(limit="1"))
+    
+    def test_follows_mutation(self):
+        """Test that the fingerprint follows changes to a node."""
+        query = parse(YQL).select_query
+        before = fingerprint(query)
+        query.with_clauses[0].query.where[0] = "c.status = 'inactive'"
+        
+        assert fingerprint(query) != before
+        edited = parse(YQL.replace("'active'", "'inactive'")).select_query
+        assert fingerprint(query) == fingerprint(edited)
+        assert fingerprint(FromClause(alias="c", table="customers"))
+    
+    def test_not_hashable(self):
+        """Test that mutable query nodes are not hashable."""
+        with pytest.raises(TypeError):
+            hash(parse(YQL).select_query)
+    
+    def test_cte_sql(self):
+        """Test that separately parsed equal queries generate the same CTE SQL."""
+        for dialect in Dialect:
+            first = generate_sql(parse(YQL), dialect)
+            assert generate_sql(parse(YQL), dialect) == first
+            assert first.startswith("WITH active AS (\n  SELECT\n    c.id AS id")
+    
+    def test_cte_sql_after_mutation(self):
+        """Test that regenerating a mutated CTE body does not reuse cached SQL."""
+        query = parse(YQL)
+        assert "'active'" in generate_sql(query)
+        
+        query.select_query.with_clauses[0].query.where[0] = "c.status = 'inactive'"
+        
+        assert "'inactive'" in generate_sql(query)
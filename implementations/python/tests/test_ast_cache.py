@@ -0,0 +1,119 @@
+"""Tests for the on-disk AST cache."""
+
+from pathlib import Path
+
+import pytest
+
+from yql import ASTCache, Dialect, generate_sql, parse_file
+from yql.parser import ParseError
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+DEFINITION_YQL = """
+name: "active_customers"
+select_definition:
+  select:
+    - id: c.id
+  from: { c: customers }
+  where:
+    - "c.status = 'active'"
+"""
+
+USAGE_YQL = """
+imports:
+  - "active_customers"
+query:
+  with_clauses:
+    ac:
+      using: "active_customers"
+  select:
+    - id: a.id
+  from: { a: ac }
+"""
+
+
+@pytest.fixture
+def import_tree(tmp_path: Path) -> Path:
+    """Create a query file that imports a definition file."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "active_customers.yql").write_text(DEFINITION_YQL, encoding="utf-8")
+    (project / "usage.yql").write_text(USAGE_YQL, encoding="utf-8")
+    return project
+
+
+class TestASTCache:
+    """Tests for ASTCache."""
+
+    def test_cached_result_matches_uncached(self, tmp_path: Path):
+        """Test that a cache hit returns an equal AST."""
+        cache = ASTCache(tmp_path / "cache")
+        path = FIXTURES_DIR / "select_complex" / "before.yql"
+
+        first = parse_file(path, cache=cache)
+        second = parse_file(path, cache=cache)
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+        assert second == parse_file(path)
+        assert generate_sql(second, Dialect.POSTGRESQL) == generate_sql(first, Dialect.POSTGRESQL)
+
+    def test_hit_in_new_cache_instance(self, tmp_path: Path):
+        """Test that entries persist across cache instances."""
+        path = FIXTURES_DIR / "simple_select" / "before.yql"
+        parse_file(path, cache=ASTCache(tmp_path / "cache"))
+
+        cache = ASTCache(tmp_path / "cache")
+        parse_file(path, cache=cache)
+        assert cache.hits == 1
+
+    def test_changed_file_is_reparsed(self, tmp_path: Path, import_tree: Path):
+        """Test that editing the file invalidates its entry."""
+        cache = ASTCache(tmp_path / "cache")
+        usage = import_tree / "usage.yql"
+        parse_file(usage, cache=cache)
+
+        usage.write_text(USAGE_YQL.replace("- id: a.id", "- customer_id: a.id"), encoding="utf-8")
+        result = parse_file(usage, cache=cache)
+
+        assert cache.misses == 2
+        assert result.select_query.select[0].alias == "customer_id"
+
+    def test_changed_import_is_reparsed(self, tmp_path: Path, import_tree: Path):
+        """Test that editing an imported file invalidates importers."""
+        cache = ASTCache(tmp_path / "cache")
+        usage = import_tree / "usage.yql"
+        parse_file(usage, cache=cache)
+
+        definition = import_tree / "active_customers.yql"
+        definition.write_text(DEFINITION_YQL.replace("'active'", "'premium'"), encoding="utf-8")
+        result = parse_file(usage, cache=cache)
+
+        assert cache.hits == 0
+        assert result.select_query.with_clauses[0].query.where == ["c.status = 'premium'"]
+
+    def test_format_is_part_of_key(self, tmp_path: Path):
+        """Test that forcing another format does not return the cached AST."""
+        cache = ASTCache(tmp_path / "cache")
+        path = FIXTURES_DIR / "simple_select" / "before.yql"
+        parse_file(path, cache=cache)
+
+        with pytest.raises(ParseError):
+            parse_file(path, cache=cache, format="json")
+        assert cache.hits == 0
+
+    def test_max_entries(self, tmp_path: Path):
+        """Test that the number of entries is bounded."""
+        cache = ASTCache(tmp_path / "cache", max_entries=2)
+        for name in ("simple_select", "select_with_where", "select_with_join"):
+            parse_file(FIXTURES_DIR / name / "before.yql", cache=cache)
+
+        assert len(cache) == 2
+
+    def test_clear(self, tmp_path: Path):
+        """Test clearing the cache."""
+        cache = ASTCache(tmp_path / "cache")
+        parse_file(FIXTURES_DIR / "simple_select" / "before.yql", cache=cache)
+
+        assert cache.clear() == 1
+        assert len(cache) == 0
@@ -0,0 +1,70 @@
+"""Tests for batch compilation (yql compile-dir)."""
+
+from pathlib import Path
+
+import pytest
+
+from yql import Dialect, generate_sql, parse_file
+from yql.batch import compile_directory, parse_dialects
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+
+def _read_tree(root: Path) -> dict[str, str]:
+    return {
+        str(p.relative_to(root)): p.read_text(encoding="utf-8")
+        for p in sorted(root.rglob("*")) if p.is_file()
+    }
+
+
+class TestParseDialects:
+    """Tests for the --dialect option."""
+    
+    def test_comma_separated(self):
+        assert parse_dialects("postgresql, mysql") == [Dialect.POSTGRESQL, Dialect.MYSQL]
+    
+    def test_all(self):
+        assert parse_dialects("all") == list(Dialect)
+    
+    def test_unknown_dialect(self):
+        with pytest.raises(ValueError):
+            parse_dialects("postgresql,db2")
+
+
+class TestCompileDirectory:
+    """Tests for compile_directory."""
+    
+    def test_outputs_match_generate_sql(self, tmp_path):
+        """Test that each output equals generate_sql for that file and dialect."""
+        report = compile_directory(FIXTURES_DIR, tmp_path, [Dialect.POSTGRESQL], jobs=1)
+        
+        output = tmp_path / "select_complex" / "before.postgresql.sql"
+        expected = generate_sql(parse_file(FIXTURES_DIR / "select_complex" / "before.yql"))
+        assert output.read_text(encoding="utf-8") == expected
+        assert report.compiled
+    
+    def test_definition_files_are_skipped(self, tmp_path):
+        """Test that import definition files are not reported as failures."""
+        report = compile_directory(FIXTURES_DIR, tmp_path, [Dialect.POSTGRESQL], jobs=1)
+        
+        skipped = {str(r.source) for r in report.skipped}
+        assert str(Path("test_import_customer_summary") / "before.yql") in skipped
+    
+    def test_dialect_failure_keeps_other_outputs(self, tmp_path):
+        """Test that a failing dialect is reported without dropping the others."""
+        report = compile_directory(
+            FIXTURES_DIR, tmp_path, [Dialect.POSTGRESQL, Dialect.ORACLE], jobs=1,
+        )
+        
+        failed = {str(r.source): r for r in report.failures}
+        result = failed[str(Path("insert_with_returning") / "before.yql")]
+        assert list(result.errors) == ["oracle"]
+        assert (tmp_path / "insert_with_returning" / "before.postgresql.sql").exists()
+    
+    def test_output_independent_of_worker_count(self, tmp_path):
+        """Test that the output tree is identical for 1 and N workers."""
+        dialects = list(Dialect)
+        compile_directory(FIXTURES_DIR, tmp_path / "serial", dialects, jobs=1)
+        compile_directory(FIXTURES_DIR, tmp_path / "parallel", dialects, jobs=3)
+        
+        assert _read_tree(tmp_path / "serial") == _read_tree(tmp_path / "parallel")
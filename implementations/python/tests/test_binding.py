@@ -0,0 +1,126 @@
+"""Tests for bind-parameter output."""
+
+from pathlib import Path
+
+import pytest
+
+from yql import BindStyle, BoundSQL, Dialect, generate_sql, parse, parse_file
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+SELECT_YQL = """
+query:
+  select:
+    - id: c.id
+  from: { c: customers }
+  where:
+    - "c.status = #{status:'active'}"
+    - "c.region = #{region} OR c.home_region = #{region}"
+    - "c.name LIKE 'A%'"
+"""
+
+
+class TestBindStyles:
+    """Tests for each bind style."""
+    
+    def test_qmark(self):
+        """Test that qmark repeats parameters per placeholder."""
+        bound = generate_sql(parse(SELECT_YQL), bind_style="qmark")
+        
+        assert isinstance(bound, BoundSQL)
+        assert "WHERE c.status = ?\n  AND c.region = ? OR c.home_region = ?" in bound.sql
+        assert [p.name for p in bound.params] == ["status", "region", "region"]
+        assert bound.bind({"region": "EU"}) == ["active", "EU", "EU"]
+    
+    def test_numeric(self):
+        """Test that numeric reuses the number of a repeated parameter."""
+        bound = generate_sql(parse(SELECT_YQL), bind_style=BindStyle.NUMERIC)
+        
+        assert "c.region = :2 OR c.home_region = :2" in bound.sql
+        assert bound.bind({"region": "EU", "status": "new"}) == ["new", "EU"]
+    
+    def test_dollar(self):
+        """Test PostgreSQL $n placeholders."""
+        bound = generate_sql(parse(SELECT_YQL), bind_style="dollar")
+        
+        assert "c.status = $1\n  AND c.region = $2 OR c.home_region = $2" in bound.sql
+        assert bound.bind({"region": "EU"}) == ["active", "EU"]
+    
+    def test_named(self):
+        """Test named placeholders."""
+        bound = generate_sql(parse(SELECT_YQL), bind_style="named")
+        
+        assert "c.status = :status" in bound.sql
+        assert bound.bind({"region": "EU"}) == {"status": "active", "region": "EU"}
+    
+    def test_pyformat_escapes_percent(self):
+        """Test that literal '%' is doubled for pyformat drivers."""
+        bound = generate_sql(parse(SELECT_YQL), bind_style="pyformat")
+        
+        assert "c.status = %(status)s" in bound.sql
+        assert "LIKE 'A%%'" in bound.sql
+    
+    def test_missing_value(self):
+        """Test that a parameter without value or default is an error."""
+        bound = generate_sql(parse(SELECT_YQL), bind_style="named")
+        
+        with pytest.raises(ValueError, match="region"):
+            bound.bind()
+    
+    def test_unknown_style(self):
+        """Test that an unknown style is rejected."""
+        with pytest.raises(ValueError, match="Unsupported bind style"):
+            generate_sql(parse(SELECT_YQL), bind_style="format")
+
+
+class TestBindLiterals:
+    """Tests for binding literal values."""
+    
+    def test_insert_values(self):
+        """Test that INSERT values become parameters."""
+        query = parse_file(FIXTURES_DIR / "insert_multiple_rows" / "before.yql")
+        bound = generate_sql(query, Dialect.MYSQL, bind_style="qmark")
+        
+        assert bound.sql.endswith("VALUES (?, ?), (?, ?)")
+        assert all(p.is_literal for p in bound.params)
+        assert bound.bind() == [1, "John Doe", 2, "Jane Smith"]
+    
+    def test_same_sql_for_different_values(self):
+        """Test that different literal values share one statement."""
+        first = parse("operation: insert\ntable: t\nvalues:\n  - {id: 1, name: a}\n")
+        second = parse("operation: insert\ntable: t\nvalues:\n  - {id: 2, name: b}\n")
+        
+        first_sql = generate_sql(first, bind_style="numeric").sql
+        assert first_sql == generate_sql(second, bind_style="numeric").sql
+    
+    def test_null_and_parameters_in_values(self):
+        """Test that NULL stays inline and #{name} values are bound by name."""
+        query = parse(
+            "operation: insert\ntable: t\nvalues:\n  - {id: '#{id}', note: null, flag: true}\n"
+        )
+        bound = generate_sql(query, bind_style="named")
+        
+        assert bound.sql.endswith("VALUES (:id, NULL, :lit1)")
+        assert bound.bind({"id": 7}) == {"id": 7, "lit1": True}
+    
+    def test_default_output_unchanged(self):
+        """Test that generate_sql without bind_style still inlines literals."""
+        query = parse_file(FIXTURES_DIR / "insert_multiple_rows" / "before.yql")
+        
+        assert "VALUES (1, 'John Doe'), (2, 'Jane Smith')" in generate_sql(query)
+    
+    def test_nul_in_values(self):
+        """Test that NUL is bound in literals and rejected in SQL text."""
+        query = parse('operation: insert\ntable: t\nvalues:\n  - {id: 1, name: "a\\0b"}\n')
+        bound = generate_sql(query, bind_style="qmark")
+        
+        assert bound.bind() == [1, "a\x00b"]
+        
+        forged = parse(
+            'operation: insert\ntable: t\nvalues:\n  - {id: 1, name: "${\\x000\\x00}"}\n'
+        )
+        with pytest.raises(ValueError, match="NUL character"):
+            generate_sql(forged, bind_style="qmark")
+        stray = parse('operation: insert\ntable: t\nvalues:\n  - {id: 1, name: "${a\\0}"}\n')
+        with pytest.raises(ValueError, match="NUL character"):
+            generate_sql(stray, bind_style="qmark")
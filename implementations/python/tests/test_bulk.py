@@ -0,0 +1,326 @@
+"""Tests for dialect-native bulk loads."""
+
+import io
+import re
+
+import pytest
+
+from yql import (
+    BulkLoad,
+    Dialect,
+    RowSource,
+    SecurityConfig,
+    SecurityError,
+    generate_bulk_load,
+    generate_sql,
+    parse,
+)
+from yql.ast import InsertQuery, OperationType, YQLQuery
+from yql.parser import ParseError
+
+YQL = """
+operation: insert
+strategy: bulk
+table: users
+data_file: /data/users.csv
+values:
+  - id: 1
+    name: "a\\tb\\\\c"
+    active: true
+    note: null
+  - id: 2
+    name: ""
+    active: false
+    note: 'say "hi", ok'
+"""
+
+STAGING = re.compile(r"users_staging_[0-9a-f]{8}")
+
+
+class TestStatements:
+    """Tests for the generated bulk-load statements."""
+    
+    def test_dialects(self):
+        """Test the statement of every dialect."""
+        query = parse(YQL)
+        
+        assert generate_sql(query, Dialect.POSTGRESQL) == (
+            "COPY users (id, name, active, note)\nFROM STDIN"
+        )
+        assert generate_sql(query, Dialect.MYSQL) == (
+            "LOAD DATA LOCAL INFILE '/data/users.csv'\n"
+            "INTO TABLE users\n"
+            "CHARACTER SET utf8mb4\n"
+            "(id, name, active, note)"
+        )
+        sql = generate_sql(query, Dialect.SQLSERVER)
+        staging = STAGING.search(sql)[0]
+        assert sql == (
+            f"SELECT id, name, active, note INTO #{staging} FROM users WHERE 1 = 0 "
+            "UNION ALL SELECT id, name, active, note FROM users WHERE 1 = 0;\n"
+            f"BULK INSERT #{staging}\n"
+            "FROM '/data/users.csv'\n"
+            "WITH (FORMAT = 'CSV', CODEPAGE = '65001', ROWTERMINATOR = '0x0a', KEEPNULLS);\n"
+            "INSERT INTO users (id, name, active, note) "
+            f"SELECT id, name, active, note FROM #{staging};\n"
+            f"DROP TABLE #{staging}"
+        )
+        assert generate_sql(query, Dialect.ORACLE) == (
+            "INSERT INTO users\n(id, name, active, note)\nVALUES (:1, :2, :3, :4)"
+        )
+        assert generate_sql(query, Dialect.ORACLE, layout="compact") == (
+            "INSERT INTO users (id, name, active, note) VALUES (:1, :2, :3, :4)"
+        )
+    
+    def test_bulk_load_operation(self):
+        """Test operation: bulk_load and a data_file argument."""
+        query = parse("operation: bulk_load\ntable: users\ncolumns: [id]\nvalues: [{id: 1}]\n")
+        
+        assert query.insert_query.strategy == "bulk"
+        load = generate_bulk_load(query, Dialect.MYSQL, data_file="it's.tsv")
+        assert load.sql.startswith("LOAD DATA LOCAL INFILE 'it''s.tsv'")
+    
+    def test_sqlserver_column_order(self):
+        """Test that SQL Server loads a reordered column subset by name."""
+        query = parse(
+            "operation: bulk_load\ntable: users\ncolumns: [name, id]\nvalues: [{id: 1, name: a}]\n"
+        )
+        
+        load = generate_bulk_load(query, Dialect.SQLSERVER, data_file="/data/users.csv")
+        staging = STAGING.search(load.sql)[0]
+        assert load.before == [
+            f"SELECT name, id INTO #{staging} FROM users WHERE 1 = 0 "
+            "UNION ALL SELECT name, id FROM users WHERE 1 = 0"
+        ]
+        assert load.sql.startswith(f"BULK INSERT #{staging}\n")
+        assert load.after == [
+            f"INSERT INTO users (name, id) SELECT name, id FROM #{staging}",
+            f"DROP TABLE #{staging}",
+        ]
+        assert "".join(load.iter_payload()) == "a,1\n"
+    
+    def test_errors(self):
+        """Test invalid bulk loads."""
+        with pytest.raises(ValueError, match="requires 'data_file'"):
+            query = parse("operation: bulk_load\ntable: t\nvalues: [{id: 1}]\n")
+            generate_sql(query, Dialect.SQLSERVER)
+        with pytest.raises(ValueError, match="does not support RETURNING"):
+            generate_bulk_load(parse(YQL + "returning: [id]\n"))
+        with pytest.raises(ValueError, match="requires an INSERT"):
+            generate_bulk_load(parse("operation: delete\ntable: t\nwhere: [id = 1]\n"))
+        with pytest.raises(ParseError, match="Invalid INSERT strategy: copy"):
+            parse("operation: insert\nstrategy: copy\ntable: t\nvalues: [{id: 1}]\n")
+    
+    def test_security(self):
+        """Test that bulk-load statements are checked against table rules."""
+        config = SecurityConfig({"denied_tables": ["users"]})
+        for dialect in Dialect:
+            with pytest.raises(SecurityError):
+                generate_bulk_load(parse(YQL), dialect, security_config=config)
+        
+        allowed = SecurityConfig({"allowed_tables": ["users"]})
+        assert generate_bulk_load(parse(YQL), security_config=allowed).sql.endswith("FROM STDIN")
+
+
+class TestPayload:
+    """Tests for payload encoding."""
+    
+    def test_copy_text(self):
+        """Test COPY text format escapes, NULL and booleans."""
+        load = generate_bulk_load(parse(YQL))
+        
+        assert isinstance(load, BulkLoad)
+        assert "".join(load.iter_payload()) == '1\ta\\tb\\\\c\tt\t\\N\n2\t\tf\tsay "hi", ok\n'
+    
+    def test_mysql_tsv(self):
+        """Test LOAD DATA booleans."""
+        load = generate_bulk_load(parse(YQL), Dialect.MYSQL)
+        
+        assert "".join(load.iter_payload()).splitlines()[0] == "1\ta\\tb\\\\c\t1\t\\N"
+    
+    def test_sqlserver_csv(self):
+        """Test CSV quoting of empty strings, quotes and separators."""
+        out = io.BytesIO()
+        load = generate_bulk_load(parse(YQL), Dialect.SQLSERVER)
+        load.write_payload(out, encoding="utf-8")
+        
+        assert out.getvalue().decode() == '1,a\tb\\c,1,\n2,"",0,"say ""hi"", ok"\n'
+    
+    def test_oracle_row_batches(self):
+        """Test array-bind batches and that Oracle has no text payload."""
+        rows = RowSource(((i, f"u{i}") for i in range(5)), columns=["id", "name"])
+        insert = InsertQuery(table="users", values=rows)
+        query = YQLQuery(operation=OperationType.INSERT, insert_query=insert)
+        load = generate_bulk_load(query, Dialect.ORACLE)
+        
+        assert [len(batch) for batch in load.iter_row_batches(2)] == [2, 2, 1]
+        with pytest.raises(ValueError, match="no text payload"):
+            next(load.iter_payload())
+    
+    def test_streamed(self):
+        """Test that rows are read as payload chunks are consumed."""
+        read = []
+        
+        def rows():
+            for i in range(10000):
+                read.append(i)
+                yield (i, "x" * 20)
+        
+        source = RowSource(rows(), columns=["id", "data"])
+        insert = InsertQuery(table="t", values=source)
+        query = YQLQuery(operation=OperationType.INSERT, insert_query=insert)
+        chunks = generate_bulk_load(query).iter_payload(chunk_size=1024)
+        next(chunks)
+        
+        assert len(read) < 100
+        assert sum(len(chunk) for chunk in chunks) > 200000
+        assert len(read) == 10000
+    
+    def test_values_from_csv(self, tmp_path):
+        """Test a bulk load of a CSV row source with declared columns."""
+        (tmp_path / "users.csv").write_text("id,name\n1,alice\n", encoding="utf-8")
+        query = parse(
+            "operation: bulk_load\ntable: users\ncolumns: [id, name]\nvalues_from: users.csv\n",
+            base_path=tmp_path,
+        )
+        
+        assert list(generate_bulk_load(query).iter_payload()) == ["1\talice\n"]
+
+
+UPSERT = """
+operation: upsert
+table: users
+data_file: /data/users.csv
+values:
+  - {id: 1, name: a}
+  - {id: 2, name: b}
+on_conflict:
+  target: [id]
+  update:
+    name: EXCLUDED.name
+on_duplicate_key:
+  update:
+    name: VALUES(name)
+match_on: [id]
+when_matched:
+  update:
+    name: source.name
+when_not_matched:
+  insert:
+    id: source.id
+    name: source.name
+"""
+
+
+class TestStagedUpsert:
+    """Tests for staged bulk upserts."""
+    
+    def test_postgresql_script(self):
+        """Test the staging table script for PostgreSQL."""
+        load = generate_bulk_load(parse(UPSERT), staging_threshold=1)
+        staging = STAGING.search(load.sql)[0]
+        
+        assert load.before == [
+            f"CREATE TEMPORARY TABLE {staging} AS SELECT id, name FROM users WHERE 1 = 0"
+        ]
+        assert load.sql == f"COPY {staging} (id, name)\nFROM STDIN"
+        assert load.after == [
+            "INSERT INTO users\n"
+            "(id, name)\n"
+            "SELECT\n"
+            "  s.id AS id,\n"
+            "  s.name AS name\n"
+            f"FROM {staging} s\n"
+            "ON CONFLICT (id)\n"
+            "DO UPDATE SET\n"
+            "  name = EXCLUDED.name",
+            f"DROP TABLE {staging}",
+        ]
+        assert list(load.iter_payload()) == ["1\ta\n2\tb\n"]
+    
+    def test_merge_dialects(self):
+        """Test that SQL Server and Oracle merge from the staging table."""
+        sqlserver = generate_bulk_load(
+            parse(UPSERT), Dialect.SQLSERVER, staging_threshold=1, layout="compact"
+        )
+        staging = STAGING.search(sqlserver.sql)[0]
+        assert sqlserver.before == [
+            f"SELECT id, name INTO #{staging} FROM users WHERE 1 = 0 "
+            "UNION ALL SELECT id, name FROM users WHERE 1 = 0"
+        ]
+        assert sqlserver.sql.startswith(f"BULK INSERT #{staging} FROM '/data/users.csv'")
+        assert sqlserver.after[0].startswith(
+            "MERGE users AS target "
+            f"USING (SELECT s.id AS id, s.name AS name FROM #{staging} s) AS source"
+        )
+        assert sqlserver.after[1:] == [f"DROP TABLE #{staging}"]
+        
+        oracle = generate_bulk_load(parse(UPSERT), Dialect.ORACLE, staging_threshold=1)
+        staging = STAGING.search(oracle.sql)[0]
+        assert oracle.before[0].startswith(
+            f"CREATE GLOBAL TEMPORARY TABLE {staging} ON COMMIT PRESERVE ROWS"
+        )
+        assert oracle.after[0].startswith("MERGE INTO users target\nUSING (SELECT\n")
+        assert f"FROM {staging} s) source\nON (target.id = source.id)" in oracle.after[0]
+        assert oracle.after[0].endswith("VALUES (source.id, source.name)")
+        assert oracle.after[1:] == [f"TRUNCATE TABLE {staging}", f"DROP TABLE {staging}"]
+        assert list(oracle.iter_row_batches()) == [[(1, "a"), (2, "b")]]
+        
+        # Concurrent loads never share a staging table
+        for dialect in Dialect:
+            first, second = (
+                generate_bulk_load(parse(UPSERT), dialect, staging_threshold=1) for _ in range(2)
+            )
+            assert first.sql != second.sql
+    
+    def test_merge_default_actions(self):
+        """Test that a staged MERGE without actions updates and inserts every column."""
+        query = parse(
+            "operation: upsert\ntable: users\nmatch_on: [id]\nvalues: [{id: 1, name: a}]\n"
+        )
+        
+        sqlserver = generate_bulk_load(
+            query,
+            Dialect.SQLSERVER,
+            data_file="/data/users.csv",
+            staging_threshold=0,
+            layout="compact",
+        )
+        assert sqlserver.after[0].endswith(
+            "WHEN MATCHED THEN UPDATE SET name = source.name "
+            "WHEN NOT MATCHED THEN INSERT (id, name) VALUES (source.id, source.name);"
+        )
+        oracle = generate_bulk_load(query, Dialect.ORACLE, staging_threshold=0, layout="compact")
+        assert oracle.after[0].endswith(
+            "WHEN MATCHED THEN UPDATE SET name = source.name "
+            "WHEN NOT MATCHED THEN INSERT (id, name) VALUES (source.id, source.name)"
+        )
+    
+    def test_threshold(self):
+        """Test that small upserts stay inline and the YQL threshold applies."""
+        inline = generate_bulk_load(parse(UPSERT))
+        assert inline.format is None
+        assert inline.sql == generate_sql(parse(UPSERT))
+        assert (inline.before, inline.after, list(inline.iter_payload())) == ([], [], [])
+        
+        assert generate_bulk_load(parse(UPSERT + "staging_threshold: 1\n")).format == "text"
+        with pytest.raises(ParseError, match="Invalid staging_threshold"):
+            parse(UPSERT + "staging_threshold: many\n")
+    
+    def test_row_source_of_unknown_length(self):
+        """Test that an iterator source is always staged."""
+        query = parse(UPSERT)
+        query.upsert_query.values = RowSource(iter([(1, "a")]), columns=["id", "name"])
+        
+        load = generate_bulk_load(query, Dialect.MYSQL)
+        assert load.sql.startswith("LOAD DATA LOCAL INFILE '/data/users.csv'")
+    
+    def test_security(self):
+        """Test that the staging table is allowed but the target is checked."""
+        allowed = SecurityConfig({"allowed_tables": ["users"]})
+        for dialect in Dialect:
+            generate_bulk_load(parse(UPSERT), dialect, security_config=allowed, staging_threshold=1)
+        
+        denied = SecurityConfig({"denied_tables": ["users"]})
+        with pytest.raises(SecurityError):
+            generate_bulk_load(parse(UPSERT), security_config=denied, staging_threshold=1)
@@ -0,0 +1,97 @@
+"""Tests for the compiled-query cache."""
+
+import pytest
+
+from yql import Dialect, QueryCache, SecurityConfig, SecurityError, generate_sql, parse
+from yql.parser import ParseError
+
+YQL_CONTENT = """
+query:
+  select:
+    - id: c.id
+  from: { c: customers }
+"""
+
+
+class TestQueryCache:
+    """Tests for QueryCache."""
+
+    def test_hit_returns_same_sql(self):
+        """Test that a cache hit returns the generated SQL."""
+        cache = QueryCache(maxsize=4)
+        expected = generate_sql(parse(YQL_CONTENT), Dialect.POSTGRESQL)
+
+        assert cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL) == expected
+        assert cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL) == expected
+
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.size == 1
+
+    def test_dialect_is_part_of_key(self):
+        """Test that different dialects are cached separately."""
+        cache = QueryCache(maxsize=4)
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)
+        cache.get_or_generate(YQL_CONTENT, Dialect.MYSQL)
+
+        assert cache.stats().misses == 2
+        assert len(cache) == 2
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = QueryCache(maxsize=2)
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)
+        cache.get_or_generate(YQL_CONTENT, Dialect.MYSQL)
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)  # refresh
+        cache.get_or_generate(YQL_CONTENT, Dialect.ORACLE)  # evicts MySQL
+
+        assert cache.stats().evictions == 1
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)
+        assert cache.stats().hits == 2
+
+    def test_security_config_is_part_of_key(self):
+        """Test that security rules are enforced per configuration."""
+        cache = QueryCache(maxsize=4)
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)
+
+        config = SecurityConfig({"denied_tables": ["customers"]})
+        with pytest.raises(SecurityError):
+            cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL, security_config=config)
+
+        # Errors are not cached
+        with pytest.raises(SecurityError):
+            cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL, security_config=config)
+        assert len(cache) == 1
+
+    def test_parse_errors_are_not_cached(self):
+        """Test that invalid documents raise ParseError on every call."""
+        cache = QueryCache(maxsize=4)
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                cache.get_or_generate("foo: bar", Dialect.POSTGRESQL)
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        """Test explicit invalidation."""
+        cache = QueryCache(maxsize=4)
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)
+        cache.get_or_generate(YQL_CONTENT, Dialect.MYSQL)
+
+        assert cache.invalidate(YQL_CONTENT) == 2
+        assert len(cache) == 0
+
+        cache.get_or_generate(YQL_CONTENT, Dialect.POSTGRESQL)
+        assert cache.invalidate() == 1
+        assert cache.stats().misses == 3
+
+    def test_csv_documents_are_not_cached(self, tmp_path):
+        """Test that a document reading a CSV file sees changes to the file."""
+        cache = QueryCache(maxsize=4)
+        content = "operation: insert\ntable: users\nvalues_from: users.csv\n"
+        (tmp_path / "users.csv").write_text("id\n1\n", encoding="utf-8")
+        assert cache.get_or_generate(content, base_path=tmp_path).endswith("VALUES ('1')")
+
+        (tmp_path / "users.csv").write_text("id\n2\n", encoding="utf-8")
+        assert cache.get_or_generate(content, base_path=tmp_path).endswith("VALUES ('2')")
+        assert len(cache) == 0
@@ -0,0 +1,78 @@
+"""Tests for precompiled queries."""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+import yql
+from yql import CompiledQuery, Dialect, generate_sql, parse
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+YQL = """
+query:
+  select:
+    - id: c.id
+  from: { c: customers }
+  where:
+    - "c.status = #{status:'active'}"
+    - "c.region IN #{regions}"
+    - "c.name = #{name}"
+  limit: 10
+"""
+
+
+class TestCompile:
+    """Tests for compile()."""
+    
+    def test_render(self):
+        """Test that render substitutes slots with SQL literals."""
+        query = yql.compile(YQL)
+        sql = query.render({"regions": ["EU", "US"], "name": "O'Brien"})
+        
+        assert "WHERE c.status = 'active'" in sql
+        assert "c.region IN ('EU', 'US')" in sql
+        assert "c.name = 'O''Brien'" in sql
+        assert query.parameters == ["status", "regions", "name"]
+    
+    def test_render_escapes_mysql_backslashes(self):
+        """Test that a backslash cannot end a MySQL string literal early."""
+        value = "\\' OR 1=1 -- "
+        
+        mysql = yql.compile(YQL, Dialect.MYSQL).render({"regions": ["EU"], "name": value})
+        assert "c.name = '\\\\'' OR 1=1 -- '" in mysql
+        postgresql = yql.compile(YQL).render({"regions": ["EU"], "name": value})
+        assert "c.name = '\\'' OR 1=1 -- '" in postgresql
+    
+    def test_render_matches_generated_sql(self):
+        """Test that a query without slots renders to the generated SQL."""
+        path = FIXTURES_DIR / "select_complex" / "before.yql"
+        query = yql.compile(path, Dialect.MYSQL)
+        
+        assert isinstance(query, CompiledQuery)
+        assert query.render() == generate_sql(parse(path.read_text()), Dialect.MYSQL)
+    
+    def test_missing_parameter(self):
+        """Test that a slot without value or default is an error."""
+        with pytest.raises(ValueError, match="regions"):
+            yql.compile(YQL).render({"name": "x"})
+    
+    def test_bind(self):
+        """Test building driver arguments."""
+        query = yql.compile(YQL)
+        sql, args = query.bind({"regions": ["EU"], "name": "x"}, "named")
+        
+        assert "c.status = :status" in sql
+        assert args == {"status": "active", "regions": ["EU"], "name": "x"}
+        assert query.bind({"regions": [], "name": "y"})[1] == ["active", [], "y"]
+    
+    def test_pickle(self):
+        """Test that compiled queries survive pickling."""
+        query = yql.compile(YQL, Dialect.SQLSERVER)
+        query.bind({"regions": [], "name": "x"})
+        restored = pickle.loads(pickle.dumps(query))
+        
+        params = {"regions": ["EU"], "name": "x"}
+        assert restored.render(params) == query.render(params)
+        assert restored.bind(params) == query.bind(params)
@@ -33,3 +33,139 @@ class TestImportBasic:
         assert "c.status = premium" in sql or "c.status = 'premium'" in sql
         assert "o.amount >= 10000" in sql
 
+
+
+class TestImportCache:
+    """Import cache tests."""
+    
+    DEFINITION = """
+name: "recent_orders"
+select_definition:
+  select:
+    - id: o.id
+  from: { o: orders }
+  where:
+    - "o.created_at > NOW() - INTERVAL '1 day'"
+"""
+    
+    USAGE = """
+imports:
+  - "recent_orders"
+query:
+  with_clauses:
+    ro:
+      using: "recent_orders"
+  select:
+    - id: r.id
+  from: { r: ro }
+"""
+    
+    def test_shared_import_is_loaded_once(self, tmp_path, monkeypatch):
+        """Test that an unchanged import is served from the cache."""
+        from yql import ImportCache, parse
+        
+        (tmp_path / "recent_orders.yql").write_text(self.DEFINITION, encoding="utf-8")
+        cache = ImportCache()
+        monkeypatch.setattr("yql.parser._import_cache", cache)
+        
+        for _ in range(3):
+            parse(self.USAGE, base_path=tmp_path)
+        
+        stats = cache.stats()
+        assert stats.misses == 1
+        assert stats.hits == 2
+    
+    def test_changed_import_is_reloaded(self, tmp_path):
+        """Test that a modified import file is read again."""
+        from yql import ImportCache
+        
+        path = tmp_path / "recent_orders.yql"
+        path.write_text(self.DEFINITION, encoding="utf-8")
+        cache = ImportCache()
+        cache.load(path)
+        
+        path.write_text(self.DEFINITION.replace("1 day", "7 days"), encoding="utf-8")
+        data = cache.load(path)
+        
+        assert "7 days" in data["select_definition"]["where"][0]
+        assert cache.stats().misses == 2
+    
+    def test_memory_cap_evicts_lru(self, tmp_path):
+        """Test that the byte limit evicts least recently used files."""
+        from yql import ImportCache
+        
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"def_{i}.yql"
+            path.write_text(self.DEFINITION, encoding="utf-8")
+            paths.append(path)
+        size = paths[0].stat().st_size
+        cache = ImportCache(max_bytes=size * 2)
+        
+        for path in paths:
+            cache.load(path)
+        
+        stats = cache.stats()
+        assert stats.entries == 2
+        assert stats.evictions == 1
+        assert stats.bytes <= size * 2
+    
+    def test_limits_still_enforced_with_cache(self):
+        """Test that circular dependencies are detected on every parse."""
+        from yql.parser import ParseError
+        
+        for _ in range(2):
+            with pytest.raises(ParseError) as exc_info:
+                parse_file(FIXTURES_DIR / "test_circular_import_a" / "before.yql")
+            assert "Circular dependency" in exc_info.value.message
+
+
+class TestParameterTemplates:
+    """Tests for pre-tokenized parameter templates."""
+    
+    DEFINITION = {
+        "select": [{"id": "c.id"}, {"label": "#{label}"}],
+        "from": {"c": "customers"},
+        "where": [
+            "c.status = #{status} AND c.score > #{min_score}",
+            "c.region IN (${regions})",
+            "@{active_filter}",
+            "c.code = '#{#{status}}'",
+        ],
+        "limit": 10,
+    }
+    
+    @pytest.mark.parametrize("params", [
+        {"status": "active", "min_score": 10, "label": True},
+        {"status": None, "min_score": 1.5},
+        {"status": "#{min_score}", "min_score": 3},
+        {"status": "a{b", "label": "x"},
+        {"regions": ["a", "b"]},
+        {},
+    ])
+    def test_matches_sequential_replacement(self, params):
+        """Test that templates produce the same result as per-parameter replace."""
+        from yql.parser import _apply_parameters, _replace_parameters
+        
+        defaults = {"status": "pending", "min_score": 0}
+        expected = _replace_parameters(self.DEFINITION, {**defaults, **params})
+        
+        assert _apply_parameters(self.DEFINITION, params, defaults) == expected
+        # Second call uses the cached template
+        assert _apply_parameters(self.DEFINITION, params, defaults) == expected
+    
+    def test_template_is_cached_per_definition(self):
+        """Test that a definition is compiled once."""
+        from yql.parser import _get_template
+        
+        definition = {"where": ["x = #{value}"]}
+        assert _get_template(definition) is _get_template(definition)
+        assert _get_template(dict(definition)) is not _get_template(definition)
+    
+    def test_static_subtrees_are_shared(self):
+        """Test that parts without placeholders are not copied."""
+        from yql.parser import _apply_parameters
+        
+        result = _apply_parameters(self.DEFINITION, {"status": "active"})
+        assert result["from"] is self.DEFINITION["from"]
+        assert result["where"][0] == "c.status = 'active' AND c.score > #{min_score}"
@@ -83,3 +83,82 @@ query:
         assert "Too many imports" in error.message
         assert error.details["import_count"] == 11
 
+
+
+def _write_definition(directory: Path, name: str, imports: list[str] | None = None) -> None:
+    """Write a minimal import definition file."""
+    lines = [f'name: "{name}"']
+    if imports:
+        lines.append("imports:")
+        lines.extend(f'  - "{imp}"' for imp in imports)
+    lines.extend([
+        "select_definition:",
+        "  select:",
+        f"    - id: {name}.id",
+        f"  from: {{ {name}: {name}_table }}",
+    ])
+    (directory / f"{name}.yql").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class TestImportGraph:
+    """Tests for the import graph resolver."""
+    
+    def test_diamond_import_is_loaded_once(self, tmp_path):
+        """Test that a shared dependency reached twice is loaded once."""
+        from yql.parser import _load_imports
+        
+        # top -> left -> shared, top -> right -> shared
+        _write_definition(tmp_path, "shared")
+        _write_definition(tmp_path, "left", ["shared"])
+        _write_definition(tmp_path, "right", ["shared"])
+        
+        loaded_files = []
+        definitions = _load_imports(["left", "right"], tmp_path, loaded_files=loaded_files)
+        
+        assert list(definitions) == ["shared", "left", "right"]
+        assert [p.name for p in loaded_files] == ["shared.yql", "left.yql", "right.yql"]
+    
+    def test_topological_order(self, tmp_path):
+        """Test that dependencies come before the files that import them."""
+        from yql.parser import _load_imports
+        
+        _write_definition(tmp_path, "base")
+        _write_definition(tmp_path, "middle", ["base"])
+        _write_definition(tmp_path, "other")
+        
+        definitions = _load_imports(["other", "middle"], tmp_path)
+        
+        assert list(definitions) == ["other", "base", "middle"]
+    
+    def test_depth_checked_on_longest_path(self, tmp_path):
+        """Test that the depth limit applies to every path, not just the shortest."""
+        from yql.parser import _load_imports
+        
+        # root -> a -> b -> c -> d (too deep), root -> d directly
+        _write_definition(tmp_path, "e")
+        _write_definition(tmp_path, "d", ["e"])
+        _write_definition(tmp_path, "c", ["d"])
+        _write_definition(tmp_path, "b", ["c"])
+        _write_definition(tmp_path, "a", ["b"])
+        
+        with pytest.raises(ParseError) as exc_info:
+            _load_imports(["d", "a"], tmp_path)
+        
+        error = exc_info.value
+        assert "Import depth exceeds maximum" in error.message
+        assert error.details["depth"] == 3
+        assert error.details["file"].endswith("c.yql")
+    
+    def test_duplicate_name_from_different_files(self, tmp_path):
+        """Test that two different files with the same name are rejected."""
+        from yql.parser import _load_imports
+        
+        _write_definition(tmp_path, "first")
+        (tmp_path / "second.yql").write_text(
+            (tmp_path / "first.yql").read_text(encoding="utf-8"), encoding="utf-8",
+        )
+        
+        with pytest.raises(ParseError) as exc_info:
+            _load_imports(["first", "second"], tmp_path)
+        
+        assert exc_info.value.details["duplicate_name"] == "first"
@@ -0,0 +1,196 @@
+"""Tests for batched multi-row INSERT generation."""
+
+import pytest
+
+from tests.helpers import make_insert, numbered_rows
+from yql import (
+    BoundSQL,
+    Dialect,
+    RowSource,
+    SecurityConfig,
+    SecurityError,
+    generate_insert_batches,
+    generate_sql,
+    generate_upsert_batches,
+    parse,
+)
+from yql.ast import InsertQuery, OnConflictClause, OperationType, UpsertQuery, YQLQuery
+
+
+class TestRowLimits:
+    """Tests for row-based splitting."""
+    
+    def test_default_batch_size(self):
+        """Test that rows are split into statements of 1000 rows."""
+        batches = list(generate_insert_batches(make_insert(numbered_rows(2500))))
+        
+        assert len(batches) == 3
+        assert batches[0].startswith("INSERT INTO events\n(c0, c1)\nVALUES (0, 'v0'), ")
+        assert batches[2].endswith("(2499, 'v2499')")
+    
+    def test_max_rows(self):
+        """Test an explicit row limit."""
+        batches = list(generate_insert_batches(make_insert(numbered_rows(10)), max_rows=4))
+        
+        assert len(batches) == 3
+        assert batches[2] == "INSERT INTO events\n(c0, c1)\nVALUES (8, 'v8'), (9, 'v9')"
+    
+    def test_sqlserver_row_limit_is_a_cap(self):
+        """Test that SQL Server never exceeds 1000 rows per VALUES list."""
+        query = make_insert(numbered_rows(2000))
+        batches = list(generate_insert_batches(query, Dialect.SQLSERVER, max_rows=5000))
+        
+        assert len(batches) == 2
+    
+    def test_single_batch_matches_generate_sql(self):
+        """Test that a small INSERT yields the generate_sql() statement."""
+        query = make_insert(numbered_rows(3))
+        for dialect in (Dialect.POSTGRESQL, Dialect.MYSQL, Dialect.SQLSERVER):
+            assert list(generate_insert_batches(query, dialect)) == [generate_sql(query, dialect)]
+
+
+class TestSizeLimits:
+    """Tests for byte- and parameter-based splitting."""
+    
+    def test_max_bytes(self):
+        """Test that no statement exceeds max_bytes."""
+        query = make_insert(numbered_rows(500))
+        batches = list(generate_insert_batches(query, Dialect.MYSQL, max_bytes=2000))
+        
+        assert len(batches) > 1
+        assert all(len(sql.encode("utf-8")) <= 2000 for sql in batches)
+        rows = sum(sql.count("'v") for sql in batches)
+        assert rows == 500
+    
+    def test_mysql_default_packet_size(self):
+        """Test that MySQL batches stay within the default packet size."""
+        big = [{"id": i, "data": "x" * 10000} for i in range(1000)]
+        insert = InsertQuery(table="blobs", values=big)
+        query = YQLQuery(operation=OperationType.INSERT, insert_query=insert)
+        batches = list(generate_insert_batches(query, Dialect.MYSQL))
+        
+        assert len(batches) == 3
+        assert all(len(sql.encode("utf-8")) <= 4 * 1024 * 1024 for sql in batches)
+    
+    def test_sqlserver_parameter_limit(self):
+        """Test that bound SQL Server statements stay within 2100 parameters."""
+        query = make_insert(numbered_rows(1000, columns=3))
+        batches = list(generate_insert_batches(query, Dialect.SQLSERVER, bind_style="qmark"))
+        
+        assert all(isinstance(b, BoundSQL) for b in batches)
+        assert [len(b.params) for b in batches] == [2100, 900]
+        assert batches[1].bind()[:3] == [700, "v700", "v700"]
+    
+    def test_named_literals_numbered_per_statement(self):
+        """Test that each bound statement has its own literal names."""
+        query = make_insert(numbered_rows(4))
+        batches = list(generate_insert_batches(query, max_rows=2, bind_style="named"))
+        
+        assert batches[1].sql == (
+            "INSERT INTO events\n(c0, c1)\nVALUES (:lit1, :lit2), (:lit3, :lit4)"
+        )
+        assert batches[1].bind() == {"lit1": 2, "lit2": "v2", "lit3": 3, "lit4": "v3"}
+
+
+class TestDialects:
+    """Tests for dialect-specific statements."""
+    
+    def test_oracle_insert_all(self):
+        """Test that Oracle batches use INSERT ALL."""
+        query = make_insert(numbered_rows(3))
+        batches = list(generate_insert_batches(query, Dialect.ORACLE, max_rows=2))
+        
+        assert batches[0] == (
+            "INSERT ALL\n"
+            "  INTO events (c0, c1) VALUES (0, 'v0')\n"
+            "  INTO events (c0, c1) VALUES (1, 'v1')\n"
+            "SELECT * FROM DUAL"
+        )
+        assert len(batches) == 2
+    
+    def test_compact_and_returning(self):
+        """Test compact layout and RETURNING on every statement."""
+        query = make_insert(numbered_rows(3), returning=["id"])
+        batches = list(generate_insert_batches(query, max_rows=2, layout="compact"))
+        
+        assert batches == [
+            "INSERT INTO events (c0, c1) VALUES (0, 'v0'), (1, 'v1') RETURNING id",
+            "INSERT INTO events (c0, c1) VALUES (2, 'v2') RETURNING id",
+        ]
+    
+    def test_insert_select_is_one_statement(self):
+        """Test that INSERT ... SELECT is not split."""
+        query = parse("""
+operation: insert
+table: archive
+columns: [id]
+from_query:
+  select:
+    - id: o.id
+  from: { o: orders }
+""")
+        assert list(generate_insert_batches(query)) == [generate_sql(query)]
+    
+    def test_security_and_errors(self):
+        """Test validation of every statement and rejection of non-INSERT queries."""
+        config = SecurityConfig({"denied_tables": ["events"]})
+        with pytest.raises(SecurityError):
+            list(generate_insert_batches(make_insert(numbered_rows(3)), security_config=config))
+        
+        select = parse("query:\n  select: [{id: c.id}]\n  from: {c: customers}\n")
+        with pytest.raises(ValueError, match="requires an INSERT"):
+            generate_insert_batches(select)
+
+
+def make_upsert(values, **kwargs) -> YQLQuery:
+    return YQLQuery(
+        operation=OperationType.UPSERT,
+        upsert_query=UpsertQuery(table="events", values=values, match_on=["c0"], **kwargs),
+    )
+
+
+class TestUpsertBatches:
+    """Tests for chunked UPSERT generation."""
+    
+    def test_merge_chunks(self):
+        """Test that each chunk merges from its own rows."""
+        query = make_upsert(numbered_rows(5))
+        batches = list(
+            generate_upsert_batches(query, Dialect.SQLSERVER, max_rows=2, layout="compact")
+        )
+        
+        assert len(batches) == 3
+        assert batches[2].startswith(
+            "MERGE events AS target USING (VALUES (4, 'v4')) AS source (c0, c1)"
+        )
+        oracle = list(generate_upsert_batches(query, Dialect.ORACLE, max_rows=2))
+        assert [sql.count("FROM DUAL") for sql in oracle] == [2, 2, 1]
+    
+    def test_row_source_and_on_conflict(self):
+        """Test a generator source chunked into ON CONFLICT statements."""
+        rows = RowSource(((i, f"v{i}") for i in range(2500)), columns=["c0", "c1"])
+        on_conflict = OnConflictClause(target=["c0"], update={"c1": "EXCLUDED.c1"})
+        query = make_upsert(rows, on_conflict=on_conflict)
+        batches = list(generate_upsert_batches(query))
+        
+        assert len(batches) == 3
+        assert batches[2].startswith("INSERT INTO events\n(c0, c1)\nVALUES (2000, 'v2000'), ")
+        assert batches[2].endswith("ON CONFLICT (c0)\nDO UPDATE SET\n  c1 = EXCLUDED.c1")
+    
+    def test_sqlserver_parameter_limit(self):
+        """Test that bound MERGE chunks stay within 2100 parameters."""
+        query = make_upsert(numbered_rows(1000, columns=3))
+        batches = list(generate_upsert_batches(query, Dialect.SQLSERVER, bind_style="qmark"))
+        
+        assert [len(b.params) for b in batches] == [2100, 900]
+    
+    def test_single_statement_and_errors(self):
+        """Test queries that are not split and non-UPSERT queries."""
+        query = make_upsert([])
+        using = parse("query:\n  select: [{c0: s.c0}]\n  from: {s: staged}\n").select_query
+        query.upsert_query.using = using
+        batches = list(generate_upsert_batches(query, Dialect.SQLSERVER))
+        assert batches == [generate_sql(query, Dialect.SQLSERVER)]
+        
+        with pytest.raises(ValueError, match="requires an UPSERT"):
+            generate_upsert_batches(make_insert(numbered_rows(1)))
@@ -0,0 +1,119 @@
+"""Tests for compact SQL layout."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+import yql
+from yql import Dialect, QueryCache, generate_sql, iter_sql, parse, parse_file
+from yql.parser import ParseError
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+YQL = """
+query:
+  with_clauses:
+    recent:
+      select:
+        - id: o.id
+      from: { o: orders }
+      where:
+        - "o.created_at >= #{since}"
+        - "o.note <> 'a\\nb'"
+  select:
+    - id: r.id
+  from: { r: recent }
+  order_by:
+    - field: r.id
+  limit: 10
+  offset: 20
+"""
+
+
+def squeeze(sql: str) -> str:
+    """Collapse a pretty statement the way the compact layout writes it."""
+    sql = re.sub(r"\s+", " ", sql)
+    return sql.replace("( ", "(").replace(" )", ")")
+
+
+class TestCompactLayout:
+    """Tests for layout="compact"."""
+    
+    def test_fixtures_single_line(self):
+        """Test that compact SQL is the pretty SQL on one line for every dialect."""
+        checked = 0
+        for path in sorted(FIXTURES_DIR.glob("*/before.yql")):
+            try:
+                query = parse_file(path)
+            except ParseError:
+                continue
+            for dialect in Dialect:
+                try:
+                    pretty = generate_sql(query, dialect)
+                except (ValueError, NotImplementedError):
+                    continue
+                compact = generate_sql(query, dialect, layout="compact")
+                
+                assert "\n" not in compact
+                assert compact == squeeze(pretty)
+                checked += 1
+        assert checked > 0
+    
+    def test_nested_query(self):
+        """Test CTEs and Oracle ROW_NUMBER() pagination in compact layout."""
+        sql = generate_sql(parse(YQL), Dialect.ORACLE, layout="compact")
+        
+        assert sql.startswith(
+            "SELECT r.id AS id FROM "
+            "(SELECT r.id AS id, ROW_NUMBER() OVER (ORDER BY r.id ASC) AS rn FROM ("
+        )
+        assert "FROM (WITH recent AS (SELECT o.id AS id FROM orders o WHERE " in sql
+        assert sql.endswith(
+            "FROM recent r ORDER BY r.id ASC) subquery) WHERE rn > 20 AND rn <= (20 + 10)"
+        )
+    
+    def test_literal_newlines_kept(self):
+        """Test that newlines inside the YQL expressions are not rewritten."""
+        sql = generate_sql(parse(YQL), Dialect.POSTGRESQL, layout="compact")
+        
+        assert "o.note <> 'a\nb'" in sql
+        assert sql.count("\n") == 1
+    
+    def test_bind_and_streaming(self):
+        """Test that compact layout combines with bind mode and streaming."""
+        query = parse(YQL)
+        bound = generate_sql(query, Dialect.POSTGRESQL, bind_style="qmark", layout="compact")
+        
+        assert bound.sql.startswith("WITH recent AS (SELECT")
+        streamed = "".join(iter_sql(query, layout="compact", chunk_size=8))
+        assert streamed == generate_sql(query, layout="compact")
+        assert yql.compile(query, layout="compact").render({"since": "2024-01-01"}).count("\n") == 1
+    
+    def test_cached_separately(self):
+        """Test that the query cache keeps one entry per layout."""
+        cache = QueryCache()
+        pretty = cache.get_or_generate(YQL)
+        compact = cache.get_or_generate(YQL, layout="compact")
+        
+        assert pretty != compact
+        assert len(cache) == 2
+        assert cache.get_or_generate(YQL, layout="compact") == compact
+    
+    def test_multi_column_update(self):
+        """Test that every column of ON CONFLICT DO UPDATE is written."""
+        query = parse("""
+operation: upsert
+table: t
+values: [{a: 1, b: 2, c: 3}]
+on_conflict: {target: [a], update: {b: EXCLUDED.b, c: EXCLUDED.c}}
+""")
+        
+        assert generate_sql(query).endswith("DO UPDATE SET\n  b = EXCLUDED.b,\n  c = EXCLUDED.c")
+        compact = generate_sql(query, layout="compact")
+        assert compact.endswith("DO UPDATE SET b = EXCLUDED.b, c = EXCLUDED.c")
+    
+    def test_invalid_layout(self):
+        """Test that an unknown layout is rejected."""
+        with pytest.raises(ValueError, match="Unsupported layout"):
+            generate_sql(parse(YQL), layout="minified")
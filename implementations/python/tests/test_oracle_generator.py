@@ -210,3 +210,72 @@ where:
         assert "DELETE FROM customers" in sql
         assert "WHERE status = 'deleted'" in sql
 
+
+class TestOracleMergeFromValues:
+    """Test MERGE from UPSERT values for Oracle."""
+    
+    def test_dual_source(self):
+        """Test a UNION ALL of SELECT ... FROM DUAL rows."""
+        yql = """
+operation: upsert
+table: users
+values:
+  - {id: 1, name: a}
+  - {id: 2, name: b}
+match_on: [id]
+"""
+        query = parse(yql)
+        
+        assert generate_sql(query, Dialect.ORACLE) == (
+            "MERGE INTO users target\n"
+            "USING (SELECT 1 AS id, 'a' AS name FROM DUAL\n"
+            "UNION ALL\n"
+            "SELECT 2, 'b' FROM DUAL) source\n"
+            "ON (target.id = source.id)\n"
+            "WHEN MATCHED THEN\n"
+            "  UPDATE SET\n"
+            "    name = source.name\n"
+            "WHEN NOT MATCHED THEN\n"
+            "  INSERT (id, name)\n"
+            "  VALUES (source.id, source.name)"
+        )
+        assert generate_sql(query, Dialect.ORACLE, layout="compact").startswith(
+            "MERGE INTO users target USING (SELECT 1 AS id, 'a' AS name FROM DUAL "
+            "UNION ALL SELECT 2, 'b' FROM DUAL) source ON (target.id = source.id)"
+        )
+    
+    def test_bound_literals(self):
+        """Test that DUAL rows bind their literals in row order."""
+        yql = """
+operation: upsert
+table: users
+values:
+  - {id: 1, name: a}
+  - {id: 2, name: b}
+match_on: [id, name]
+"""
+        bound = generate_sql(parse(yql), Dialect.ORACLE, bind_style="named")
+        
+        assert (
+            "USING (SELECT :lit1 AS id, :lit2 AS name FROM DUAL\nUNION ALL\nSELECT :lit3, :lit4 FROM DUAL)"
+        ) in bound.sql
+        assert "WHEN MATCHED" not in bound.sql
+        assert bound.bind() == {"lit1": 1, "lit2": "a", "lit3": 2, "lit4": "b"}
+    
+    def test_values_by_column_name(self):
+        """Test that row values are placed by column name, not key order."""
+        yql = """
+operation: upsert
+table: users
+values:
+  - {id: 1, name: a}
+  - {name: b, id: 2}
+  - {id: 3}
+match_on: [id]
+"""
+        sql = generate_sql(parse(yql), Dialect.ORACLE, layout="compact")
+        
+        assert (
+            "USING (SELECT 1 AS id, 'a' AS name FROM DUAL UNION ALL SELECT 2, 'b' FROM DUAL "
+            "UNION ALL SELECT 3, NULL FROM DUAL) source"
+        ) in sql
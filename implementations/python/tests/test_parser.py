@@ -2,8 +2,9 @@
 
 import pytest
 
-from yql import parse
+from yql import parse, parse_file, parse_obj
 from yql.ast import JoinType, OperationType, SortDirection
+from yql.parser import ParseError
 
 
 class TestParseBasic:
@@ -267,3 +268,246 @@ query:
         assert result.query.with_clauses[0].name == "active_customers"
         assert result.query.with_clauses[0].query is not None
 
+
+
+class TestYamlBackend:
+    """YAML loader backend tests."""
+    
+    def test_backend_is_reported(self):
+        """Test that the active YAML backend is exposed."""
+        import yaml
+        
+        from yql import yaml_backend
+        
+        expected = "libyaml" if getattr(yaml, "__with_libyaml__", False) else "python"
+        assert yaml_backend() == expected
+    
+    def test_yaml_error_category_unchanged(self):
+        """Test that YAML syntax errors keep the same ParseError category."""
+        from yql.parser import ParseError
+        
+        with pytest.raises(ParseError) as exc_info:
+            parse("query: [unclosed")
+        
+        assert exc_info.value.category == "syntax_error"
+        assert exc_info.value.message.startswith("YAML parse error:")
+    
+    @pytest.mark.parametrize("loader", ["CSafeLoader", "SafeLoader"])
+    def test_yaml_error_snippet(self, loader, monkeypatch):
+        """Test that both loaders report the position with a snippet and caret.
+        
+        The problem wording comes from each loader's scanner and may differ.
+        """
+        import yaml
+        
+        from yql import parser
+        
+        if not hasattr(yaml, loader):
+            pytest.skip("PyYAML was built without libyaml")
+        monkeypatch.setattr(parser, "_SafeLoader", getattr(yaml, loader))
+        
+        with pytest.raises(parser.ParseError) as exc_info:
+            parse("query:\n  select: [a\n  from: x\n")
+        
+        message = exc_info.value.message
+        assert message.startswith("YAML parse error: while parsing a flow sequence\n")
+        assert 'line 2, column 11:\n      select: [a\n              ^\n' in message
+        assert message.endswith('line 3, column 7:\n      from: x\n          ^')
+
+
+class TestIterParse:
+    """Multi-document streaming parser tests."""
+    
+    STREAM = """\
+select:
+  - id: c.id
+from: { c: customers }
+---
+# second query
+select:
+  - id: o.id
+from: { o: orders }
+---
+---
+operation: delete
+table: sessions
+where:
+  - "expired = TRUE"
+"""
+    
+    def test_iter_parse_documents(self):
+        """Test that each document yields one query."""
+        from yql import iter_parse
+        
+        queries = list(iter_parse(self.STREAM))
+        
+        assert len(queries) == 3
+        assert queries[0].select_query.from_clause.table == "customers"
+        assert queries[1].select_query.from_clause.table == "orders"
+        assert queries[2].operation == OperationType.DELETE
+    
+    def test_iter_parse_is_lazy(self):
+        """Test that documents are parsed as the stream is consumed."""
+        import io
+        
+        from yql import iter_parse
+        
+        stream = io.StringIO(self.STREAM)
+        first = next(iter_parse(stream))
+        
+        assert first.select_query.from_clause.table == "customers"
+        assert stream.tell() < len(self.STREAM)
+    
+    def test_directives_stay_with_their_document(self):
+        """Test that %YAML/%TAG lines do not form documents of their own."""
+        from yql import iter_parse
+        
+        stream = (
+            "%YAML 1.1\n---\nselect: [{id: c.id}]\nfrom: { c: customers }\n...\n"
+            "%TAG !y! tag:yql,2024:\n# orders\n---\n" + self.STREAM
+        )
+        queries = list(iter_parse(stream))
+        
+        assert len(queries) == 4
+        tables = [q.select_query.from_clause.table for q in queries[:3]]
+        assert tables == ["customers", "customers", "orders"]
+    
+    def test_error_reports_document_index(self):
+        """Test that errors carry the document index and start line."""
+        from yql import iter_parse
+        from yql.parser import ParseError
+        
+        stream = self.STREAM.replace("from: { o: orders }", "from: [unclosed")
+        with pytest.raises(ParseError) as exc_info:
+            list(iter_parse(stream))
+        
+        error = exc_info.value
+        assert error.category == "syntax_error"
+        assert error.details["document_index"] == 1
+        assert error.details["line"] == 4
+        assert error.message.startswith("Document 1 (line 4):")
+    
+    def test_continue_past_bad_documents(self):
+        """Test that on_error allows parsing to continue."""
+        from yql import iter_parse
+        
+        stream = self.STREAM.replace("from: { o: orders }", "from: [unclosed")
+        errors = []
+        queries = list(iter_parse(stream, on_error=errors.append))
+        
+        assert len(queries) == 2
+        assert [e.details["document_index"] for e in errors] == [1]
+    
+    def test_iter_parse_file(self, tmp_path):
+        """Test parsing a multi-document file."""
+        from yql import iter_parse_file
+        
+        path = tmp_path / "queries.yql"
+        path.write_text(self.STREAM, encoding="utf-8")
+        
+        assert len(list(iter_parse_file(path))) == 3
+
+
+class TestCompactAST:
+    """Tests for the compact AST representation."""
+    
+    YQL = """
+query:
+  select:
+    - id: c.id
+  from: { c: customers }
+  where:
+    - "c.status = 'active'"
+"""
+    
+    def test_nodes_have_no_dict(self):
+        """Test that AST nodes are slotted."""
+        result = parse(self.YQL)
+        
+        assert not hasattr(result, "__dict__")
+        assert not hasattr(result.select_query.from_clause, "__dict__")
+    
+    def test_identifiers_are_interned(self):
+        """Test that identical identifiers and conditions share one object."""
+        first = parse(self.YQL).select_query
+        second = parse(self.YQL).select_query
+        
+        assert first.from_clause.table is second.from_clause.table
+        assert first.where[0] is second.where[0]
+    
+    def test_keep_raw(self):
+        """Test dropping the raw YAML data."""
+        assert parse(self.YQL).raw["query"]["from"] == {"c": "customers"}
+        
+        result = parse(self.YQL, keep_raw=False)
+        assert result.raw == {}
+        assert result.select_query == parse(self.YQL).select_query
+
+
+class TestJsonInput:
+    """Tests for JSON input."""
+    
+    YAML = """
+query:
+  select:
+    - id: c.id
+  from: { c: customers }
+  joins:
+    - type: LEFT
+      alias: o
+      table: orders
+      on: "c.id = o.customer_id"
+  where:
+    - "c.status = 'active'"
+"""
+    
+    DATA = {
+        "query": {
+            "select": [{"id": "c.id"}],
+            "from": {"c": "customers"},
+            "joins": [
+                {"type": "LEFT", "alias": "o", "table": "orders", "on": "c.id = o.customer_id"},
+            ],
+            "where": ["c.status = 'active'"],
+        }
+    }
+    
+    def test_json_detected(self):
+        """Test that JSON input produces the same AST as YAML."""
+        import json
+        
+        result = parse(json.dumps(self.DATA))
+        assert result.select_query == parse(self.YAML).select_query
+        assert result.raw == self.DATA
+    
+    def test_yaml_flow_mapping_falls_back(self):
+        """Test that YAML starting with '{' is still parsed as YAML."""
+        result = parse("{query: {select: [{id: c.id}], from: {c: customers}}}")
+        assert result.select_query.from_clause.table == "customers"
+    
+    def test_explicit_json_error(self):
+        """Test that format='json' reports JSON errors."""
+        with pytest.raises(ParseError, match="JSON parse error"):
+            parse("{query: {}}", format="json")
+    
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Unsupported format"):
+            parse(self.YAML, format="toml")
+    
+    def test_json_file(self, tmp_path):
+        """Test that .json files are parsed as JSON."""
+        import json
+        
+        path = tmp_path / "query.json"
+        path.write_text(json.dumps(self.DATA), encoding="utf-8")
+        assert parse_file(path).select_query == parse(self.YAML).select_query
+    
+    def test_parse_obj(self):
+        """Test parsing an already decoded structure."""
+        result = parse_obj(self.DATA)
+        
+        assert result.select_query == parse(self.YAML).select_query
+        assert result.raw is self.DATA
+        with pytest.raises(ParseError):
+            parse_obj(["not", "a", "mapping"])
@@ -0,0 +1,228 @@
+"""Tests for lazy row sources."""
+
+import io
+from datetime import date
+
+import pytest
+
+from tests.helpers import make_insert
+from yql import (
+    Dialect,
+    RowSource,
+    generate_insert_batches,
+    generate_sql,
+    generate_sql_to,
+    iter_sql,
+    parse,
+)
+from yql.generator.postgresql import PostgreSQLGenerator
+from yql.parser import ParseError
+from yql.serialize import dumps, loads
+
+
+class TestRowSource:
+    """Tests for RowSource inputs."""
+    
+    def test_tuples_match_dicts(self):
+        """Test that tuple rows generate the same SQL as row dicts."""
+        dicts = [{"id": 1, "name": "a"}, {"id": 2, "name": None}]
+        source = RowSource([(1, "a"), (2, None)], columns=["id", "name"])
+        
+        assert generate_sql(make_insert(source)) == generate_sql(make_insert(dicts))
+    
+    def test_mapping_rows(self):
+        """Test column inference from mappings and NULL for missing keys."""
+        source = RowSource(iter([{"id": 1, "name": "a"}, {"id": 2}]))
+        
+        assert source.columns == ["id", "name"]
+        assert generate_sql(make_insert(source)) == (
+            "INSERT INTO events\n(id, name)\nVALUES (1, 'a'), (2, NULL)"
+        )
+    
+    def test_dict_rows_by_column_name(self):
+        """Test that dict rows are placed by column name, with NULL for missing keys."""
+        query = make_insert([{"id": 1, "name": "a"}, {"name": "b", "id": 2}, {"id": 3}])
+        expected = "INSERT INTO events\n(id, name)\nVALUES (1, 'a'), (2, 'b'), (3, NULL)"
+        
+        assert generate_sql(query) == expected
+        assert list(generate_insert_batches(query)) == [expected]
+        assert generate_sql(query, bind_style="qmark").bind() == [1, "a", 2, "b", 3]
+    
+    def test_iterator_consumed_once(self):
+        """Test that a source over a generator can only be generated once."""
+        source = RowSource(((i, f"u{i}") for i in range(3)), columns=["id", "name"])
+        generate_sql(make_insert(source))
+        
+        with pytest.raises(ValueError, match="only be consumed once"):
+            generate_sql(make_insert(source))
+    
+    def test_invalid_rows(self):
+        """Test missing columns and rows of the wrong width."""
+        with pytest.raises(ValueError, match="needs 'columns'"):
+            RowSource([(1, "a")])
+        
+        source = RowSource([(1, "a"), (2,)], columns=["id", "name"])
+        with pytest.raises(ValueError, match="expected 2"):
+            generate_sql(make_insert(source))
+    
+    def test_upsert_values(self):
+        """Test a row source as UPSERT values."""
+        upsert = parse("""
+operation: upsert
+table: users
+values:
+  - id: 1
+    name: a
+on_conflict:
+  target: [id]
+  update:
+    name: EXCLUDED.name
+""")
+        expected = generate_sql(upsert)
+        upsert.upsert_query.values = RowSource([(1, "a")], columns=["id", "name"])
+        
+        assert generate_sql(upsert) == expected
+
+
+class TestStreaming:
+    """Tests that rows are read while SQL is produced."""
+    
+    def test_rows_read_lazily(self):
+        """Test that iter_sql() pulls rows as chunks are consumed."""
+        read = []
+        
+        def rows():
+            for i in range(10000):
+                read.append(i)
+                yield (i, "x" * 20)
+        
+        chunks = iter_sql(make_insert(RowSource(rows(), columns=["id", "data"])), chunk_size=1024)
+        next(chunks)
+        
+        assert 0 < len(read) < 100
+        assert sum(len(chunk) for chunk in chunks) > 200000
+        assert len(read) == 10000
+    
+    def test_batches_from_generator(self):
+        """Test batching a generator source."""
+        source = RowSource(((i, f"u{i}") for i in range(2500)), columns=["id", "name"])
+        batches = list(generate_insert_batches(make_insert(source), Dialect.SQLSERVER))
+        
+        assert len(batches) == 3
+        assert batches[2].endswith("(2499, 'u2499')")
+    
+    def test_empty_source_has_no_batches(self):
+        """Test that an empty row source yields no statements."""
+        source = RowSource(iter([]), columns=["id"])
+        
+        assert list(generate_insert_batches(make_insert(source))) == []
+
+
+class TestCSV:
+    """Tests for CSV row sources and values_from."""
+    
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        path = tmp_path / "users.csv"
+        path.write_text("id,name\n1,alice\n\n2,\n", encoding="utf-8")
+        return path
+    
+    def test_from_csv(self, csv_path):
+        """Test header columns, blank lines and the null marker."""
+        source = RowSource.from_csv(csv_path, null_value="")
+        
+        assert source.columns == ["id", "name"]
+        assert list(source) == [("1", "alice"), ("2", None)]
+        assert list(source) == [("1", "alice"), ("2", None)]
+    
+    def test_values_from(self, csv_path):
+        """Test values_from relative to the YQL file."""
+        yql_path = csv_path.parent / "load.yql"
+        yql_path.write_text(
+            "operation: insert\ntable: users\nvalues_from:\n  path: users.csv\n  null_value: ''\n"
+        )
+        query = parse(yql_path.read_text(), base_path=yql_path.parent)
+        
+        out = io.StringIO()
+        generate_sql_to(out, query, Dialect.MYSQL)
+        assert out.getvalue() == "INSERT INTO users\n(id, name)\nVALUES ('1', 'alice'), ('2', NULL)"
+    
+    def test_values_from_errors(self, tmp_path):
+        """Test missing files and unknown options."""
+        with pytest.raises(ParseError, match="Cannot read values_from"):
+            parse("operation: insert\ntable: users\nvalues_from: missing.csv\n", base_path=tmp_path)
+        with pytest.raises(ParseError, match="Unknown values_from options: quote"):
+            yql = "operation: insert\ntable: users\nvalues_from: {path: a.csv, quote: x}\n"
+            parse(yql, base_path=tmp_path)
+    
+    def test_serialize(self, csv_path):
+        """Test that CSV sources round-trip and in-memory sources are rejected."""
+        query = make_insert(RowSource.from_csv(csv_path, null_value=""))
+        
+        assert generate_sql(loads(dumps(query))) == generate_sql(query)
+        with pytest.raises(TypeError, match="in-memory rows"):
+            dumps(make_insert(RowSource([(1,)], columns=["id"])))
+
+
+COLUMNS = {
+    "id": [1, 2, 3, 4],
+    "score": [1.5, None, -2.0, 3],
+    "name": ["a", "#{name}", None, "it's"],
+    "active": [True, False, None, True],
+    "mixed": [date(2024, 1, 1), 1, "x", False],
+}
+
+
+def as_dicts(columns: dict) -> list[dict]:
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+class TestColumnar:
+    """Tests for column-oriented sources."""
+    
+    def test_matches_row_dicts(self):
+        """Test that columnar formatting matches row dicts in every dialect."""
+        source = RowSource.from_columns(COLUMNS)
+        for dialect in Dialect:
+            expected = generate_sql(make_insert(as_dicts(COLUMNS)), dialect)
+            assert generate_sql(make_insert(source), dialect) == expected
+    
+    def test_format_column_matches_format_value(self):
+        """Test each column formatter against _format_value."""
+        generator = PostgreSQLGenerator()
+        for values in [*COLUMNS.values(), [], [None, None], ["${tag}", "@{macro}", ""]]:
+            assert generator._format_column(values) == [generator._format_value(v) for v in values]
+    
+    def test_bind_and_batches(self):
+        """Test bound literals in row order and batching of a columnar source."""
+        source = RowSource.from_columns(COLUMNS, columns=["id", "name"])
+        rows = as_dicts({"id": COLUMNS["id"], "name": COLUMNS["name"]})
+        
+        bound = generate_sql(make_insert(source), bind_style="qmark")
+        assert bound == generate_sql(make_insert(rows), bind_style="qmark")
+        assert bound.bind({"name": "b"}) == [1, "a", 2, "b", 3, 4, "it's"]
+        
+        batches = list(generate_insert_batches(make_insert(source), max_rows=3))
+        assert batches == list(generate_insert_batches(make_insert(rows), max_rows=3))
+        assert len(batches) == 2
+    
+    def test_invalid_columns(self):
+        """Test columns of different lengths and unsupported data."""
+        with pytest.raises(ValueError, match="differ in length"):
+            RowSource.from_columns({"id": [1, 2], "name": ["a"]})
+        with pytest.raises(ValueError, match="mapping or a NumPy array"):
+            RowSource.from_columns([[1, 2]])
+    
+    def test_numpy(self):
+        """Test 2-D and structured NumPy arrays."""
+        np = pytest.importorskip("numpy")
+        array = np.array([[1, 2], [3, 4]], dtype=np.int64)
+        dtype = [("id", "i8"), ("ratio", "f8"), ("ok", "?")]
+        records = np.array([(1, 0.5, True), (2, 1.0, False)], dtype=dtype)
+        
+        with pytest.raises(ValueError, match="needs 'columns'"):
+            RowSource.from_columns(array)
+        sql = generate_sql(make_insert(RowSource.from_columns(array, columns=["a", "b"])))
+        assert sql.endswith("VALUES (1, 2), (3, 4)")
+        sql = generate_sql(make_insert(RowSource.from_columns(records)))
+        assert sql == "INSERT INTO events\n(id, ratio, ok)\nVALUES (1, 0.5, TRUE), (2, 1.0, FALSE)"
@@ -132,6 +132,48 @@ where:
         error = exc_info.value
         assert "customers" in error.message
     
+    def test_upsert_update_clause_validation(self):
+        """Test that DO UPDATE SET / ON DUPLICATE KEY UPDATE are not read as tables."""
+        yql_content = """
+operation: upsert
+table: customers
+values:
+  - id: 1
+    name: John
+on_conflict:
+  target: [id]
+  update:
+    name: EXCLUDED.name
+on_duplicate_key:
+  update:
+    name: VALUES(name)
+"""
+        query = parse(yql_content)
+        
+        config = SecurityConfig({"allowed_tables": ["customers"]})
+        generate_sql(query, Dialect.POSTGRESQL, security_config=config)
+        generate_sql(query, Dialect.MYSQL, security_config=config)
+    
+    def test_merge_target_validation(self):
+        """Test the target of a MERGE from values (no FROM names the target)."""
+        yql_content = """
+operation: upsert
+table: customers
+values:
+  - id: 1
+    name: John
+match_on: [id]
+"""
+        query = parse(yql_content)
+        
+        denied = SecurityConfig({"denied_tables": ["customers"]})
+        allowed = SecurityConfig({"allowed_tables": ["customers"]})
+        for dialect in (Dialect.SQLSERVER, Dialect.ORACLE):
+            with pytest.raises(SecurityError, match="customers"):
+                generate_sql(query, dialect, security_config=denied)
+            # The target/source aliases are not taken for tables
+            generate_sql(query, dialect, security_config=allowed)
+    
     def test_security_config_from_file(self, tmp_path):
         """Test loading security config from file."""
         config_file = tmp_path / "security.yaml"
@@ -0,0 +1,120 @@
+"""Tests for binary AST serialization."""
+
+import io
+import marshal
+import struct
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from yql import Dialect, generate_sql, parse, parse_file
+from yql.serialize import dump, dumps, load, loads
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+
+def _fixture_queries():
+    queries = []
+    for path in sorted(FIXTURES_DIR.glob("*/before.yql")):
+        try:
+            queries.append(pytest.param(parse_file(path), id=path.parent.name))
+        except Exception:
+            # Fixtures for parse errors
+            continue
+    return queries
+
+
+class TestRoundTrip:
+    """Round-trip tests."""
+    
+    @pytest.mark.parametrize("query", _fixture_queries())
+    def test_fixture_round_trip(self, query):
+        """Test that every fixture round-trips losslessly."""
+        restored = loads(dumps(query))
+        
+        assert restored == query
+        assert restored.raw == query.raw
+        for dialect in Dialect:
+            try:
+                expected = generate_sql(query, dialect)
+            except (ValueError, NotImplementedError):
+                continue
+            assert generate_sql(restored, dialect) == expected
+    
+    def test_catalog(self):
+        """Test serializing a dict of queries."""
+        catalog = {
+            "simple": parse_file(FIXTURES_DIR / "simple_select" / "before.yql"),
+            "complex": parse_file(FIXTURES_DIR / "select_complex" / "before.yql"),
+        }
+        buffer = io.BytesIO()
+        dump(catalog, buffer)
+        buffer.seek(0)
+        
+        assert load(buffer) == catalog
+    
+    def test_non_plain_values(self):
+        """Test dates and other YAML scalar types in values."""
+        query = parse("""
+operation: insert
+table: events
+values:
+  - {id: 1, day: 2024-01-02, at: 2024-01-02 03:04:05, ratio: 0.5, flag: true, note: null}
+""")
+        restored = loads(dumps(query))
+        
+        row = restored.insert_query.values[0]
+        assert row["day"] == date(2024, 1, 2)
+        assert row["at"] == datetime(2024, 1, 2, 3, 4, 5)
+        assert restored == query
+    
+    def test_binary_values(self):
+        """Test YAML !!binary values."""
+        query = parse("""
+operation: insert
+table: files
+values:
+  - {id: 1, data: !!binary aGVsbG8=}
+""")
+        restored = loads(dumps(query))
+        
+        assert restored.insert_query.values[0]["data"] == b"hello"
+        assert restored == query
+
+
+class TestFormat:
+    """Tests for format validation."""
+    
+    def test_bad_magic(self):
+        """Test that foreign data is rejected."""
+        with pytest.raises(ValueError, match="magic"):
+            loads(b"not a yql ast at all")
+    
+    def test_version_mismatch(self):
+        """Test that data from another format version is rejected."""
+        data = bytearray(dumps(parse("select:\n  - id: t.id\nfrom: { t: t }\n")))
+        struct.pack_into(">H", data, 4, 999)
+        
+        with pytest.raises(ValueError, match="version 999"):
+            loads(bytes(data))
+    
+    @pytest.mark.parametrize("payload", [(99,), (-1, 7, "x"), (-99, 1), (0, *range(20))])
+    def test_corrupt_payload(self, payload):
+        """Test that unknown tags and malformed nodes raise ValueError."""
+        header = dumps(None)[:7]
+        
+        with pytest.raises(ValueError, match="Corrupt YQL binary AST \\(format version"):
+            loads(header + marshal.dumps(payload))
+    
+    def test_truncated_payload(self):
+        """Test that a truncated payload raises ValueError."""
+        data = dumps(parse("select:\n  - id: t.id\nfrom: { t: t }\n"))
+        
+        with pytest.raises(ValueError, match="Corrupt"):
+            loads(data[:-5])
+    
+    def test_unsupported_type(self):
+        """Test that unknown objects are rejected on dump."""
+        with pytest.raises(TypeError):
+            dumps(object())
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from yql import parse_file, generate_sql, Dialect
+from yql import parse, parse_file, generate_sql, Dialect
 
 # Fixture directory (shared across implementations)
 FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
@@ -83,3 +83,72 @@ class TestSQLServerGenerateJoin:
         expected_sql = (FIXTURES_DIR / "select_with_join" / "sqlserver.sql").read_text().strip()
         assert sql.strip() == expected_sql
 
+
+class TestSQLServerMergeFromValues:
+    """SQL Server MERGE from UPSERT values tests."""
+    
+    def test_values_source(self):
+        """Test a VALUES table constructor source with default actions."""
+        yql = """
+operation: upsert
+table: users
+values:
+  - {id: 1, name: a}
+  - {id: 2, name: null}
+match_on: [id]
+"""
+        sql = generate_sql(parse(yql), Dialect.SQLSERVER)
+        
+        assert sql == (
+            "MERGE users AS target\n"
+            "USING (VALUES (1, 'a'), (2, NULL)) AS source (id, name)\n"
+            "ON target.id = source.id\n"
+            "WHEN MATCHED THEN\n"
+            "  UPDATE SET\n"
+            "    name = source.name\n"
+            "WHEN NOT MATCHED THEN\n"
+            "  INSERT (id, name)\n"
+            "  VALUES (source.id, source.name);"
+        )
+    
+    def test_values_source_with_actions(self):
+        """Test that declared actions replace the defaults."""
+        yql = """
+operation: upsert
+table: users
+values:
+  - {id: 1, name: a}
+match_on: [id]
+when_not_matched:
+  insert:
+    id: source.id
+    name: source.name
+"""
+        sql = generate_sql(parse(yql), Dialect.SQLSERVER, layout="compact")
+        
+        assert sql == (
+            "MERGE users AS target USING (VALUES (1, 'a')) AS source (id, name) "
+            "ON target.id = source.id "
+            "WHEN NOT MATCHED THEN INSERT (id, name) VALUES (source.id, source.name);"
+        )
+    
+    def test_values_by_column_name(self):
+        """Test that row values are placed by column name, not key order."""
+        yql = """
+operation: upsert
+table: users
+values:
+  - {id: 1, name: a}
+  - {name: b, id: 2}
+  - {id: 3}
+match_on: [id]
+"""
+        sql = generate_sql(parse(yql), Dialect.SQLSERVER, layout="compact")
+        
+        assert "USING (VALUES (1, 'a'), (2, 'b'), (3, NULL)) AS source (id, name)" in sql
+    
+    def test_requires_source(self):
+        """Test that MERGE needs 'using' or 'values'."""
+        with pytest.raises(ValueError, match="requires 'using' \\(or 'values'\\)"):
+            query = parse("operation: upsert\ntable: users\nmatch_on: [id]\n")
+            generate_sql(query, Dialect.SQLSERVER)
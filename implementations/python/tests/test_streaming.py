@@ -0,0 +1,127 @@
+"""Tests for streaming SQL output."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from tests.helpers import make_insert
+from yql import (
+    Dialect,
+    SecurityConfig,
+    SecurityError,
+    generate_sql,
+    generate_sql_to,
+    iter_sql,
+    parse,
+    parse_file,
+)
+
+FIXTURES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures"
+
+class CountingValue:
+    """Value that counts how often it is formatted."""
+    
+    formatted = 0
+    
+    def __str__(self) -> str:
+        CountingValue.formatted += 1
+        return "1"
+
+
+class TestIterSQL:
+    """Tests for iter_sql()."""
+    
+    def test_matches_generate_sql(self):
+        """Test that the chunks concatenate to the generate_sql() output."""
+        for path in sorted(FIXTURES_DIR.glob("*/before.yql")):
+            try:
+                query = parse_file(path)
+            except Exception:
+                continue
+            for dialect in Dialect:
+                try:
+                    expected = generate_sql(query, dialect)
+                except (ValueError, NotImplementedError):
+                    continue
+                assert "".join(iter_sql(query, dialect, chunk_size=16)) == expected
+    
+    def test_chunk_size(self):
+        """Test that a large INSERT is split into chunks of about chunk_size."""
+        query = make_insert([{"id": i, "name": f"event {i}"} for i in range(2000)])
+        chunks = list(iter_sql(query, chunk_size=1024))
+        
+        assert len(chunks) > 10
+        assert all(len(chunk) < 1100 for chunk in chunks)
+        assert "".join(chunks) == generate_sql(query)
+    
+    def test_rows_are_formatted_lazily(self):
+        """Test that rows are formatted only as the chunks are consumed."""
+        CountingValue.formatted = 0
+        query = make_insert([{"id": CountingValue()} for _ in range(10000)])
+        
+        chunks = iter_sql(query, chunk_size=1024)
+        assert CountingValue.formatted == 0
+        next(chunks)
+        assert 0 < CountingValue.formatted < 1000
+    
+    def test_unsupported_dialect(self):
+        """Test that an unknown dialect fails before iteration."""
+        with pytest.raises(ValueError, match="Unsupported dialect"):
+            iter_sql(make_insert([{"id": 1}]), "sqlite")
+
+
+class TestGenerateSQLTo:
+    """Tests for generate_sql_to()."""
+    
+    def test_text_sink(self):
+        """Test writing to a text stream."""
+        query = make_insert([{"id": i} for i in range(100)])
+        sink = io.StringIO()
+        
+        written = generate_sql_to(sink, query, Dialect.MYSQL, chunk_size=64)
+        
+        assert sink.getvalue() == generate_sql(query, Dialect.MYSQL)
+        assert written == len(sink.getvalue())
+    
+    def test_binary_sink(self):
+        """Test writing encoded chunks to a binary stream."""
+        query = make_insert([{"name": "café"}])
+        sink = io.BytesIO()
+        
+        generate_sql_to(sink, query, encoding="utf-8")
+        
+        assert sink.getvalue().decode("utf-8") == generate_sql(query)
+    
+    def test_security_violation_is_not_written(self):
+        """Test that SQL using a denied table is rejected before it is written."""
+        query = parse("""
+query:
+  select:
+    - id: s.id
+  from: { s: secrets }
+""")
+        config = SecurityConfig({"denied_tables": ["secrets"]})
+        sink = io.StringIO()
+        
+        with pytest.raises(SecurityError):
+            generate_sql_to(sink, query, security_config=config, chunk_size=4)
+        assert "secrets" not in sink.getvalue()
+
+
+class TestValidateSQLChunks:
+    """Tests for SecurityConfig.validate_sql_chunks()."""
+    
+    def test_reference_split_across_chunks(self):
+        """Test that a table name split across chunks is validated as a whole."""
+        config = SecurityConfig({"denied_tables": ["secret_table"]})
+        
+        with pytest.raises(SecurityError):
+            list(config.validate_sql_chunks(["SELECT * FROM secr", "et_table", " WHERE id = 1;"]))
+    
+    def test_partial_name_is_not_rejected(self):
+        """Test that a prefix of an allowed table name is not checked on its own."""
+        config = SecurityConfig({"allowed_tables": ["customers"]})
+        chunks = ["SELECT * FROM cust", "omers c", " WHERE c.id = (1)"]
+        
+        assert "".join(config.validate_sql_chunks(chunks)) == "".join(chunks)
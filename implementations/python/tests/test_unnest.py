@@ -0,0 +1,181 @@
+"""Tests for PostgreSQL unnest() inserts and upserts."""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from yql import (
+    Dialect,
+    RowSource,
+    SecurityConfig,
+    generate_insert_batches,
+    generate_sql,
+    generate_upsert_batches,
+    parse,
+)
+from yql.parser import ParseError
+
+YQL = """
+operation: insert
+strategy: unnest
+table: users
+columns: [id, name, price]
+column_types:
+  id: bigint
+  name: {type: string, max_length: 100}
+  price: {type: decimal, precision: 10, scale: 2}
+values:
+  - {id: 1, name: a, price: 1.5}
+  - {id: 2, name: null, price: 2}
+"""
+
+UPSERT = """
+operation: upsert
+strategy: unnest
+table: users
+column_types:
+  id: integer
+values:
+  - {id: 1, name: a}
+  - {id: 2, name: b}
+on_conflict:
+  target: [id]
+  update:
+    name: EXCLUDED.name
+"""
+
+
+class TestStatements:
+    """Tests for the generated statements."""
+    
+    def test_literal_arrays(self):
+        """Test ARRAY literals with the declared types."""
+        assert generate_sql(parse(YQL)) == (
+            "INSERT INTO users\n"
+            "(id, name, price)\n"
+            "SELECT * FROM unnest(ARRAY[1, 2]::bigint[], ARRAY['a', NULL]::varchar(100)[], "
+            "ARRAY[1.5, 2]::numeric(10,2)[])"
+        )
+    
+    def test_bound_arrays(self):
+        """Test one parameter per column and the column arrays."""
+        bound = generate_sql(parse(YQL), bind_style="dollar")
+        
+        assert bound.sql == (
+            "INSERT INTO users\n"
+            "(id, name, price)\n"
+            "SELECT * FROM unnest($1::bigint[], $2::varchar(100)[], $3::numeric(10,2)[])"
+        )
+        assert bound.bind() == [[1, 2], ["a", None], [1.5, 2]]
+    
+    def test_same_sql_for_any_row_count(self):
+        """Test that the statement text does not depend on the rows."""
+        query = parse(YQL)
+        texts = set()
+        for count in (0, 1, 500):
+            rows = [{"id": i, "name": f"u{i}", "price": i} for i in range(count)]
+            query.insert_query.values = rows
+            texts.add(generate_sql(query, bind_style="qmark").sql)
+        
+        assert len(texts) == 1
+    
+    def test_upsert(self):
+        """Test ON CONFLICT over unnest() and compact layout."""
+        bound = generate_sql(parse(UPSERT), bind_style="dollar", layout="compact")
+        
+        assert bound.sql == (
+            "INSERT INTO users (id, name) SELECT * FROM unnest($1::integer[], $2::text[]) "
+            "ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name"
+        )
+        assert bound.bind() == [[1, 2], ["a", "b"]]
+    
+    def test_other_dialects_use_values(self):
+        """Test that other dialects ignore the strategy."""
+        query = parse(YQL)
+        query.insert_query.strategy = "values"
+        expected = generate_sql(query, Dialect.MYSQL)
+        
+        assert generate_sql(parse(YQL), Dialect.MYSQL) == expected
+    
+    def test_security(self):
+        """Test that unnest() is not taken for a table."""
+        config = SecurityConfig({"allowed_tables": ["users"]})
+        
+        assert generate_sql(parse(UPSERT), security_config=config).startswith("INSERT INTO users")
+
+
+class TestColumnTypes:
+    """Tests for array element types."""
+    
+    def test_inferred_types(self):
+        """Test types inferred from the values of undeclared columns."""
+        rows = RowSource.from_columns({
+            "n": [1, 2],
+            "x": [1, 2.5],
+            "ok": [True, None],
+            "d": [date(2024, 1, 1), None],
+            "ts": [datetime(2024, 1, 1, tzinfo=timezone.utc), None],
+            "amount": [Decimal("1.10"), None],
+        })
+        query = parse("operation: insert\nstrategy: unnest\ntable: t\n")
+        query.insert_query.values = rows
+        sql = generate_sql(query, bind_style="dollar").sql
+        
+        assert sql.endswith(
+            "unnest($1::bigint[], $2::double precision[], $3::boolean[], $4::date[], "
+            "$5::timestamptz[], $6::numeric[])"
+        )
+    
+    def test_uninferable_types(self):
+        """Test that NULL-only and mixed columns must be declared."""
+        query = parse("operation: insert\nstrategy: unnest\ntable: t\n")
+        query.insert_query.values = RowSource.from_columns({"n": [1, "a"]})
+        with pytest.raises(ValueError, match="column 'n' from values of mixed types"):
+            generate_sql(query)
+        
+        query.insert_query.values = RowSource.from_columns({"n": [None, None]})
+        with pytest.raises(ValueError, match="column 'n' without non-NULL values; declare it"):
+            generate_sql(query, bind_style="dollar")
+        query.insert_query.column_types = {"n": "integer"}
+        assert generate_sql(query).endswith("unnest(ARRAY[NULL, NULL]::integer[])")
+    
+    def test_declared_types(self):
+        """Test YQL type names and PostgreSQL type names."""
+        yql = UPSERT.replace("  id: integer", "  id: uuid\n  name: citext")
+        
+        sql = generate_sql(parse(yql), bind_style="dollar").sql
+        assert "unnest($1::uuid[], $2::citext[])" in sql
+    
+    def test_invalid_types(self):
+        """Test rejected column types."""
+        with pytest.raises(ParseError, match="Invalid type for column 'id'"):
+            parse(UPSERT.replace("  id: integer", "  id: 'int); DROP TABLE users; --'"))
+        with pytest.raises(ParseError, match="Invalid UPSERT strategy: copy"):
+            parse(UPSERT.replace("strategy: unnest", "strategy: copy"))
+        with pytest.raises(ValueError, match="cannot insert array columns"):
+            generate_sql(parse(UPSERT.replace("  id: integer", "  id: array")))
+
+
+class TestBatches:
+    """Tests for batched unnest() statements."""
+    
+    def test_insert_batches(self):
+        """Test that every batch has the same text and its own arrays."""
+        query = parse(YQL)
+        rows = ((i, f"u{i}", i) for i in range(2500))
+        query.insert_query.values = RowSource(rows, columns=["id", "name", "price"])
+        batches = list(generate_insert_batches(query, bind_style="dollar"))
+        
+        assert len(batches) == 3
+        assert len({bound.sql for bound in batches}) == 1
+        assert [len(bound.bind()[0]) for bound in batches] == [1000, 1000, 500]
+    
+    def test_upsert_batches_ignore_parameter_limit(self):
+        """Test that the parameter limit does not split unnest() chunks."""
+        query = parse(UPSERT)
+        query.upsert_query.values = [{"id": i, "name": f"u{i}"} for i in range(40000)]
+        batches = list(generate_upsert_batches(query, max_rows=40000, bind_style="dollar"))
+        
+        assert len(batches) == 1
+        assert len(batches[0].params) == 2
@@ -0,0 +1,160 @@
+"""Tests for watch mode."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from yql import Dialect
+from yql.watch import Watcher
+
+DEFINITION = """
+name: "active_customers"
+select_definition:
+  select:
+    - id: c.id
+  from: { c: customers }
+  where:
+    - "c.status = 'active'"
+"""
+
+USAGE = """
+imports:
+  - "active_customers"
+query:
+  with_clauses:
+    ac:
+      using: "active_customers"
+  select:
+    - id: a.id
+  from: { a: ac }
+"""
+
+STANDALONE = """
+query:
+  select:
+    - id: o.id
+  from: { o: orders }
+"""
+
+
+def _touch(path: Path, content: str) -> None:
+    """Rewrite a file and make sure its mtime changes."""
+    before = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content, encoding="utf-8")
+    st = path.stat()
+    if st.st_mtime_ns == before:
+        os.utime(path, ns=(st.st_atime_ns, before + 1_000_000))
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "active_customers.yql").write_text(DEFINITION, encoding="utf-8")
+    (src / "usage.yql").write_text(USAGE, encoding="utf-8")
+    (src / "standalone.yql").write_text(STANDALONE, encoding="utf-8")
+    return src
+
+
+class TestWatcher:
+    """Tests for Watcher."""
+    
+    def test_initial_build(self, project: Path, tmp_path: Path):
+        """Test that the initial build compiles everything."""
+        watcher = Watcher(project, tmp_path / "out", [Dialect.POSTGRESQL])
+        stats = watcher.build()
+        
+        assert len(stats.rebuilt) == 3
+        assert (tmp_path / "out" / "usage.postgresql.sql").exists()
+        assert watcher.dependents(project / "active_customers.yql") == {
+            (project / "usage.yql").resolve(),
+        }
+    
+    def test_no_changes(self, project: Path, tmp_path: Path):
+        """Test that an unchanged tree rebuilds nothing."""
+        watcher = Watcher(project, tmp_path / "out", [Dialect.POSTGRESQL])
+        watcher.build()
+        stats = watcher.poll()
+        
+        assert stats.changed == []
+        assert stats.rebuilt == []
+        assert stats.skipped == 3
+    
+    def test_import_change_rebuilds_importers_only(self, project: Path, tmp_path: Path):
+        """Test that changing a definition rebuilds it and its importers."""
+        out = tmp_path / "out"
+        watcher = Watcher(project, out, [Dialect.POSTGRESQL])
+        watcher.build()
+        
+        _touch(project / "active_customers.yql", DEFINITION.replace("'active'", "'premium'"))
+        stats = watcher.poll()
+        
+        rebuilt = sorted(str(r.source) for r in stats.rebuilt)
+        assert rebuilt == ["active_customers.yql", "usage.yql"]
+        assert stats.skipped == 1
+        assert "'premium'" in (out / "usage.postgresql.sql").read_text(encoding="utf-8")
+    
+    def test_deleted_source_removes_outputs(self, project: Path, tmp_path: Path):
+        """Test that deleting a source removes its outputs."""
+        out = tmp_path / "out"
+        watcher = Watcher(project, out, [Dialect.POSTGRESQL])
+        watcher.build()
+        
+        (project / "standalone.yql").unlink()
+        stats = watcher.poll()
+        
+        assert [p.name for p in stats.removed] == ["standalone.yql"]
+        assert not (out / "standalone.postgresql.sql").exists()
+    
+    def test_missing_import_is_retried(self, project: Path, tmp_path: Path):
+        """Test that creating a missing import rebuilds the importer."""
+        (project / "active_customers.yql").unlink()
+        watcher = Watcher(project, tmp_path / "out", [Dialect.POSTGRESQL])
+        stats = watcher.build()
+        
+        assert any("parse" in r.errors for r in stats.rebuilt)
+        assert watcher.dependents(project / "active_customers.yql") == {
+            (project / "usage.yql").resolve(),
+        }
+        
+        _touch(project / "active_customers.yql", DEFINITION)
+        stats = watcher.poll()
+        
+        assert sorted(str(r.source) for r in stats.rebuilt) == ["active_customers.yql", "usage.yql"]
+        assert all(not r.errors for r in stats.rebuilt)
+        assert (tmp_path / "out" / "usage.postgresql.sql").exists()
+    
+    def test_import_changed_during_compile(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that an import modified while compiling is rebuilt by the next poll."""
+        src = tmp_path / "src"
+        lib = tmp_path / "lib"
+        src.mkdir()
+        lib.mkdir()
+        (lib / "active_customers.yql").write_text(DEFINITION, encoding="utf-8")
+        usage = USAGE.replace('"active_customers"', f'"{lib}/active_customers.yql"', 1)
+        (src / "usage.yql").write_text(usage, encoding="utf-8")
+        
+        import yql.watch
+        real_compile = yql.watch.compile_file
+        
+        def compile_and_edit(source, dialects):
+            result = real_compile(source, dialects)
+            path = lib / "active_customers.yql"
+            path.write_text(DEFINITION.replace("'active'", "'premium'"), encoding="utf-8")
+            # Make sure the mtime is not older than the compile on coarse clocks
+            now = time.time_ns()
+            os.utime(path, ns=(now, now))
+            return result
+        
+        monkeypatch.setattr(yql.watch, "compile_file", compile_and_edit)
+        watcher = Watcher(src, tmp_path / "out", [Dialect.POSTGRESQL])
+        watcher.build()
+        monkeypatch.setattr(yql.watch, "compile_file", real_compile)
+        
+        stats = watcher.poll()
+        
+        assert [str(r.source) for r in stats.rebuilt] == ["usage.yql"]
+        output = tmp_path / "out" / "usage.postgresql.sql"
+        assert "'premium'" in output.read_text(encoding="utf-8")
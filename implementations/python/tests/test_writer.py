@@ -0,0 +1,86 @@
+"""Tests for the SQL writer."""
+
+from yql import Dialect, generate_sql, parse
+from yql.generator.writer import SQLWriter
+
+NESTED_YQL = """
+query:
+  with_clauses:
+    outer_cte:
+      with_clauses:
+        inner_cte:
+          select:
+            - id: o.id
+            - note: "'a\\nb'"
+          from: { o: orders }
+          where:
+            - "o.amount > 10"
+            - "o.status = 'open'"
+      select:
+        - id: i.id
+      from: { i: inner_cte }
+  select:
+    - id: x.id
+  from: { x: outer_cte }
+  limit: 5
+"""
+
+
+class TestSQLWriter:
+    """Tests for SQLWriter."""
+    
+    def test_write_and_newline(self):
+        """Test that fragments are concatenated in order."""
+        w = SQLWriter()
+        w.write("SELECT")
+        w.newline()
+        w.write_joined(["a", "b"], ", ")
+        assert w.getvalue() == "SELECT\na, b"
+    
+    def test_indented_block(self):
+        """Test that lines inside a block, including embedded ones, are indented."""
+        w = SQLWriter()
+        w.write("x AS (")
+        with w.indented():
+            w.newline()
+            w.write("SELECT 1\nFROM t")
+            with w.indented():
+                w.newline()
+                w.write("deep")
+        w.newline()
+        w.write(")")
+        assert w.getvalue() == "x AS (\n  SELECT 1\n  FROM t\n    deep\n)"
+
+
+class TestNestedGeneration:
+    """Tests for SQL generated through the writer."""
+    
+    def test_nested_with_clauses(self):
+        """Test that nested CTE bodies are indented once per level."""
+        sql = generate_sql(parse(NESTED_YQL), Dialect.POSTGRESQL)
+        assert sql == (
+            "WITH outer_cte AS (\n"
+            "  WITH inner_cte AS (\n"
+            "    SELECT\n"
+            "      o.id AS id,\n"
+            "      'a\n"
+            "    b' AS note\n"
+            "    FROM orders o\n"
+            "    WHERE o.amount > 10\n"
+            "      AND o.status = 'open'\n"
+            "  )\n"
+            "  SELECT\n"
+            "    i.id AS id\n"
+            "  FROM inner_cte i\n"
+            ")\n"
+            "SELECT\n"
+            "  x.id AS id\n"
+            "FROM outer_cte x\n"
+            "LIMIT 5"
+        )
+    
+    def test_nested_with_clauses_all_dialects(self):
+        """Test that every dialect writes the nested CTE bodies in place."""
+        for dialect in Dialect:
+            sql = generate_sql(parse(NESTED_YQL), dialect)
+            assert "WITH outer_cte AS (\n  WITH inner_cte AS (\n    SELECT\n" in sql